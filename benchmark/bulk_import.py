@@ -0,0 +1,100 @@
+# Benchmark impor katalog massal (kasir.importer)
+#
+# Database sementara berisi --ada barang; file impor berisi --baris baris:
+# separuh memperbarui barang yang ada (harga/stok), sisanya barang baru,
+# dengan sebagian kecil baris salah (harga kosong, stok negatif, duplikat)
+# agar jalur laporan galat ikut diukur. Diukur: baca + periksa per potongan
+# dan satu tulisan ke database (termasuk mutasi stok dan pembaruan katalog).
+#
+#   python benchmark/bulk_import.py --baris 100000 --ada 20000
+#   python benchmark/bulk_import.py --baris 20000 --excel
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+JUDUL = ["sku", "nama", "kategori", "stok", "harga", "harga_modal"]
+
+
+def buat_baris(jumlah, ada, acak):
+    for i in range(jumlah):
+        nomor = i + 1 if i < jumlah // 2 and i < ada else ada + i + 1
+        baris = [f"899{nomor:010d}", f"Barang {nomor}", f"Kategori {nomor % 60}",
+                 acak.randint(0, 300), 1000 + acak.randint(0, 400) * 250, 800 + acak.randint(0, 400) * 200]
+        salah = acak.random()
+        if salah < 0.005:
+            baris[4] = ""
+        elif salah < 0.01:
+            baris[3] = -1
+        elif salah < 0.015 and i:
+            baris[1:3] = [f"Barang {nomor - 1}", f"Kategori {(nomor - 1) % 60}"]
+        yield baris
+
+
+def tulis_csv(rows):
+    teks = io.StringIO()
+    writer = csv.writer(teks)
+    writer.writerow(JUDUL)
+    writer.writerows(rows)
+    return io.BytesIO(teks.getvalue().encode())
+
+
+def tulis_excel(rows):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Barang")
+    ws.append(JUDUL)
+    for row in rows:
+        ws.append(row)
+    f = io.BytesIO()
+    wb.save(f)
+    f.seek(0)
+    return f
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark impor katalog barang dari CSV/Excel")
+    parser.add_argument("--baris", type=int, default=100000, help="jumlah baris di file impor")
+    parser.add_argument("--ada", type=int, default=20000, help="jumlah barang yang sudah ada di database")
+    parser.add_argument("--excel", action="store_true", help="impor dari .xlsx, bukan .csv")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="kasir-impor-")
+    os.environ["KASIR_DB"] = os.path.join(folder, "kasir.db")
+    from kasir import importer, inventory, storage
+    from kasir.catalogue import get_catalogue
+
+    acak = random.Random(1)
+    storage.save_table("barang", [{"sku": f"899{i:010d}", "nama": f"Barang {i}", "kategori": f"Kategori {i % 60}",
+                                   "stok": acak.randint(0, 100), "harga": 5000, "harga_modal": 4000}
+                                  for i in range(1, args.ada + 1)])
+    get_catalogue()
+    inventory.get_watchlist()
+    rows = list(buat_baris(args.baris, args.ada, acak))
+    f, nama = (tulis_excel(rows), "barang.xlsx") if args.excel else (tulis_csv(rows), "barang.csv")
+    print(f"{args.ada:,} barang di database, file {nama} {args.baris:,} baris ({len(f.getvalue()) / 1e6:.1f} MB)")
+
+    mulai = time.perf_counter()
+    periksa = importer.Importer(get_catalogue())
+    for df in importer.read_chunks(f, nama):
+        periksa.check(df)
+    baca = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    baru, diperbarui = storage.upsert_barang(periksa.valid, oleh="benchmark", keterangan=f"impor {nama}")
+    tulis = time.perf_counter() - mulai
+    total = baca + tulis
+    print(f"Baca + periksa : {baca:7.2f} dtk ({len(periksa.errors()):,} baris ditolak)")
+    print(f"Tulis database : {tulis:7.2f} dtk ({baru:,} baru, {diperbarui:,} diperbarui)")
+    print(f"Total          : {total:7.2f} dtk ({args.baris / total:,.0f} baris/dtk)")
+    assert len(get_catalogue()) == args.ada + baru
+
+
+if __name__ == "__main__":
+    main()
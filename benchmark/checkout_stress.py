@@ -0,0 +1,97 @@
+# Uji beban checkout paralel
+#
+# Menjalankan banyak checkout sekaligus (thread dan/atau proses) ke satu
+# database, lalu memastikan tidak ada stok atau transaksi yang hilang.
+#
+#   python benchmark/checkout_stress.py --kasir 16 --transaksi 200 --proses 4
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kasir import storage  # noqa: E402
+
+STOK_AWAL = 500
+
+
+def siapkan(db, jumlah_barang):
+    conn = storage.connect(db)
+    for i in range(jumlah_barang):
+        storage.add_barang({"nama": f"Barang {i}", "kategori": f"Kategori {i % 5}",
+                            "stok": STOK_AWAL, "harga": 1000 + i, "harga_modal": 800 + i}, conn)
+
+
+def kasir(db, nama, jumlah, jumlah_barang, seed):
+    # Satu kasir: lakukan checkout berulang, hitung yang berhasil dan ditolak
+    conn = storage.connect(db)
+    acak = random.Random(seed)
+    berhasil = terjual = ditolak = 0
+    for _ in range(jumlah):
+        items = []
+        for i in acak.sample(range(jumlah_barang), acak.randint(1, 3)):
+            qty = acak.randint(1, 3)
+            items.append({"nama": f"Barang {i}", "kategori": f"Kategori {i % 5}", "qty": qty,
+                          "harga": 1000 + i, "harga_modal": 800 + i, "subtotal": (1000 + i) * qty})
+        total = sum(item["subtotal"] for item in items)
+        try:
+            storage.record_sale({"waktu": time.strftime("%Y-%m-%d %H:%M:%S"), "kasir": nama, "items": items,
+                                 "total": total, "bayar": total, "kembalian": 0, "metode": "Cash"}, conn)
+            berhasil += 1
+            terjual += sum(item["qty"] for item in items)
+        except storage.StokTidakCukup:
+            ditolak += 1
+    return berhasil, terjual, ditolak
+
+
+def kelompok_thread(db, proses_ke, jumlah_kasir, jumlah, jumlah_barang):
+    with ThreadPoolExecutor(jumlah_kasir) as pool:
+        tugas = [pool.submit(kasir, db, f"kasir{proses_ke}_{k}", jumlah, jumlah_barang, proses_ke * 1000 + k)
+                 for k in range(jumlah_kasir)]
+        hasil = [t.result() for t in tugas]
+    return tuple(map(sum, zip(*hasil)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban checkout paralel")
+    parser.add_argument("--kasir", type=int, default=8, help="thread kasir per proses")
+    parser.add_argument("--proses", type=int, default=1, help="jumlah proses")
+    parser.add_argument("--transaksi", type=int, default=100, help="checkout per kasir")
+    parser.add_argument("--barang", type=int, default=20, help="jumlah barang di katalog")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = os.path.join(folder, "kasir.db")
+        siapkan(db, args.barang)
+
+        mulai = time.perf_counter()
+        # spawn: koneksi SQLite proses induk tidak boleh ikut ter-fork
+        with ProcessPoolExecutor(args.proses, mp_context=multiprocessing.get_context("spawn")) as pool:
+            tugas = [pool.submit(kelompok_thread, db, p, args.kasir, args.transaksi, args.barang)
+                     for p in range(args.proses)]
+            hasil = [t.result() for t in tugas]
+        durasi = time.perf_counter() - mulai
+        berhasil, terjual, ditolak = map(sum, zip(*hasil))
+
+        conn = storage.connect(db)
+        sisa_stok = conn.execute("SELECT SUM(stok) FROM barang").fetchone()[0]
+        jumlah_transaksi = conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+        qty_tercatat = sum(item["qty"] for seg in storage.iter_table("transaksi", ["items"], conn=conn)
+                           for t in seg for item in t["items"])
+
+    print(f"Checkout berhasil : {berhasil} ({ditolak} ditolak karena stok habis)")
+    print(f"Throughput        : {berhasil / durasi:,.1f} checkout/detik dalam {durasi:.2f} s")
+    ok = (jumlah_transaksi == berhasil and qty_tercatat == terjual
+          and sisa_stok + terjual == STOK_AWAL * args.barang and sisa_stok >= 0)
+    print(f"Transaksi tercatat: {jumlah_transaksi}, qty terjual: {terjual}, sisa stok: {sisa_stok}")
+    print("KONSISTEN" if ok else "TIDAK KONSISTEN: ada stok atau penjualan yang hilang")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
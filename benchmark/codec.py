@@ -0,0 +1,83 @@
+# Perbandingan codec serialisasi (kasir.codec)
+#
+# Riwayat transaksi sintetis (kasir.synthetic) diserialisasi dengan tiap
+# codec yang terpasang, ditambah format lama sebagai pembanding (file:
+# json stdlib dengan indent=2, items: json.dumps bawaan). Diukur dua beban kerja:
+#   file   seluruh riwayat sebagai satu dokumen (load_data/save_data, migrasi)
+#   items  kolom items per transaksi (setiap baca/tulis tabel transaksi)
+#
+#   python benchmark/codec.py --per-hari 100 200 400 --tahun 1
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kasir import codec, synthetic  # noqa: E402
+
+
+def buat_riwayat(per_hari, tahun, seed=1):
+    acak = random.Random(seed)
+    hari = int(tahun * 365)
+    barang = synthetic.generate_barang(2000, acak)
+    for i, b in enumerate(barang, start=1):
+        b["id"] = i
+    mulai = date(2024, 1, 1) - timedelta(days=hari)
+    return list(synthetic.generate_transaksi(barang, [f"kasir{i}" for i in range(8)], mulai, hari, per_hari, acak))
+
+
+def daftar_codec():
+    # (nama, dumps untuk file, dumps untuk items, loads)
+    hasil = [("lama", lambda data: json.dumps(data, indent=2), json.dumps, json.loads)]
+    for nama in codec.CODEC:
+        try:
+            c = codec.get_codec(nama)
+        except ImportError:
+            print(f"({nama} tidak terpasang, dilewati)")
+            continue
+        hasil.append((nama, c.dumps, c.dumps, c.loads))
+    return hasil
+
+
+def ukur(fungsi, ulang):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik, hasil
+
+
+def _ukuran(isi):
+    return len(isi) if isinstance(isi, bytes) else len(isi.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perbandingan codec serialisasi data kasir")
+    parser.add_argument("--per-hari", type=int, nargs="+", default=[100, 300], help="transaksi per hari")
+    parser.add_argument("--tahun", type=float, default=1, help="panjang riwayat")
+    parser.add_argument("--ulang", type=int, default=3, help="pengulangan (diambil yang tercepat)")
+    args = parser.parse_args()
+
+    semua = daftar_codec()
+    for per_hari in args.per_hari:
+        riwayat = buat_riwayat(per_hari, args.tahun)
+        items = [t["items"] for t in riwayat]
+        print(f"\n== {len(riwayat):,} transaksi ({per_hari}/hari, {args.tahun:g} tahun)")
+        print(f"{'Codec':<20} {'beban':<6} {'dump (ms)':>10} {'parse (ms)':>11} {'ukuran (KB)':>12}")
+        for nama, dumps_file, dumps_items, loads in semua:
+            dump, isi = ukur(lambda: dumps_file(riwayat), args.ulang)
+            parse, _ = ukur(lambda: loads(isi), args.ulang)
+            print(f"{nama:<20} {'file':<6} {dump * 1e3:>10.1f} {parse * 1e3:>11.1f} {_ukuran(isi) / 1024:>12,.0f}")
+            dump, kolom = ukur(lambda: [dumps_items(i) for i in items], args.ulang)
+            parse, _ = ukur(lambda: [loads(i) for i in kolom], args.ulang)
+            total = sum(_ukuran(i) for i in kolom)
+            print(f"{'':<20} {'items':<6} {dump * 1e3:>10.1f} {parse * 1e3:>11.1f} {total / 1024:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
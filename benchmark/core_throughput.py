@@ -0,0 +1,131 @@
+# Benchmark inti kasir tanpa UI
+#
+# Untuk setiap ukuran riwayat (jumlah transaksi) dibuat database sementara
+# berisi katalog dan riwayat sintetis, lalu diukur: checkout per detik lewat
+# CheckoutService, latensi tiap laporan ReportService (pertama/dingin dan
+# berulang/hangat) serta memori (RSS maksimum sebelum dan sesudah laporan).
+# Setiap ukuran dijalankan di proses baru agar angka memori tidak tercampur.
+#
+#   python benchmark/core_throughput.py --ukuran 10000 100000 1000000
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BARANG = 2000
+KASIR = 10
+SEGMEN_ISI = 20000
+
+
+def _isi(storage, jumlah, seed):
+    acak = random.Random(seed)
+    barang = [{"sku": f"899{i:010d}", "nama": f"Barang {i}", "kategori": f"Kategori {i % 40}",
+               "stok": 10 ** 9, "harga": 1000 + i % 200 * 500, "harga_modal": 800 + i % 200 * 400}
+              for i in range(1, BARANG + 1)]
+    storage.save_table("barang", barang)
+    awal = time.mktime((2021, 1, 1, 0, 0, 0, 0, 0, -1))
+    langkah = 3 * 365 * 86400 / max(jumlah, 1)
+    for mulai in range(0, jumlah, SEGMEN_ISI):
+        segmen = []
+        for i in range(mulai, min(jumlah, mulai + SEGMEN_ISI)):
+            items = []
+            for b in acak.sample(barang, acak.randint(1, 5)):
+                qty = acak.randint(1, 3)
+                items.append({"barang_id": b["id"], "nama": b["nama"], "kategori": b["kategori"], "qty": qty,
+                              "harga": b["harga"], "harga_modal": b["harga_modal"], "subtotal": b["harga"] * qty})
+            total = sum(item["subtotal"] for item in items)
+            segmen.append({"waktu": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(awal + i * langkah)),
+                           "kasir": f"kasir{i % KASIR}", "items": items, "total": total, "bayar": total,
+                           "kembalian": 0, "metode": "Cash"})
+        storage.append_transactions(segmen)
+    return barang
+
+
+def _waktu(fungsi, ulang):
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append(time.perf_counter() - mulai)
+    return durasi
+
+
+def ukur(ukuran, checkout, ulang, seed=1):
+    # Dijalankan di proses anak (spawn)
+    kerja = tempfile.mkdtemp(prefix="kasir-inti-")
+    os.environ["KASIR_DB"] = os.path.join(kerja, "kasir.db")
+    from kasir import storage
+    from kasir.cart import Cart
+    from kasir.catalogue import get_catalogue
+    from kasir.checkout import CheckoutService
+    from kasir.report import ReportService
+
+    mulai = time.perf_counter()
+    _isi(storage, ukuran, seed)
+    hasil = {"ukuran": ukuran, "isi_detik": time.perf_counter() - mulai}
+
+    katalog = get_catalogue()
+    ids = katalog.ids()
+    acak = random.Random(seed)
+    layanan = CheckoutService()
+    mulai = time.perf_counter()
+    for i in range(checkout):
+        keranjang = Cart()
+        for barang_id in acak.sample(ids, acak.randint(1, 5)):
+            keranjang.add(katalog.get(barang_id), acak.randint(1, 3))
+        layanan.checkout(keranjang, f"kasir{i % KASIR}", "Cash", keranjang.total())
+    hasil["checkout_per_detik"] = checkout / (time.perf_counter() - mulai)
+
+    laporan = ReportService()
+    awal, akhir = laporan.date_range()
+    bulan = akhir[:8] + "01"
+    hasil["rss_data_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    hasil["laporan"] = {}
+    for nama, fungsi in [
+        ("totals", laporan.totals),
+        ("summary", lambda: laporan.summary(awal, akhir)),
+        ("daily", lambda: laporan.daily(awal, akhir)),
+        ("per_kasir", lambda: laporan.per_kasir(awal, akhir)),
+        ("best_sellers", lambda: laporan.best_sellers(awal, akhir)),
+        ("profit_hari", lambda: laporan.profit(awal, akhir, per="hari")),
+        ("profit_produk_bulan", lambda: laporan.profit(bulan, akhir, per="produk")),
+        ("top_qty", lambda: laporan.top(awal, akhir, by="qty")),
+    ]:
+        dingin = _waktu(fungsi, 1)[0]
+        hangat = _waktu(fungsi, ulang)
+        hasil["laporan"][nama] = (dingin, statistics.median(hangat))
+    hasil["rss_maks_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inti kasir tanpa UI")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="jumlah transaksi di riwayat")
+    parser.add_argument("--checkout", type=int, default=1000, help="jumlah checkout yang diukur per ukuran")
+    parser.add_argument("--ulang", type=int, default=5, help="pengulangan tiap laporan (hangat)")
+    args = parser.parse_args()
+
+    konteks = multiprocessing.get_context("spawn")
+    for ukuran in args.ukuran:
+        with konteks.Pool(1) as pool:
+            hasil = pool.apply(ukur, (ukuran, args.checkout, args.ulang))
+        print(f"== {ukuran:,} transaksi (isi data {hasil['isi_detik']:.1f} dtk)")
+        print(f"Checkout/detik       : {hasil['checkout_per_detik']:,.0f}")
+        print(f"RSS sebelum laporan  : {hasil['rss_data_mb']:,.1f} MB")
+        print(f"RSS maksimum         : {hasil['rss_maks_mb']:,.1f} MB")
+        print(f"{'Laporan':<22} {'dingin (ms)':>12} {'hangat (ms)':>12}")
+        for nama, (dingin, hangat) in hasil["laporan"].items():
+            print(f"{nama:<22} {dingin * 1e3:>12.2f} {hangat * 1e3:>12.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Uji beban API checkout (kasir.ingest) dengan dan tanpa group commit
+#
+# Server dijalankan sebagai proses terpisah (python -m kasir.ingest) pada
+# database sementara, lalu --koneksi terminal tiruan mengirim checkout
+# terus-menerus lewat koneksi keep-alive selama --durasi detik. Diukur
+# checkout/detik, latensi p50/p99 dan rata-rata ukuran batch; setelahnya
+# stok dan transaksi di database dicocokkan dengan checkout yang berhasil.
+#
+#   python benchmark/ingest_load.py --koneksi 64 --durasi 10 --batch 1 256
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+STOK_AWAL = 1_000_000
+
+
+def siapkan(db, jumlah_barang):
+    from kasir import storage
+
+    conn = storage.connect(db)
+    storage.save_table("akun", [{"username": f"kasir{i}", "password": "-", "role": "kasir"} for i in range(8)], conn)
+    storage.save_table("barang", [{"sku": f"899{i:010d}", "nama": f"Barang {i}", "kategori": f"Kategori {i % 10}",
+                                   "stok": STOK_AWAL, "harga": 1000 + i * 10, "harga_modal": 800 + i * 8}
+                                  for i in range(jumlah_barang)], conn)
+
+
+async def kirim(reader, writer, metode, jalur, data=None):
+    body = json.dumps(data).encode() if data is not None else b""
+    writer.write(f"{metode} {jalur} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    kode = int((await reader.readline()).split()[1])
+    panjang = 0
+    while (baris := await reader.readline()) != b"\r\n":
+        kunci, _, nilai = baris.decode().partition(":")
+        if kunci.lower() == "content-length":
+            panjang = int(nilai)
+    return kode, json.loads(await reader.readexactly(panjang))
+
+
+async def terminal(port, nomor, sampai, jumlah_barang, latensi):
+    acak = random.Random(nomor)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    berhasil = terjual = 0
+    while time.perf_counter() < sampai:
+        items = [{"barang_id": i, "qty": acak.randint(1, 3)}
+                 for i in acak.sample(range(1, jumlah_barang + 1), acak.randint(1, 4))]
+        mulai = time.perf_counter()
+        kode, isi = await kirim(reader, writer, "POST", "/checkout",
+                                {"kasir": f"kasir{nomor % 8}", "metode": "QRIS/Transfer", "items": items})
+        latensi.append(time.perf_counter() - mulai)
+        if kode != 201:
+            raise RuntimeError(f"checkout gagal ({kode}): {isi}")
+        berhasil += 1
+        terjual += sum(item["qty"] for item in items)
+    writer.close()
+    return berhasil, terjual
+
+
+async def beban(port, koneksi, durasi, jumlah_barang):
+    latensi = []
+    sampai = time.perf_counter() + durasi
+    hasil = await asyncio.gather(*(terminal(port, k, sampai, jumlah_barang, latensi) for k in range(koneksi)))
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, status = await kirim(reader, writer, "GET", "/status")
+    writer.close()
+    return [sum(h[0] for h in hasil), sum(h[1] for h in hasil)], latensi, status
+
+
+def tunggu_server(port, proses):
+    for _ in range(200):
+        if proses.poll() is not None:
+            raise RuntimeError("server berhenti saat dijalankan")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("server tidak merespons")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban API checkout dengan group commit")
+    parser.add_argument("--koneksi", type=int, default=64, help="terminal yang mengirim bersamaan")
+    parser.add_argument("--durasi", type=float, default=10, help="lama pengukuran per mode (detik)")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 256],
+                        help="maks. checkout per commit yang dibandingkan (1 = tanpa group commit)")
+    parser.add_argument("--barang", type=int, default=500, help="jumlah barang di katalog")
+    parser.add_argument("--port", type=int, default=8599)
+    args = parser.parse_args()
+
+    sehat = True
+    for maks_batch in args.batch:
+        with tempfile.TemporaryDirectory() as folder:
+            db = os.path.join(folder, "kasir.db")
+            siapkan(db, args.barang)
+            proses = subprocess.Popen([sys.executable, "-m", "kasir.ingest", "--port", str(args.port),
+                                       "--batch", str(maks_batch)], cwd=AKAR,
+                                      env={**os.environ, "KASIR_DB": db}, stdout=subprocess.DEVNULL)
+            try:
+                tunggu_server(args.port, proses)
+                (berhasil, terjual), latensi, status = asyncio.run(
+                    beban(args.port, args.koneksi, args.durasi, args.barang))
+            finally:
+                proses.terminate()
+                proses.wait()
+
+            from kasir import storage
+
+            conn = storage.connect(db)
+            sisa = conn.execute("SELECT SUM(stok) FROM barang").fetchone()[0]
+            tercatat = conn.execute("SELECT COUNT(*) FROM transaksi").fetchone()[0]
+            ok = tercatat == berhasil and sisa + terjual == STOK_AWAL * args.barang
+            sehat &= ok
+            conn.close()
+
+        latensi.sort()
+        print(f"batch maks {maks_batch:>4}: {berhasil / args.durasi:8,.0f} checkout/dtk, "
+              f"p50 {statistics.median(latensi) * 1e3:6.1f} ms, p99 {latensi[int(len(latensi) * 0.99) - 1] * 1e3:6.1f} ms, "
+              f"rata-rata batch {status['rata_rata_batch']:6.1f} ({status['batch']:,} commit) "
+              f"{'KONSISTEN' if ok else 'TIDAK KONSISTEN'}")
+    sys.exit(0 if sehat else 1)
+
+
+if __name__ == "__main__":
+    main()
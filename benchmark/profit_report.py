@@ -0,0 +1,70 @@
+# Benchmark laporan laba/margin
+#
+# Membangun tabel item kolom sintetis (default 1 juta baris) lalu mengukur
+# waktu laporan laba kotor per hari, produk, kategori dan kasir untuk
+# rentang satu tahun penuh dan satu bulan. Dengan --snapshot kolom ditulis
+# ke snapshot .npy sementara lalu dibaca lewat mmap seperti di aplikasi.
+#
+#   python benchmark/profit_report.py --baris 1000000 --snapshot
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kasir.line_items import DIMENSI, LineItems, write_snapshot  # noqa: E402
+
+
+def buat_items(baris, produk=5000, kasir=20, seed=1):
+    acak = np.random.default_rng(seed)
+    items = LineItems()
+    items.produk = [(f"Barang {i}", f"Kategori {i % 40}") for i in range(produk)]
+    items.kategori = [f"Kategori {i}" for i in range(40)]
+    items.kategori_produk = [i % 40 for i in range(produk)]
+    items.kasir = [f"kasir{i}" for i in range(kasir)]
+    detik = acak.integers(0, 365 * 86400, baris)
+    detik.sort()
+    kode_produk = acak.integers(0, produk, baris, dtype=np.int32)
+    qty = acak.integers(1, 6, baris)
+    harga = 1000 + kode_produk.astype(np.float64) % 100 * 500
+    items.ekor = {
+        "waktu": np.datetime64("2024-01-01", "s").astype(np.int64) + detik,
+        "kode_produk": kode_produk,
+        "kode_kasir": acak.integers(0, kasir, baris, dtype=np.int32),
+        "qty": qty,
+        "subtotal": harga * qty,
+        "harga_modal": harga * 0.75,
+    }
+    items.terakhir_id = items.jumlah_transaksi = baris
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark laporan laba/margin")
+    parser.add_argument("--baris", type=int, default=1_000_000)
+    parser.add_argument("--ulang", type=int, default=5)
+    parser.add_argument("--snapshot", action="store_true", help="baca kolom dari snapshot mmap")
+    args = parser.parse_args()
+
+    items = buat_items(args.baris)
+    ukuran = sum(a.nbytes for a in items.ekor.values())
+    if args.snapshot:
+        folder = tempfile.mkdtemp(prefix="kasir-kolom-")
+        items = write_snapshot(items, os.path.join(folder, "kasir.db"))
+    print(f"{len(items):,} item, {ukuran / 1e6:.0f} MB kolom" + (" (mmap)" if args.snapshot else ""))
+    for nama, mulai, akhir in [("1 tahun", None, None), ("1 bulan", "2024-06-01", "2024-06-30")]:
+        for per in DIMENSI:
+            durasi = []
+            for _ in range(args.ulang):
+                t0 = time.perf_counter()
+                hasil = items.profit(mulai, akhir, per=per)
+                durasi.append(time.perf_counter() - t0)
+            print(f"{nama:>8} per {per:<9} {min(durasi) * 1000:8.1f} ms  ({len(hasil)} baris)")
+
+
+if __name__ == "__main__":
+    main()
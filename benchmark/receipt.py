@@ -0,0 +1,95 @@
+# Benchmark pembuatan struk
+#
+# Mengukur latensi satu struk (PDF dan ESC/POS, dengan/tanpa QR) seperti
+# saat checkout, lalu waktu cetak ulang struk satu rentang tanggal dengan
+# jumlah pekerja berbeda di database sementara.
+#
+#   python benchmark/receipt.py --struk 2000 --cetak-ulang 5000 --pekerja 1 4
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QRIS_CONTOH = ("00020101021126570011ID.DANA.WWW011893600915302259148102090225914810303UMI51440014ID.CO.QRIS.WWW"
+               "0215ID10200176114730303UMI5204581253033605802ID5908Toko ABC6015Jakarta Selatan6105123106304ABCD")
+
+
+def buat_transaksi(acak, i, jumlah_item=8):
+    items = []
+    for j in range(acak.randint(1, jumlah_item)):
+        harga = acak.randint(1, 200) * 500
+        qty = acak.randint(1, 5)
+        items.append({"barang_id": j + 1, "nama": f"Barang Contoh Nomor {acak.randint(1, 5000)}",
+                      "kategori": f"Kategori {j}", "qty": qty, "harga": harga, "subtotal": harga * qty,
+                      "harga_modal": harga * 0.8})
+    total = sum(item["subtotal"] for item in items)
+    return {"id": i, "waktu": f"2024-{acak.randint(1, 12):02d}-{acak.randint(1, 28):02d} 10:00:00",
+            "kasir": f"kasir{i % 5}", "items": items, "total": total, "bayar": total, "kembalian": 0,
+            "metode": acak.choice(["Cash", "QRIS/Transfer"])}
+
+
+def persentil(durasi, p):
+    return sorted(durasi)[max(0, int(len(durasi) * p) - 1)]
+
+
+def ukur_struk(receipt, jumlah, seed=1):
+    acak = random.Random(seed)
+    # Nominal berulang seperti di toko: payload QR yang sama memakai cache
+    nominal = [acak.randint(1, 400) * 500 for _ in range(200)]
+    hasil = {}
+    for nama, fungsi in (("PDF", receipt.render_pdf), ("ESC/POS", receipt.render_escpos)):
+        for pakai_qr in (False, True):
+            durasi = []
+            for i in range(jumlah):
+                t = buat_transaksi(acak, i + 1)
+                qr = receipt.qris_dinamis(QRIS_CONTOH, acak.choice(nominal)) if pakai_qr else None
+                mulai = time.perf_counter()
+                fungsi(t, qr=qr)
+                durasi.append(time.perf_counter() - mulai)
+            hasil[(nama, pakai_qr)] = durasi
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pembuatan struk")
+    parser.add_argument("--struk", type=int, default=2000, help="jumlah struk untuk ukur latensi")
+    parser.add_argument("--cetak-ulang", type=int, default=5000, help="jumlah transaksi untuk cetak ulang")
+    parser.add_argument("--pekerja", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    kerja = tempfile.mkdtemp(prefix="kasir-struk-")
+    os.environ["KASIR_DB"] = os.path.join(kerja, "kasir.db")
+    os.environ["KASIR_QRIS"] = QRIS_CONTOH
+    from kasir import receipt, storage
+
+    print(f"{'Struk':<10} {'QR':<6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'maks (ms)':>10}")
+    for (nama, pakai_qr), durasi in ukur_struk(receipt, args.struk).items():
+        print(f"{nama:<10} {'ya' if pakai_qr else '-':<6} {statistics.median(durasi) * 1e3:>9.2f} "
+              f"{persentil(durasi, 0.95) * 1e3:>9.2f} {persentil(durasi, 0.99) * 1e3:>9.2f} "
+              f"{max(durasi) * 1e3:>10.2f}")
+
+    acak = random.Random(2)
+    transaksi = [buat_transaksi(acak, i + 1) for i in range(args.cetak_ulang)]
+    for t in transaksi:
+        del t["id"]
+    storage.save_table("transaksi", transaksi)
+
+    print()
+    print(f"Cetak ulang {args.cetak_ulang:,} struk")
+    print(f"{'Format':<10} {'Pekerja':>8} {'Detik':>8} {'Struk/dtk':>10}")
+    for format in receipt.FORMAT:
+        for pekerja in args.pekerja:
+            mulai = time.perf_counter()
+            f, _, _ = receipt.reprint(format, pekerja=pekerja)
+            durasi = time.perf_counter() - mulai
+            f.close()
+            print(f"{format:<10} {pekerja:>8} {durasi:>8.2f} {args.cetak_ulang / durasi:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
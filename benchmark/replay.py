@@ -0,0 +1,204 @@
+# Replay beban kerja kasir
+#
+# Menyiapkan database dari data sintetis (kasir.synthetic) atau dari folder
+# JSON yang sudah ada, lalu menjalankan banyak kasir simulasi sekaligus.
+# Setiap kasir adalah thread (seperti sesi Streamlit di satu server) yang
+# bergantian membuka halaman Transaksi (scan barang + checkout), Riwayat
+# (satu halaman tabel pada rentang tanggal acak) dan Laporan (ringkasan,
+# per kasir dan laba). Dengan --proses > 1 beberapa proses server berbagi
+# satu database. Hasilnya latensi p50/p95/p99 per halaman.
+#
+#   python benchmark/replay.py --kasir 16 --durasi 30
+#   python benchmark/replay.py --data data --kasir 8 --proses 2 --campuran checkout=60,riwayat=25,laporan=15
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HALAMAN = ["checkout", "riwayat", "laporan"]
+
+
+def _campuran(teks):
+    bobot = {}
+    for bagian in teks.split(","):
+        nama, nilai = bagian.split("=")
+        if nama not in HALAMAN:
+            raise argparse.ArgumentTypeError(f"halaman tidak dikenal: {nama}")
+        bobot[nama] = float(nilai)
+    return bobot
+
+
+def siapkan(folder):
+    # Data JSON -> kasir.db di folder kerja; stok dibuat besar agar checkout tidak habis
+    os.environ["KASIR_DB"] = os.path.join(folder, "kasir.db")
+    from kasir import storage
+
+    mulai = time.perf_counter()
+    storage.connect()
+    migrasi = time.perf_counter() - mulai
+    barang = storage.load_table("barang")
+    for b in barang:
+        b["stok"] = 10 ** 9
+    storage.save_table("barang", barang)
+    return migrasi
+
+
+class Kasir(threading.Thread):
+    def __init__(self, nama, args, batas, seed):
+        super().__init__(daemon=True)
+        self.nama = nama
+        self.args = args
+        self.batas = batas
+        self.acak = random.Random(seed)
+        self.latensi = {h: [] for h in HALAMAN}
+        self.gagal = {h: 0 for h in HALAMAN}
+        self.galat = {}  # contoh galat pertama per halaman
+
+    def checkout(self):
+        from kasir.cart import Cart
+        from kasir.catalogue import get_catalogue
+        from kasir.checkout import CheckoutService
+
+        katalog = get_catalogue()
+        keranjang = Cart()
+        for _ in range(self.acak.randint(1, 6)):
+            # Barang awal di daftar lebih sering discan (Zipf kasar)
+            sku = self.sku[min(int(self.acak.paretovariate(1.2)) - 1, len(self.sku) - 1)]
+            keranjang.add(katalog.find_sku(sku), 1)
+        CheckoutService().checkout(keranjang, self.nama, "Cash", keranjang.total() + 5000)
+
+    def _rentang(self):
+        awal, akhir = self.batas
+        hari = (akhir - awal).days
+        panjang = self.acak.choice([0, 6, 30, 365, hari])
+        mulai = awal + timedelta(days=self.acak.randint(0, max(0, hari - panjang)))
+        return mulai, min(akhir, mulai + timedelta(days=panjang))
+
+    def riwayat(self):
+        from kasir.storage import count_range, query_page
+
+        mulai, akhir = self._rentang()
+        total = count_range("transaksi", mulai, akhir)
+        ukuran = 50
+        halaman = self.acak.choice([0, (total // ukuran) // 2, max(0, (total - 1) // ukuran)])
+        query_page("transaksi", mulai, akhir, halaman * ukuran, ukuran)
+
+    def laporan(self):
+        from kasir.report import ReportService
+
+        mulai, akhir = self._rentang()
+        laporan = ReportService()
+        laporan.summary(mulai, akhir)
+        laporan.per_kasir(mulai, akhir)
+        laporan.profit(mulai, akhir, per=self.acak.choice(["hari", "produk", "kategori", "kasir"]))
+
+    def run(self):
+        from kasir.catalogue import get_catalogue
+
+        self.sku = [b["sku"] for b in get_catalogue().records() if b.get("sku")]
+        self.acak.shuffle(self.sku)
+        halaman, bobot = zip(*self.args.campuran.items())
+        selesai = time.monotonic() + self.args.durasi
+        while time.monotonic() < selesai:
+            nama = self.acak.choices(halaman, bobot)[0]
+            mulai = time.perf_counter()
+            try:
+                getattr(self, nama)()
+            except Exception as e:
+                self.gagal[nama] += 1
+                self.galat.setdefault(nama, repr(e))
+            else:
+                self.latensi[nama].append(time.perf_counter() - mulai)
+            if self.args.jeda:
+                time.sleep(self.acak.expovariate(1000 / self.args.jeda))
+
+
+def jalankan(folder, args, indeks):
+    # Satu proses server: args.kasir thread kasir
+    os.environ["KASIR_DB"] = os.path.join(folder, "kasir.db")
+    from kasir.report import ReportService
+
+    awal, akhir = ReportService().date_range()
+    batas = (date.fromisoformat(awal), date.fromisoformat(akhir))
+    kasir = [Kasir(f"replay{indeks}_{i}", args, batas, seed=indeks * 1000 + i) for i in range(args.kasir)]
+    for k in kasir:
+        k.start()
+    for k in kasir:
+        k.join()
+    latensi = {h: [d for k in kasir for d in k.latensi[h]] for h in HALAMAN}
+    gagal = {h: sum(k.gagal[h] for k in kasir) for h in HALAMAN}
+    galat = {}
+    for k in kasir:
+        for h, teks in k.galat.items():
+            galat.setdefault(h, teks)
+    return latensi, gagal, galat
+
+
+def persentil(durasi, p):
+    return durasi[min(len(durasi) - 1, int(len(durasi) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay beban kerja kasir secara bersamaan")
+    parser.add_argument("--data", help="folder JSON aplikasi yang dipakai (default: buat data sintetis)")
+    parser.add_argument("--tahun", type=float, default=2, help="panjang riwayat data sintetis")
+    parser.add_argument("--per-hari", type=int, default=200, help="transaksi per hari data sintetis")
+    parser.add_argument("--barang", type=int, default=2000, help="jumlah barang data sintetis")
+    parser.add_argument("--kasir", type=int, default=8, help="kasir simulasi per proses")
+    parser.add_argument("--proses", type=int, default=1, help="jumlah proses server")
+    parser.add_argument("--durasi", type=float, default=20, help="lama replay (detik)")
+    parser.add_argument("--jeda", type=float, default=0, help="rata-rata jeda antar aksi per kasir (ms)")
+    parser.add_argument("--campuran", type=_campuran, default=_campuran("checkout=70,riwayat=20,laporan=10"))
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="kasir-replay-")
+    try:
+        if args.data:
+            for nama in ("akun.json", "barang.json", "transaksi.json", "barang_dihapus.json"):
+                if os.path.exists(os.path.join(args.data, nama)):
+                    shutil.copy(os.path.join(args.data, nama), folder)
+        else:
+            from kasir import synthetic
+
+            mulai = time.perf_counter()
+            hasil = synthetic.generate(folder, args.barang, args.tahun, args.per_hari)
+            print(f"Data sintetis: {hasil['transaksi.json']:,} transaksi, {hasil['barang.json']:,} barang "
+                  f"({time.perf_counter() - mulai:.1f} dtk)")
+        print(f"Migrasi JSON -> SQLite: {siapkan(folder):.1f} dtk")
+
+        if args.proses == 1:
+            hasil = [jalankan(folder, args, 0)]
+        else:
+            with multiprocessing.get_context("spawn").Pool(args.proses) as pool:
+                hasil = pool.starmap(jalankan, [(folder, args, i) for i in range(args.proses)])
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(f"\n{args.proses} proses x {args.kasir} kasir, {args.durasi:.0f} dtk")
+    print(f"{'Halaman':<10} {'aksi':>8} {'aksi/dtk':>9} {'gagal':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for h in HALAMAN:
+        durasi = sorted(d for latensi, _, _ in hasil for d in latensi[h])
+        gagal = sum(g[h] for _, g, _ in hasil)
+        if not durasi:
+            print(f"{h:<10} {0:>8} {0:>9} {gagal:>6}")
+            continue
+        print(f"{h:<10} {len(durasi):>8,} {len(durasi) / args.durasi:>9.1f} {gagal:>6} "
+              f"{statistics.median(durasi) * 1e3:>9.2f} {persentil(durasi, 0.95) * 1e3:>9.2f} "
+              f"{persentil(durasi, 0.99) * 1e3:>9.2f}")
+    for h in HALAMAN:
+        contoh = next((galat[h] for _, _, galat in hasil if h in galat), None)
+        if contoh:
+            print(f"Galat {h}: {contoh}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Latensi scan barcode ke keranjang
+#
+# Mengukur waktu dari kode hasil scan sampai barang masuk keranjang
+# (lookup SKU di katalog + tambah/naikkan qty) untuk beberapa ukuran katalog.
+#
+#   python benchmark/scan_latency.py --ukuran 1000 10000 100000
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kasir.cart import Cart  # noqa: E402
+from kasir.catalogue import Catalogue  # noqa: E402
+
+
+def buat_katalog(ukuran):
+    return Catalogue({"id": i, "sku": f"899{i:010d}", "nama": f"Barang {i}", "kategori": f"Kategori {i % 50}",
+                      "stok": 10 ** 6, "harga": 1000 + i % 100, "harga_modal": 800} for i in range(1, ukuran + 1))
+
+
+def ukur(ukuran, jumlah_scan, seed=1):
+    katalog = buat_katalog(ukuran)
+    acak = random.Random(seed)
+    # Keranjang kecil berisi barang yang sering discan ulang, seperti di kasir
+    kode = [f"899{acak.randint(1, ukuran):010d}" for _ in range(30)]
+    keranjang = Cart()
+    durasi = []
+    for _ in range(jumlah_scan):
+        sku = acak.choice(kode)
+        mulai = time.perf_counter()
+        keranjang.add(katalog.find_sku(sku), 1)
+        durasi.append(time.perf_counter() - mulai)
+    durasi.sort()
+    return statistics.median(durasi), durasi[int(len(durasi) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi scan barcode ke keranjang")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--scan", type=int, default=20000, help="jumlah scan per ukuran")
+    args = parser.parse_args()
+
+    print(f"{'Katalog':>10} {'p50 (µs)':>10} {'p99 (µs)':>10}")
+    for ukuran in args.ukuran:
+        p50, p99 = ukur(ukuran, args.scan)
+        print(f"{ukuran:>10,} {p50 * 1e6:>10.2f} {p99 * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Waktu cold start aplikasi
+#
+# Menjalankan Kasir_app.py secara headless (streamlit.testing) di proses
+# Python baru dengan -X importtime, lalu melaporkan waktu render pertama
+# halaman login (atau halaman tertentu setelah login) beserta modul yang
+# paling lama diimpor selama render itu. Hasil bisa ditambahkan ke file
+# JSONL agar bisa dibandingkan dari waktu ke waktu.
+#
+#   python benchmark/startup.py --ulang 5
+#   python benchmark/startup.py --halaman Statistik --simpan startup.jsonl
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(AKAR, "Kasir_app.py")
+PENANDA = "--- render pertama ---"
+
+
+def anak(halaman):
+    # Dijalankan di proses baru: hanya impor selama render yang dihitung
+    from streamlit.testing.v1 import AppTest
+
+    kerja = tempfile.mkdtemp(prefix="kasir-startup-")
+    os.chdir(kerja)
+    os.environ["KASIR_DB"] = os.path.join(kerja, "kasir.db")
+    with open("akun.json", "w") as f:
+        json.dump([{"username": "admin", "password": "$2b$12$" + "x" * 53, "role": "admin"}], f)
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    if halaman:
+        at.session_state["login"] = {"username": "admin", "role": "admin"}
+    print(PENANDA, file=sys.stderr, flush=True)
+    mulai = time.perf_counter()
+    at.run()
+    if halaman:
+        at.sidebar.radio[0].set_value(halaman).run()
+    durasi = time.perf_counter() - mulai
+    if at.exception:
+        raise SystemExit(at.exception[0].value)
+    print(json.dumps({"render_ms": durasi * 1000}))
+
+
+def _impor(stderr):
+    # Baris importtime: "import time: self | cumulative | modul"
+    modul = {}
+    aktif = False
+    for baris in stderr.splitlines():
+        if baris == PENANDA:
+            aktif = True
+        elif aktif and baris.startswith("import time:") and "|" in baris:
+            _, kumulatif, nama = baris[len("import time:"):].split("|")
+            if not kumulatif.strip().isdigit():
+                continue
+            # Hanya modul tingkat atas (tanpa indentasi) agar tidak dihitung ganda
+            if not nama.startswith("  "):
+                modul[nama.strip()] = int(kumulatif) / 1000
+    return modul
+
+
+def ukur(halaman):
+    perintah = [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--anak"]
+    if halaman:
+        perintah += ["--halaman", halaman]
+    mulai = time.perf_counter()
+    hasil = subprocess.run(perintah, capture_output=True, text=True, cwd=AKAR)
+    total = time.perf_counter() - mulai
+    if hasil.returncode:
+        raise SystemExit(hasil.stderr[-2000:])
+    render = json.loads(hasil.stdout.strip().splitlines()[-1])["render_ms"]
+    return total * 1000, render, _impor(hasil.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu cold start Kasir_app.py")
+    parser.add_argument("--halaman", help="render halaman ini setelah login (default: halaman login)")
+    parser.add_argument("--ulang", type=int, default=3, help="jumlah proses baru yang diukur")
+    parser.add_argument("--top", type=int, default=10, help="jumlah modul terlama yang ditampilkan")
+    parser.add_argument("--simpan", help="tambahkan hasil ke file JSONL ini")
+    parser.add_argument("--anak", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.anak:
+        anak(args.halaman)
+        return
+
+    proses, render, impor = [], [], []
+    for _ in range(args.ulang):
+        p, r, m = ukur(args.halaman)
+        proses.append(p)
+        render.append(r)
+        impor.append(m)
+
+    target = args.halaman or "Login"
+    print(f"Halaman            : {target}")
+    print(f"Proses (median)    : {statistics.median(proses):8.1f} ms")
+    print(f"Render pertama     : {statistics.median(render):8.1f} ms (min {min(render):.1f})")
+    total_impor = statistics.median(sum(m.values()) for m in impor)
+    print(f"Impor saat render  : {total_impor:8.1f} ms")
+    print()
+    print(f"{'Modul':<40} {'ms':>8}")
+    terakhir = impor[-1]
+    for nama, ms in sorted(terakhir.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"{nama:<40} {ms:>8.1f}")
+
+    if args.simpan:
+        with open(args.simpan, "a") as f:
+            f.write(json.dumps({
+                "waktu": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "halaman": target,
+                "proses_ms": round(statistics.median(proses), 1),
+                "render_ms": round(statistics.median(render), 1),
+                "impor_ms": round(total_impor, 1),
+                "modul": {n: round(ms, 1) for n, ms in sorted(terakhir.items(), key=lambda x: -x[1])[:args.top]},
+            }) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Benchmark persediaan: perkiraan pemesanan ulang dan daftar stok menipis
+#
+# Database sementara berisi katalog besar (default 50 ribu SKU) dan riwayat
+# penjualan HARI_PENJUALAN hari. Diukur: perkiraan pemesanan ulang untuk
+# semua barang (dingin = setelah ada penjualan, hangat = dari cache), bangun
+# ulang daftar stok menipis, dan checkout (termasuk catatan mutasi stok dan
+# pembaruan daftar stok menipis per transaksi).
+#
+#   python benchmark/stock_forecast.py --sku 50000
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _isi(storage, sku, per_hari, hari, acak):
+    barang = [{"sku": f"899{i:010d}", "nama": f"Barang {i}", "kategori": f"Kategori {i % 60}",
+               "stok": acak.randint(0, 200), "harga": 1000 + i % 200 * 500, "harga_modal": 800 + i % 200 * 400}
+              for i in range(1, sku + 1)]
+    storage.save_table("barang", barang)
+    awal = date.today() - timedelta(days=hari - 1)
+    for h in range(hari):
+        tanggal = awal + timedelta(days=h)
+        transaksi = []
+        for i in range(per_hari):
+            items = []
+            # Barang awal lebih laris (Zipf kasar)
+            for b in {barang[min(int(acak.paretovariate(1.1)) - 1, sku - 1)]["id"]: None for _ in range(3)}:
+                item = barang[b - 1]
+                items.append({"barang_id": b, "nama": item["nama"], "kategori": item["kategori"], "qty": 1,
+                              "harga": item["harga"], "harga_modal": item["harga_modal"], "subtotal": item["harga"]})
+            total = sum(item["subtotal"] for item in items)
+            transaksi.append({"waktu": f"{tanggal} {8 + i * 12 // per_hari:02d}:00:00", "kasir": "kasir1",
+                              "items": items, "total": total, "bayar": total, "kembalian": 0, "metode": "Cash"})
+        storage.append_transactions(transaksi)
+    return barang
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark perkiraan stok dan daftar stok menipis")
+    parser.add_argument("--sku", type=int, default=50000, help="jumlah barang")
+    parser.add_argument("--per-hari", type=int, default=2000, help="transaksi per hari di riwayat")
+    parser.add_argument("--checkout", type=int, default=500, help="jumlah checkout yang diukur")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="kasir-stok-")
+    os.environ["KASIR_DB"] = os.path.join(folder, "kasir.db")
+    from kasir import inventory, storage
+    from kasir.cart import Cart
+    from kasir.catalogue import get_catalogue
+    from kasir.checkout import CheckoutService
+
+    acak = random.Random(1)
+    mulai = time.perf_counter()
+    _isi(storage, args.sku, args.per_hari, inventory.HARI_PENJUALAN, acak)
+    print(f"{args.sku:,} SKU, {args.per_hari * inventory.HARI_PENJUALAN:,} transaksi "
+          f"(isi data {time.perf_counter() - mulai:.1f} dtk)")
+
+    mulai = time.perf_counter()
+    perlu = inventory.reorder_list()
+    dingin = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    inventory.reorder_list()
+    hangat = time.perf_counter() - mulai
+    print(f"Perkiraan pemesanan   : {dingin * 1e3:8.1f} ms dingin, {hangat * 1e3:.2f} ms hangat "
+          f"({len(perlu):,} barang perlu dipesan)")
+
+    inventory._daftar.clear()
+    mulai = time.perf_counter()
+    menipis = inventory.get_watchlist()
+    print(f"Bangun stok menipis   : {(time.perf_counter() - mulai) * 1e3:8.1f} ms ({len(menipis):,} barang)")
+
+    katalog = get_catalogue()
+    ids = [i for i in katalog.ids() if katalog.get(i)["stok"] > 10]
+    layanan = CheckoutService()
+    durasi = []
+    for _ in range(args.checkout):
+        keranjang = Cart()
+        for barang_id in acak.sample(ids, 3):
+            keranjang.add(katalog.get(barang_id), 1)
+        mulai = time.perf_counter()
+        layanan.checkout(keranjang, "kasir1", "Cash", keranjang.total())
+        inventory.get_watchlist()
+        durasi.append(time.perf_counter() - mulai)
+    durasi.sort()
+    print(f"Checkout + mutasi     : {statistics.median(durasi) * 1e3:8.2f} ms p50, "
+          f"{durasi[int(len(durasi) * 0.99) - 1] * 1e3:.2f} ms p99")
+    mulai = time.perf_counter()
+    inventory.reorder_list()
+    print(f"Perkiraan setelah jual: {(time.perf_counter() - mulai) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
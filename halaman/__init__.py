@@ -0,0 +1,31 @@
+# Halaman-halaman Aplikasi Kasir
+#
+# Setiap halaman berada di modulnya sendiri dan baru diimpor saat pertama
+# kali dibuka, sehingga dependensi berat (pandas, plotly, numpy, PIL) tidak
+# ikut dimuat saat cold start dan halaman login.
+import importlib
+
+AKUN_FILE = "akun.json"
+BARANG_FILE = "barang.json"
+TRANSAKSI_FILE = "transaksi.json"
+BARANG_HAPUS_FILE = "barang_dihapus.json"
+
+# Nama menu -> (ikon, modul); fungsi halaman bernama halaman_<modul>
+MENU = {
+    "Dashboard": ("📊", "dashboard"),
+    "Barang": ("📦", "barang"),
+    "Transaksi": ("💳", "transaksi"),
+    "Riwayat": ("🕒", "riwayat"),
+    "Laporan": ("📄", "laporan"),
+    "Statistik": ("📈", "statistik"),
+    "Profil Saya": ("👤", "profil"),
+}
+MENU_ADMIN = {
+    "Manajemen Akun": ("👥", "akun"),
+    "Performa Sistem": ("⏱️", "performa"),
+}
+
+
+def tampilkan(nama):
+    _, modul = MENU.get(nama) or MENU_ADMIN[nama]
+    getattr(importlib.import_module(f"halaman.{modul}"), f"halaman_{modul}")()
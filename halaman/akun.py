@@ -0,0 +1,58 @@
+# Manajemen akun
+import pandas as pd
+import streamlit as st
+
+from kasir.auth import hash_password
+from kasir.storage import load_data, save_data
+from halaman import AKUN_FILE
+from halaman.profil import halaman_profil
+
+
+def halaman_akun():
+    st.subheader("👥 Manajemen Pengguna")
+    
+    akun = load_data(AKUN_FILE)
+    current_user = st.session_state.login["username"]
+    
+    # Hanya admin yang bisa menambah akun baru
+    if st.session_state.login["role"] == "admin":
+        with st.expander("➕ Tambah Akun Baru", expanded=False):
+            with st.form("form_akun_baru"):
+                username = st.text_input("Username")
+                password = st.text_input("Password", type="password")
+                role = st.selectbox("Role", ["admin", "kasir"])
+                
+                if st.form_submit_button("Buat Akun"):
+                    if not username or not password:
+                        st.error("Username dan password wajib diisi!")
+                    elif any(a["username"] == username for a in akun):
+                        st.error("Username sudah digunakan!")
+                    else:
+                        akun.append({
+                            "username": username,
+                            "password": hash_password(password),
+                            "role": role,
+                            "nama_lengkap": "",
+                            "no_telepon": "",
+                            "foto_profil": None
+                        })
+                        save_data(AKUN_FILE, akun)
+                        st.success("Akun berhasil dibuat!")
+                        st.rerun()
+    
+    st.write("### Daftar Pengguna")
+    if not akun:
+        st.info("Belum ada akun terdaftar")
+        return
+    
+    # Tampilkan daftar pengguna tanpa password
+    df = pd.DataFrame(akun).drop(columns=["password", "foto_profil"], errors="ignore")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    
+    # Pilih pengguna untuk dilihat/diedit
+    st.write("### Edit Profil Pengguna")
+    user_list = [a["username"] for a in akun]
+    selected_user = st.selectbox("Pilih Pengguna", user_list)
+    
+    if selected_user:
+        halaman_profil(username=selected_user)
@@ -0,0 +1,110 @@
+# Barang
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from kasir.catalogue import get_catalogue
+from kasir.importer import KOLOM as KOLOM_IMPOR, WAJIB, import_barang
+from kasir.storage import add_barang, record_removal, restock, stock_ledger, StokTidakCukup, BarangSudahAda
+
+
+def halaman_barang():
+    st.subheader("📦 Manajemen Barang")
+    katalog = get_catalogue()
+
+    with st.expander("➕ Tambah Barang"):
+        nama = st.text_input("Nama Barang")
+        kategori = st.text_input("Kategori")
+        sku = st.text_input("SKU / Barcode (opsional)")
+        stok = st.number_input("Stok", 0)
+        harga = st.number_input("Harga Satuan", 0)
+        harga_modal = st.number_input("Harga Modal", 0)
+        if st.button("Simpan"):
+            if not nama or not kategori or harga <= 0 or stok < 0:
+                st.warning("Nama, kategori, stok, dan harga wajib diisi dengan benar.")
+            elif katalog.find(nama, kategori):
+                st.warning("Barang dengan nama & kategori sama sudah ada.")
+            elif sku and katalog.find_sku(sku):
+                st.warning("SKU sudah dipakai barang lain.")
+            else:
+                baru = {
+                    "sku": sku,
+                    "nama": nama,
+                    "kategori": kategori,
+                    "stok": stok,
+                    "harga": harga,
+                    "harga_modal": harga_modal,
+                    "oleh": st.session_state.login["username"]
+                }
+                try:
+                    add_barang(baru)
+                    katalog = get_catalogue()
+                    st.success("Barang ditambahkan.")
+                except BarangSudahAda as e:
+                    st.warning(str(e))
+
+    with st.expander("📤 Impor Barang (CSV/Excel)"):
+        st.caption(f"Kolom: {', '.join(KOLOM_IMPOR)} (wajib: {', '.join(WAJIB)}). Barang dengan nama & "
+                   "kategori yang sudah ada diperbarui harga dan stoknya; stok atau harga modal kosong "
+                   "tidak diubah. CSV bertitik koma memakai format angka Indonesia (1.500.000,50); "
+                   "file lain ditulis tanpa pemisah ribuan (1500000.50).")
+        berkas = st.file_uploader("File barang", type=["csv", "xlsx"], key="impor_barang")
+        cara_stok = st.radio("Stok di file", ["Ganti stok", "Tambah ke stok"], horizontal=True, key="impor_stok")
+        if berkas is not None and st.button("Impor"):
+            try:
+                hasil = import_barang(berkas, berkas.name, cara_stok == "Tambah ke stok",
+                                      st.session_state.login["username"])
+            except (ValueError, BarangSudahAda) as e:
+                st.error(str(e))
+            else:
+                katalog = get_catalogue()
+                st.success(f"{hasil['baru']} barang baru, {hasil['diperbarui']} barang diperbarui.")
+                if len(hasil["galat"]):
+                    st.warning(f"{len(hasil['galat'])} baris ditolak:")
+                    st.dataframe(hasil["galat"], use_container_width=True, hide_index=True)
+
+    df = pd.DataFrame(katalog.records())
+    st.dataframe(df)
+
+    if len(katalog):
+        with st.expander("📥 Stok Masuk"):
+            masuk_id = st.selectbox("Barang", katalog.ids(), key="masuk_barang",
+                                    format_func=lambda i: f"{katalog.get(i)['nama']} ({katalog.get(i)['kategori']})")
+            jumlah_masuk = st.number_input("Jumlah Masuk", min_value=1, step=1, key="masuk_jumlah")
+            catatan = st.text_input("Keterangan (pemasok, no. faktur)", key="masuk_keterangan")
+            if st.button("Simpan Stok Masuk"):
+                nama_masuk = katalog.get(masuk_id)["nama"]
+                try:
+                    saldo = restock(masuk_id, jumlah_masuk, st.session_state.login["username"], catatan or None)
+                    st.success(f"Stok {nama_masuk} sekarang {saldo}.")
+                except KeyError:
+                    # Barang dihapus di sesi lain sejak halaman ini ditampilkan
+                    st.error(f"{nama_masuk} sudah tidak ada di katalog. Muat ulang halaman.")
+
+        with st.expander("📜 Riwayat Stok"):
+            riwayat_id = st.selectbox("Barang", [None] + katalog.ids(), key="riwayat_stok_barang",
+                                      format_func=lambda i: "Semua barang" if i is None else
+                                      f"{katalog.get(i)['nama']} ({katalog.get(i)['kategori']})")
+            mutasi = pd.DataFrame(stock_ledger(riwayat_id),
+                                  columns=["id", "waktu", "barang_id", "jenis", "qty", "saldo", "ref", "oleh", "keterangan"])
+            mutasi.insert(2, "barang", [katalog.get(i)["nama"] if i in katalog else f"#{i}" for i in mutasi["barang_id"]])
+            st.dataframe(mutasi.drop(columns=["id", "barang_id"]), use_container_width=True, hide_index=True)
+
+    st.write("### 🗑️ Hapus Barang")
+    if len(katalog):
+        barang_id = st.selectbox("Pilih Barang", katalog.ids(), format_func=lambda i: f"{katalog.get(i)['nama']} ({katalog.get(i)['kategori']})")
+        jumlah_hapus = st.number_input("Jumlah yang Dihapus", min_value=1, max_value=katalog.get(barang_id)['stok'], step=1)
+        keterangan = st.text_input("Alasan Penghapusan")
+        tanggal = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        st.code(tanggal, language="text")
+        if st.button("Hapus Barang"):
+            if not keterangan:
+                st.warning("Alasan penghapusan wajib diisi.")
+            else:
+                try:
+                    record_removal(barang_id, jumlah_hapus, keterangan, tanggal,
+                                   st.session_state.login["username"])
+                    st.success("Barang berhasil dihapus.")
+                except StokTidakCukup as e:
+                    st.error(str(e))
@@ -0,0 +1,32 @@
+# Dashboard
+import streamlit as st
+
+from kasir.inventory import BATAS_STOK, CADANGAN, HARI_PENJUALAN, WAKTU_TUNGGU, get_watchlist, reorder_list
+from kasir.report import ReportService
+
+
+def halaman_dashboard():
+    st.subheader("📊 Dashboard")
+    ringkasan = ReportService().totals()
+    total_transaksi = ringkasan["jumlah_transaksi"]
+    total_pendapatan = ringkasan["pendapatan"]
+    menipis = get_watchlist()
+    pesan = reorder_list()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Jumlah Transaksi", total_transaksi)
+    col2.metric("Total Pendapatan", f"Rp {total_pendapatan:,.0f}")
+    col3.metric("Stok Menipis", len(menipis))
+    col4.metric("Perlu Dipesan", len(pesan))
+
+    if len(menipis):
+        st.write(f"### ⚠️ Stok Menipis (≤ {BATAS_STOK})")
+        st.dataframe([{"Barang": b["nama"], "Kategori": b["kategori"], "Stok": b["stok"]} for b in menipis.records()],
+                     use_container_width=True, hide_index=True)
+
+    if len(pesan):
+        st.write("### 🚚 Perkiraan Pemesanan Ulang")
+        st.caption(f"Kecepatan jual {HARI_PENJUALAN} hari terakhir; barang yang habis dalam "
+                   f"{WAKTU_TUNGGU + CADANGAN} hari (waktu tunggu {WAKTU_TUNGGU} hari + cadangan {CADANGAN} hari).")
+        tabel = pesan.head(50)[["nama", "kategori", "stok", "terjual_per_hari", "sisa_hari", "saran_pesan"]]
+        tabel.columns = ["Barang", "Kategori", "Stok", "Terjual/Hari", "Sisa Hari", "Saran Pesan"]
+        st.dataframe(tabel.round(1), use_container_width=True, hide_index=True)
@@ -0,0 +1,72 @@
+# Laporan
+import pandas as pd
+import streamlit as st
+
+from kasir.report import ReportService
+from kasir.instrument import span
+from kasir.export import available_formats, export_name, export_transaksi
+from kasir.line_items import DIMENSI
+from halaman.umum import rentang_rekap, unduhan
+
+
+def halaman_laporan():
+    st.subheader("📈 Laporan Keuangan")
+    min_date, max_date = rentang_rekap()
+    
+    if min_date is None:
+        st.info("Belum ada data transaksi.")
+        return
+
+    # Filter Tanggal
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Tanggal Mulai", min_date)
+    with col2:
+        end_date = st.date_input("Tanggal Akhir", max_date)
+
+    laporan = ReportService()
+    ringkasan = laporan.summary(start_date, end_date)
+
+    # Ringkasan Pendapatan
+    st.write("### 📊 Ringkasan Pendapatan")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Pendapatan", f"Rp {ringkasan['pendapatan']:,.0f}")
+    col2.metric("Rata-rata per Hari", f"Rp {ringkasan['rata_per_hari']:,.0f}")
+    col3.metric("Jumlah Transaksi", int(ringkasan['jumlah_transaksi']))
+
+    # Pendapatan per Kasir
+    st.write("### 🧑‍💼 Pendapatan per Kasir")
+    with span("laporan.per_kasir"):
+        kasir_df = pd.DataFrame(laporan.per_kasir(start_date, end_date), columns=["kasir", "pendapatan", "jumlah_transaksi", "modal"])
+        kasir_df = kasir_df[["kasir", "pendapatan", "jumlah_transaksi"]]
+        kasir_df.columns = ['Kasir', 'Total Pendapatan', 'Jumlah Transaksi']
+    st.dataframe(kasir_df, hide_index=True)
+
+    # Laba Kotor & Margin
+    st.write("### 💹 Laba Kotor & Margin")
+    per = st.selectbox("Kelompokkan per", DIMENSI, format_func=str.capitalize, key="laba_per")
+    with span(f"laporan.laba_{per}"):
+        laba_df = laporan.profit(start_date, end_date, per=per)
+    if laba_df.empty:
+        st.info("Tidak ada penjualan di rentang tanggal ini.")
+    else:
+        total_laba = laba_df['laba_kotor'].sum()
+        total_jual = laba_df['pendapatan'].sum()
+        col1, col2 = st.columns(2)
+        col1.metric("Laba Kotor", f"Rp {total_laba:,.0f}")
+        col2.metric("Margin", f"{(total_laba / total_jual * 100) if total_jual else 0:.1f}%")
+        st.dataframe(laba_df, hide_index=True, column_config={
+            "pendapatan": st.column_config.NumberColumn("Pendapatan", format="Rp %d"),
+            "modal": st.column_config.NumberColumn("Modal", format="Rp %d"),
+            "laba_kotor": st.column_config.NumberColumn("Laba Kotor", format="Rp %d"),
+            "margin": st.column_config.NumberColumn("Margin", format="%.1f%%"),
+        })
+
+    # Export Laporan (transaksi mentah hanya dibaca saat tombol Unduh diklik)
+    st.write("### 💾 Ekspor Laporan")
+    col1, col2 = st.columns([2, 1])
+    format_ekspor = col1.selectbox("Format", available_formats(), key="format_ekspor")
+    nama_file, mime = export_name(format_ekspor, start_date, end_date)
+    col2.download_button("⬇️ Unduh", unduhan(export_transaksi, format_ekspor, start_date, end_date),
+                         file_name=nama_file, mime=mime, use_container_width=True)
+    st.caption(nama_file)
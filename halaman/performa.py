@@ -0,0 +1,45 @@
+# Performa sistem (khusus admin)
+import pandas as pd
+import streamlit as st
+
+from kasir import instrument
+
+
+def halaman_performa():
+    st.subheader("⏱️ Performa Sistem")
+
+    aktif = st.toggle("Catat waktu render", value=instrument.enabled(),
+                      help="Mencatat waktu tiap rerun halaman dan bagian yang lambat (load_data, DataFrame, grafik)")
+    if aktif != instrument.enabled():
+        instrument.enable(aktif)
+        st.rerun()
+
+    catatan = instrument.history()
+    if not catatan:
+        st.info("Belum ada catatan. Aktifkan pencatatan lalu buka halaman lain.")
+        return
+
+    # Catatan halaman ini sendiri dilewati agar tidak mengaburkan halaman lain
+    df = pd.DataFrame(catatan[::-1], columns=["waktu", "halaman", "pengguna", "ms", "bytes"])
+    df = df[df["halaman"] != "Performa Sistem"]
+    per_halaman = df.groupby("halaman")["ms"].agg(["count", "mean", "max"]).round(1)
+    per_halaman.columns = ["Rerun", "Rata-rata (ms)", "Maks (ms)"]
+    st.write("### Per Halaman")
+    st.dataframe(per_halaman.sort_values("Rata-rata (ms)", ascending=False), use_container_width=True)
+
+    st.write("### Bagian Terlama")
+    bagian = pd.DataFrame(instrument.summary())
+    if not bagian.empty:
+        bagian.columns = ["Bagian", "Jumlah", "Total (ms)", "Rata-rata (ms)", "p95 (ms)", "Byte Dibaca"]
+        st.dataframe(bagian.round(2), use_container_width=True, hide_index=True)
+
+    st.write("### Rerun Terakhir")
+    df.columns = ["Waktu", "Halaman", "Pengguna", "Durasi (ms)", "Byte Dibaca"]
+    st.dataframe(df.head(100).round(1), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button("📥 Unduh JSONL", instrument.export_jsonl(), file_name="performa.jsonl",
+                         mime="application/jsonl")
+    if col2.button("🗑️ Hapus Catatan"):
+        instrument.clear()
+        st.rerun()
@@ -0,0 +1,113 @@
+# Profil pengguna
+import streamlit as st
+
+from kasir.charts import monthly_kasir_chart
+from kasir.instrument import span
+from kasir.images import save_photo, open_photo
+from kasir.storage import load_data, save_data
+from halaman import AKUN_FILE
+
+
+def halaman_profil(username=None):
+    # Default ke user yang login jika tidak ada parameter
+    target_user = username if username else st.session_state.login["username"]
+    is_admin = st.session_state.login["role"] == "admin"
+    is_own_profile = target_user == st.session_state.login["username"]
+    
+    st.subheader(f"👤 Profil {target_user}")
+    akun = load_data(AKUN_FILE)
+    user_data = next((a for a in akun if a["username"] == target_user), None)
+
+    if not user_data:
+        st.error("Data pengguna tidak ditemukan")
+        return
+
+    # Inisialisasi data jika kosong
+    user_data.setdefault("nama_lengkap", "")
+    user_data.setdefault("no_telepon", "")
+    user_data.setdefault("foto_profil", None)
+
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.write("### Foto Profil")
+        if user_data["foto_profil"]:
+            image = open_photo(user_data["foto_profil"])
+            if image is not None:
+                st.image(image, width=150)
+            else:
+                st.warning("Gagal memuat foto profil")
+        
+        if is_own_profile:
+            uploaded_file = st.file_uploader("Ubah foto profil", type=["jpg", "png", "jpeg"], key=f"upload_{target_user}")
+            if uploaded_file is not None:
+                try:
+                    # Simpan ke penyimpanan foto (ukuran penuh + thumbnail), akun hanya menyimpan referensi
+                    user_data["foto_profil"] = save_photo(uploaded_file)
+                    save_data(AKUN_FILE, akun)
+                    st.success("Foto profil berhasil diperbarui!")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Gagal memproses gambar: {str(e)}")
+            
+            if user_data["foto_profil"] and st.button("Hapus Foto Profil", key=f"delete_{target_user}"):
+                user_data["foto_profil"] = None
+                save_data(AKUN_FILE, akun)
+                st.success("Foto profil dihapus!")
+                st.rerun()
+    
+    with col2:
+        st.write("### Informasi Pengguna")
+        st.text_input("Username", value=user_data["username"], disabled=True)
+        
+        # Hanya admin atau pemilik profil yang bisa edit
+        if is_admin or is_own_profile:
+            nama_lengkap = st.text_input("Nama Lengkap", value=user_data["nama_lengkap"], 
+                                       disabled=not (is_admin or is_own_profile))
+            no_telepon = st.text_input("Nomor Telepon", value=user_data["no_telepon"], 
+                                     disabled=not is_admin)  # Hanya admin yang bisa edit no telepon
+            
+            if st.button("Simpan Perubahan", key=f"save_{target_user}"):
+                user_data["nama_lengkap"] = nama_lengkap
+                user_data["no_telepon"] = no_telepon
+                save_data(AKUN_FILE, akun)
+                st.success("Profil berhasil diperbarui!")
+        else:
+            st.text_input("Nama Lengkap", value=user_data["nama_lengkap"], disabled=True)
+            st.text_input("Nomor Telepon", value=user_data["no_telepon"], disabled=True)
+        
+        st.text_input("Role", value=user_data["role"], disabled=True)
+    
+    st.markdown("---")
+    st.write("### 📊 Statistik Performa")
+    
+    # Load rekap bulanan pengguna
+    try:
+        with span("profil.rekap"):
+            bulanan, fig = monthly_kasir_chart(target_user)
+    except Exception as e:
+        st.error(f"Gagal memuat data: {str(e)}")
+        return
+
+    if bulanan is None:
+        st.info("Pengguna ini belum melakukan transaksi.")
+        return
+    
+    # 1. Statistik Dasar
+    st.write("#### 📌 Ringkasan")
+    total_transaksi = int(bulanan['Jumlah Transaksi'].sum())
+    total_pendapatan = bulanan['Pendapatan'].sum()
+    rata_transaksi = total_pendapatan / total_transaksi
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Transaksi", total_transaksi)
+    col2.metric("Total Pendapatan", f"Rp {total_pendapatan:,.0f}")
+    col3.metric("Rata-rata/Transaksi", f"Rp {rata_transaksi:,.0f}")
+
+    # 2. Grafik Performa Bulanan
+    st.write("### 📈 Grafik Performa")
+    try:
+        with span("profil.grafik"):
+            st.plotly_chart(fig, use_container_width=True)
+    except Exception as e:
+        st.error(f"Gagal membuat grafik: {str(e)}")
@@ -0,0 +1,46 @@
+# Riwayat
+from datetime import datetime
+
+import streamlit as st
+
+from kasir.receipt import FORMAT as RECEIPT_FORMAT, reprint, reprint_name
+from kasir.storage import time_bounds
+from halaman.umum import format_items, rentang_rekap, tabel_berhalaman, unduhan
+
+
+def halaman_riwayat():
+    st.subheader("📜 Riwayat Transaksi")
+    min_date, max_date = rentang_rekap()
+
+    if min_date is None:
+        st.info("Belum ada transaksi.")
+    else:
+        # Filter tanggal transaksi
+        st.markdown("### 🔎 Filter Transaksi")
+        tanggal_mulai = st.date_input("📅 Tanggal Mulai", min_date, key="transaksi_mulai")
+        tanggal_akhir = st.date_input("📅 Tanggal Akhir", max_date, key="transaksi_akhir")
+        # Format kolom 'items' hanya untuk halaman yang tampil
+        tabel_berhalaman("transaksi", tanggal_mulai, tanggal_akhir, "transaksi", format_items)
+
+        # Cetak ulang struk untuk rentang tanggal yang sama (diproses di pool
+        # pekerja saat tombol Unduh diklik)
+        st.markdown("### 🖨️ Cetak Ulang Struk")
+        col1, col2 = st.columns([2, 1])
+        format_struk = col1.selectbox("Format", list(RECEIPT_FORMAT), key="format_struk")
+        nama_file, mime = reprint_name(format_struk, tanggal_mulai, tanggal_akhir)
+        col2.download_button("⬇️ Unduh Struk", unduhan(reprint, format_struk, tanggal_mulai, tanggal_akhir),
+                             file_name=nama_file, mime=mime, use_container_width=True)
+        st.caption(nama_file)
+
+    st.subheader("🗑️ Riwayat Penghapusan Barang")
+    min_hapus, max_hapus = time_bounds("barang_dihapus")
+    if min_hapus is None:
+        st.info("Belum ada riwayat penghapusan.")
+    else:
+        # Filter tanggal penghapusan
+        st.markdown("### 🔎 Filter Penghapusan Barang")
+        min_hapus = datetime.strptime(min_hapus[:10], "%Y-%m-%d").date()
+        max_hapus = datetime.strptime(max_hapus[:10], "%Y-%m-%d").date()
+        hapus_mulai = st.date_input("📅 Tanggal Mulai", min_hapus, key="hapus_mulai")
+        hapus_akhir = st.date_input("📅 Tanggal Akhir", max_hapus, key="hapus_akhir")
+        tabel_berhalaman("barang_dihapus", hapus_mulai, hapus_akhir, "hapus")
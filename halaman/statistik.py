@@ -0,0 +1,46 @@
+# Statistik
+import streamlit as st
+
+from kasir.charts import best_sellers_chart, income_chart
+from kasir.instrument import span
+from halaman.umum import rentang_rekap
+
+
+def halaman_statistik():
+    st.subheader("📊 Statistik Penjualan")
+    min_date, max_date = rentang_rekap()
+    
+    if min_date is None:
+        st.info("Belum ada data transaksi.")
+        return
+
+    # Filter Tanggal
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Tanggal Mulai", min_date, key="stat_start")
+    with col2:
+        end_date = st.date_input("Tanggal Akhir", max_date, key="stat_end")
+
+    # Grafik Pendapatan Harian
+    st.write("### 📈 Pendapatan Harian")
+    with span("statistik.harian"):
+        fig, periode = income_chart(start_date, end_date)
+    if fig is not None:
+        if periode != "Harian":
+            st.caption(f"Rentang panjang, data diringkas per periode {periode.lower()}.")
+        with span("statistik.grafik_harian"):
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning("Tidak ada data pendapatan di rentang tanggal ini.")
+
+    # Grafik Barang Terlaris (sesuai rentang tanggal)
+    st.write("### 🏆 Barang Terlaris")
+    metrik = st.radio("Urutkan berdasarkan", ["Qty", "Pendapatan", "Margin"], horizontal=True, key="stat_metrik")
+    with span("statistik.terlaris"):
+        fig = best_sellers_chart(start_date, end_date, metrik)
+    
+    if fig is not None:
+        with span("statistik.grafik_terlaris"):
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning("Belum ada barang yang terjual.")
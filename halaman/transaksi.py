@@ -0,0 +1,194 @@
+# Transaksi
+import streamlit as st
+
+from kasir.cart import Cart
+from kasir.catalogue import get_catalogue
+from kasir.checkout import CheckoutService, PembayaranKurang
+from kasir.receipt import qr_payload, render_escpos, render_pdf
+from kasir.storage import StokTidakCukup
+
+
+def keranjang_sesi():
+    # Sesi lama yang masih menyimpan list of dict diganti keranjang baru
+    if not isinstance(st.session_state.get("keranjang"), Cart):
+        st.session_state.keranjang = Cart()
+    return st.session_state.keranjang
+
+
+def ubah_keranjang(key):
+    # Callback data_editor: semua perubahan qty/hapus diterapkan sebelum
+    # halaman dirender, jadi cukup satu rerun per edit
+    keranjang = keranjang_sesi()
+    urutan = [baris.barang_id for baris in keranjang]
+    for posisi, ubah in st.session_state[key]["edited_rows"].items():
+        barang_id = urutan[int(posisi)]
+        try:
+            if ubah.get("Hapus"):
+                keranjang.remove(barang_id)
+            elif "Qty" in ubah:
+                keranjang.update(barang_id, int(ubah["Qty"] or 0))
+        except StokTidakCukup as e:
+            st.session_state.keranjang_pesan = str(e)
+    # Editor dengan key baru mulai dari isi keranjang terbaru
+    st.session_state.keranjang_versi = st.session_state.get("keranjang_versi", 0) + 1
+
+
+def tampilkan_keranjang(keranjang):
+    st.write("### 🧺 Keranjang Belanja")
+    key = f"keranjang_{st.session_state.get('keranjang_versi', 0)}"
+    st.data_editor(
+        {
+            "Barang": [baris.nama for baris in keranjang],
+            "Kategori": [baris.kategori for baris in keranjang],
+            "Harga": [baris.harga for baris in keranjang],
+            "Qty": [baris.qty for baris in keranjang],
+            "Subtotal": [baris.subtotal for baris in keranjang],
+            "Hapus": [False] * len(keranjang),
+        },
+        key=key,
+        on_change=ubah_keranjang,
+        args=(key,),
+        hide_index=True,
+        use_container_width=True,
+        disabled=["Barang", "Kategori", "Harga", "Subtotal"],
+        column_config={
+            "Harga": st.column_config.NumberColumn(format="Rp %d"),
+            "Qty": st.column_config.NumberColumn(min_value=0, step=1, format="%d",
+                                                 help="Ubah jumlah; 0 menghapus barang"),
+            "Subtotal": st.column_config.NumberColumn(format="Rp %d"),
+        },
+    )
+    pesan = st.session_state.pop("keranjang_pesan", None)
+    if pesan:
+        st.warning(pesan)
+
+
+def scan_ke_keranjang():
+    kode = st.session_state.scan_kode.strip()
+    st.session_state.scan_kode = ""
+    if not kode:
+        return
+    b = get_catalogue().find_sku(kode)
+    if b is None:
+        st.session_state.scan_pesan = f"Kode {kode} tidak ditemukan."
+        return
+    try:
+        keranjang_sesi().add(b, 1)
+    except StokTidakCukup as e:
+        st.session_state.scan_pesan = f"{b['nama']}: {e}"
+
+
+def pilih_barang_manual(katalog):
+    kategori_list = katalog.kategori()
+    if not kategori_list:
+        st.warning("Belum ada kategori barang.")
+        return
+
+    kategori_terpilih = st.selectbox("Pilih Kategori", kategori_list)
+    nama_barang_list = [b['nama'] for b in katalog.in_kategori(kategori_terpilih)]
+    if not nama_barang_list:
+        st.warning("Tidak ada barang pada kategori ini.")
+        return
+
+    nama_barang = st.selectbox("Pilih Barang", nama_barang_list)
+
+    b_dipilih = katalog.find(nama_barang, kategori_terpilih)
+    if not b_dipilih:
+        st.warning("Barang tidak ditemukan.")
+        return
+
+    qty = st.number_input(f"Jumlah ({b_dipilih['stok']} tersedia)", 1, b_dipilih['stok'])
+
+    if st.button("➕ Tambah ke Keranjang"):
+        try:
+            keranjang_sesi().add(b_dipilih, qty)
+        except StokTidakCukup as e:
+            st.warning(str(e))
+
+
+def tampilkan_struk(struk):
+    transaksi_baru = struk["transaksi"]
+    st.markdown("---")
+    st.subheader("🧾 Struk Transaksi")
+    st.write(f"**Waktu**: {transaksi_baru['waktu']}")
+    st.write(f"**Kasir**: {transaksi_baru['kasir']}")
+    st.write(f"**Metode**: {transaksi_baru['metode']}")
+    for item in transaksi_baru['items']:
+        st.write(f"- {item['nama']} ({item['qty']}x): Rp {item['subtotal']:,.0f}")
+    st.write(f"**Total**: Rp {transaksi_baru['total']:,.0f}")
+    st.write(f"**Dibayar**: Rp {transaksi_baru['bayar']:,.0f}")
+    st.write(f"**Kembalian**: Rp {transaksi_baru['kembalian']:,.0f}")
+
+    col1, col2, col3 = st.columns(3)
+    nama = f"struk_{transaksi_baru['id']}"
+    col1.download_button("🖨️ Unduh PDF", struk["pdf"], file_name=f"{nama}.pdf", mime="application/pdf",
+                         use_container_width=True)
+    col2.download_button("🧾 Unduh ESC/POS", struk["escpos"], file_name=f"{nama}.bin",
+                         mime="application/octet-stream", use_container_width=True)
+    if col3.button("Tutup Struk", use_container_width=True):
+        del st.session_state.struk
+        st.rerun()
+
+
+def halaman_transaksi():
+    st.subheader("🛒 Transaksi")
+    katalog = get_catalogue()
+
+    if not len(katalog):
+        st.warning("Belum ada barang tersedia.")
+        return
+
+    mode = st.radio("Mode Input", ["Scan Barcode/SKU", "Pilih Manual"], horizontal=True)
+    if mode == "Scan Barcode/SKU":
+        # Enter pada kolom scan langsung menambah ke keranjang (satu rerun)
+        st.text_input("📷 Scan Barcode / SKU", key="scan_kode", on_change=scan_ke_keranjang)
+        pesan = st.session_state.pop("scan_pesan", None)
+        if pesan:
+            st.warning(pesan)
+    else:
+        pilih_barang_manual(katalog)
+
+    keranjang = keranjang_sesi()
+    if len(keranjang):
+        tampilkan_keranjang(keranjang)
+
+        total = keranjang.total()
+        st.markdown("---")
+        st.markdown(f"### 💰 Total: Rp {total:,.0f}")
+
+        metode = st.radio("Pilih Metode Pembayaran", ["Cash", "QRIS/Transfer"])
+
+        uang_dibayar = 0
+        kembalian = 0
+        if metode == "Cash":
+            uang_dibayar = st.number_input("💵 Uang Diterima", min_value=0)
+            if uang_dibayar >= total:
+                kembalian = uang_dibayar - total
+                st.success(f"Kembalian: Rp {kembalian:,.0f}")
+            else:
+                st.warning("Uang diterima kurang dari total belanja.")
+
+        if metode == "QRIS/Transfer" or uang_dibayar >= total:
+            if st.button("💾 Simpan Transaksi"):
+                # Simpan transaksi dan update stok sekaligus
+                try:
+                    transaksi_baru = CheckoutService().checkout(
+                        keranjang, st.session_state.login["username"], metode,
+                        uang_dibayar if metode == "Cash" else None)
+                except (StokTidakCukup, PembayaranKurang) as e:
+                    st.error(str(e))
+                    st.stop()
+
+                st.success("Transaksi berhasil disimpan ✅")
+
+                # Struk dibuat sekali dan disimpan di sesi agar tetap tampil
+                # (dan bisa diunduh) setelah rerun
+                qr = qr_payload(transaksi_baru)
+                st.session_state.struk = {
+                    "transaksi": transaksi_baru,
+                    "pdf": render_pdf(transaksi_baru, qr=qr),
+                    "escpos": render_escpos(transaksi_baru, qr=qr),
+                }
+
+    if st.session_state.get("struk"):
+        tampilkan_struk(st.session_state.struk)
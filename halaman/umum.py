@@ -0,0 +1,52 @@
+# Utilitas bersama untuk halaman
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from kasir.report import ReportService
+from kasir.storage import count_range, query_page
+
+
+def format_items(rows):
+    for t in rows:
+        t["items"] = ", ".join(f"{item['nama']}({item['qty']}x)" for item in t["items"])
+
+
+def tabel_berhalaman(tabel, mulai, akhir, key, format_rows=None):
+    # Hanya halaman yang diminta yang dibaca dari database dan dikirim ke browser
+    total = count_range(tabel, mulai, akhir)
+    if not total:
+        st.info("Tidak ada data di rentang tanggal ini.")
+        return
+    col1, col2 = st.columns(2)
+    ukuran = col1.selectbox("Baris per halaman", [25, 50, 100, 250], index=1, key=f"{key}_ukuran")
+    jumlah_halaman = (total + ukuran - 1) // ukuran
+    if st.session_state.get(f"{key}_halaman", 1) > jumlah_halaman:
+        st.session_state[f"{key}_halaman"] = 1
+    halaman = col2.number_input(f"Halaman (dari {jumlah_halaman:,})", 1, jumlah_halaman, key=f"{key}_halaman")
+    offset = (halaman - 1) * ukuran
+    rows = query_page(tabel, mulai, akhir, offset, ukuran)
+    if format_rows:
+        format_rows(rows)
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+    st.caption(f"Menampilkan {offset + 1:,}–{offset + len(rows):,} dari {total:,} baris")
+
+
+def unduhan(buat, *args):
+    # Data tertunda untuk st.download_button: buat(*args) -> (file, nama, mime)
+    # baru dijalankan saat tombol diklik, jadi file tidak disimpan di sesi
+    def data():
+        file, _, _ = buat(*args)
+        with file:
+            return file.read()
+    return data
+
+
+def rentang_rekap():
+    # Tanggal pertama & terakhir yang punya transaksi (dari rekap harian)
+    min_date, max_date = ReportService().date_range()
+    if min_date is None:
+        return None, None
+    return (datetime.strptime(min_date, "%Y-%m-%d").date(),
+            datetime.strptime(max_date, "%Y-%m-%d").date())
@@ -0,0 +1 @@
+# Paket inti Aplikasi Kasir
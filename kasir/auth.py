@@ -0,0 +1,88 @@
+# Autentikasi akun
+#
+# bcrypt sengaja lambat, jadi verifikasi dijalankan di thread pool terbatas
+# agar lonjakan login (misalnya saat ganti shift) tidak menghabiskan CPU
+# yang dipakai sesi lain. Akun dicari lewat indeks username sehingga bcrypt
+# hanya berjalan sekali per percobaan.
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from kasir import storage
+
+MAKS_PERCOBAAN = 5      # percobaan gagal per username ...
+JENDELA_PERCOBAAN = 300  # ... dalam sekian detik sebelum dikunci sementara
+
+_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="kasir-bcrypt")
+# Hash pengganti agar username yang tidak ada tetap memakan waktu yang sama;
+# dibuat di latar belakang supaya impor modul (cold start) tidak menunggu bcrypt
+_HASH_PALSU = _pool.submit(lambda: bcrypt.hashpw(b"-", bcrypt.gensalt()).decode())
+
+_gagal = {}
+_gagal_lock = threading.Lock()
+_ada_akun = False
+
+
+class TerlaluBanyakPercobaan(Exception):
+    def __init__(self, tunggu):
+        super().__init__(f"Terlalu banyak percobaan login. Coba lagi dalam {tunggu} detik.")
+        self.tunggu = tunggu
+
+
+def hash_password(password):
+    return _pool.submit(lambda: bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()).result()
+
+
+def check_password(password, hashed):
+    return _pool.submit(bcrypt.checkpw, password.encode(), hashed.encode()).result()
+
+
+def account_index():
+    # username -> akun, dibangun ulang hanya saat tabel akun berubah
+    return storage.cached("indeks_akun", "akun", lambda: {a["username"]: a for a in storage.load_table("akun")})
+
+
+def has_accounts():
+    # Setelah ada akun, jawaban disimpan di memori: tidak ada baca disk per rerun
+    global _ada_akun
+    if not _ada_akun:
+        _ada_akun = storage.connect().execute("SELECT 1 FROM akun LIMIT 1").fetchone() is not None
+    return _ada_akun
+
+
+def _cek_batas(username, sekarang):
+    with _gagal_lock:
+        riwayat = _gagal.get(username)
+        if riwayat is None:
+            return
+        while riwayat and riwayat[0] <= sekarang - JENDELA_PERCOBAAN:
+            riwayat.popleft()
+        if len(riwayat) >= MAKS_PERCOBAAN:
+            raise TerlaluBanyakPercobaan(int(riwayat[0] + JENDELA_PERCOBAAN - sekarang) + 1)
+
+
+def _catat_gagal(username, sekarang):
+    with _gagal_lock:
+        if len(_gagal) > 10000:
+            # Buang catatan yang sudah kedaluwarsa agar memori tidak terus tumbuh
+            for nama in [n for n, r in _gagal.items() if not r or r[-1] <= sekarang - JENDELA_PERCOBAAN]:
+                del _gagal[nama]
+        _gagal.setdefault(username, deque(maxlen=MAKS_PERCOBAAN)).append(sekarang)
+
+
+def verify_login(username, password):
+    # Kembalikan akun jika cocok, None jika salah; TerlaluBanyakPercobaan jika dikunci
+    sekarang = time.monotonic()
+    _cek_batas(username, sekarang)
+    akun = account_index().get(username)
+    cocok = check_password(password, akun["password"] if akun else _HASH_PALSU.result())
+    if akun is None or not cocok:
+        _catat_gagal(username, sekarang)
+        return None
+    with _gagal_lock:
+        _gagal.pop(username, None)
+    return akun
@@ -0,0 +1,100 @@
+# Keranjang belanja
+#
+# Satu baris per barang (dikunci barang_id) dengan __slots__ dan total
+# berjalan, sehingga tambah/hapus/ubah qty O(1) dan sesi kasir hanya
+# menyimpan satu objek kecil per barang. Item dict untuk transaksi
+# (skema lama: barang_id, nama, kategori, qty, harga, harga_modal,
+# subtotal) baru dibuat saat checkout lewat to_items().
+from kasir.storage import StokTidakCukup
+
+
+class BarisKeranjang:
+    __slots__ = ("barang_id", "nama", "kategori", "qty", "harga", "harga_modal", "stok")
+
+    def __init__(self, b, qty):
+        self.barang_id = b["id"]
+        self.nama = b["nama"]
+        self.kategori = b["kategori"]
+        self.qty = qty
+        self.harga = b["harga"]
+        self.harga_modal = b.get("harga_modal", 0)
+        self.stok = b["stok"]  # stok saat ditambahkan; dicek ulang saat checkout
+
+    @property
+    def subtotal(self):
+        return self.qty * self.harga
+
+    def to_item(self):
+        return {
+            "barang_id": self.barang_id,
+            "nama": self.nama,
+            "kategori": self.kategori,
+            "qty": self.qty,
+            "harga": self.harga,
+            "harga_modal": self.harga_modal,
+            "subtotal": self.subtotal
+        }
+
+
+class Cart:
+    # Keranjang tanpa Streamlit; disimpan langsung di st.session_state.keranjang
+    __slots__ = ("_baris", "_total")
+
+    def __init__(self):
+        self._baris = {}
+        self._total = 0
+
+    def add(self, b, qty=1):
+        # Tambah barang; qty dijumlahkan jika barang sudah ada
+        baris = self._baris.get(b["id"])
+        if baris is None:
+            if qty > b["stok"]:
+                raise StokTidakCukup("Jumlah melebihi stok tersedia.")
+            baris = self._baris[b["id"]] = BarisKeranjang(b, qty)
+        else:
+            if baris.qty + qty > b["stok"]:
+                raise StokTidakCukup("Jumlah total di keranjang melebihi stok.")
+            baris.qty += qty
+            baris.stok = b["stok"]
+        self._total += qty * baris.harga
+        return baris
+
+    def update(self, barang_id, qty):
+        # Ganti qty satu barang; qty 0 menghapus barisnya
+        baris = self._baris[barang_id]
+        if qty <= 0:
+            self.remove(barang_id)
+            return
+        if qty > baris.stok:
+            raise StokTidakCukup(f"{baris.nama}: jumlah melebihi stok tersedia ({baris.stok}).")
+        self._total += (qty - baris.qty) * baris.harga
+        baris.qty = qty
+
+    def remove(self, barang_id, qty=None):
+        # Kurangi qty; baris dihapus jika qty habis (atau qty None)
+        baris = self._baris[barang_id]
+        if qty is None or qty >= baris.qty:
+            del self._baris[barang_id]
+            self._total -= baris.subtotal
+        else:
+            baris.qty -= qty
+            self._total -= qty * baris.harga
+
+    def total(self):
+        return self._total
+
+    def clear(self):
+        self._baris.clear()
+        self._total = 0
+
+    def to_items(self):
+        return [baris.to_item() for baris in self._baris.values()]
+
+    def __len__(self):
+        return len(self._baris)
+
+    def __iter__(self):
+        return iter(self._baris.values())
+
+    def __contains__(self, barang_id):
+        return barang_id in self._baris
@@ -0,0 +1,116 @@
+# Katalog barang di memori dengan indeks
+#
+# Satu instance dipakai bersama oleh semua sesi di proses ini. Perubahan
+# yang dilakukan lewat kasir.storage di proses yang sama diterapkan
+# langsung ke indeks; perubahan dari proses lain memicu bangun ulang.
+import threading
+
+from kasir import storage
+
+
+class Catalogue:
+    def __init__(self, barang=()):
+        self._by_id = {}
+        self._by_key = {}        # (nama, kategori) -> id
+        self._by_sku = {}        # sku/barcode -> id
+        self._by_kategori = {}   # kategori -> {id: barang}
+        self._kategori_urut = None
+        for b in barang:
+            self.put(b)
+
+    def put(self, b):
+        # Tambah atau ganti barang; dict lama tidak diubah agar aman dibaca thread lain
+        b = dict(b)
+        lama = self._by_id.get(b["id"])
+        if lama is not None and (lama["nama"], lama["kategori"]) != (b["nama"], b["kategori"]):
+            self.remove(lama["id"])
+        elif lama is not None and lama.get("sku") != b.get("sku"):
+            self._by_sku.pop(lama.get("sku"), None)
+        self._by_id[b["id"]] = b
+        self._by_key[(b["nama"], b["kategori"])] = b["id"]
+        if b.get("sku"):
+            self._by_sku[b["sku"]] = b["id"]
+        if b["kategori"] not in self._by_kategori:
+            self._by_kategori[b["kategori"]] = {}
+            self._kategori_urut = None
+        self._by_kategori[b["kategori"]][b["id"]] = b
+
+    def remove(self, barang_id):
+        b = self._by_id.pop(barang_id, None)
+        if b is None:
+            return
+        self._by_key.pop((b["nama"], b["kategori"]), None)
+        self._by_sku.pop(b.get("sku"), None)
+        isi = self._by_kategori[b["kategori"]]
+        isi.pop(barang_id, None)
+        if not isi:
+            del self._by_kategori[b["kategori"]]
+            self._kategori_urut = None
+
+    def get(self, barang_id):
+        return self._by_id.get(barang_id)
+
+    def find(self, nama, kategori):
+        barang_id = self._by_key.get((nama, kategori))
+        return self._by_id.get(barang_id) if barang_id is not None else None
+
+    def find_sku(self, sku):
+        barang_id = self._by_sku.get(sku)
+        return self._by_id.get(barang_id) if barang_id is not None else None
+
+    def kategori(self):
+        if self._kategori_urut is None:
+            self._kategori_urut = sorted(self._by_kategori)
+        return self._kategori_urut
+
+    def in_kategori(self, kategori):
+        return list(self._by_kategori.get(kategori, {}).values())
+
+    def ids(self):
+        return list(self._by_id)
+
+    def records(self):
+        return list(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, barang_id):
+        return barang_id in self._by_id
+
+
+_katalog = {}   # path -> (versi barang, Catalogue)
+_lock = threading.Lock()
+
+
+def get_catalogue(path=None):
+    path = path or storage.DB_FILE
+    conn = storage.connect(path)
+    nomor = storage.version("barang", conn)
+    entri = _katalog.get(path)
+    if entri is not None and entri[0] == nomor:
+        return entri[1]
+    with _lock:
+        entri = _katalog.get(path)
+        if entri is None or entri[0] != nomor:
+            entri = _katalog[path] = (nomor, Catalogue(storage.load_table("barang", conn)))
+        return entri[1]
+
+
+def _terapkan(path, tabel, sebelum, sesudah, perubahan):
+    if tabel != "barang":
+        return
+    with _lock:
+        entri = _katalog.get(path)
+        # Katalog tertinggal dari tulisan proses lain: biarkan dibangun ulang saat dibaca
+        if entri is None or entri[0] != sebelum:
+            return
+        katalog = entri[1]
+        for b in perubahan["ubah"]:
+            katalog.put(b)
+        for barang_id in perubahan["hapus"]:
+            katalog.remove(barang_id)
+        _katalog[path] = (sesudah, katalog)
+
+
+storage.subscribe(_terapkan)
@@ -0,0 +1,105 @@
+# Grafik plotly untuk halaman Statistik dan Profil
+#
+# Figure dibangun sekali per (versi tabel transaksi, rentang tanggal,
+# pengguna, metrik) dan disimpan di LRU bersama semua sesi, jadi rerun
+# karena widget lain tidak membangun ulang grafik. Deret harian yang lebih
+# panjang dari MAKS_TITIK diringkas per minggu lalu per bulan, sehingga
+# payload grafik tetap kecil untuk rentang bertahun-tahun.
+from functools import lru_cache
+
+import pandas as pd
+import plotly.express as px
+
+from kasir import storage
+from kasir.line_items import METRIK
+from kasir.report import ReportService
+
+MAKS_TITIK = 400  # titik maksimum per deret waktu
+
+# (nama periode, kode periode pandas, kira-kira hari per titik)
+PERIODE = [("Harian", None, 1), ("Mingguan", "W", 7), ("Bulanan", "M", 30.4)]
+
+
+def _versi(path):
+    return storage.version("transaksi", storage.connect(path))
+
+
+def resample(df, kolom_tanggal="tanggal", maks=MAKS_TITIK):
+    # Ringkas deret harian ke periode terkecil yang muat dalam maks titik;
+    # kembalikan (df, nama periode)
+    if len(df) <= maks:
+        return df, PERIODE[0][0]
+    tanggal = pd.to_datetime(df[kolom_tanggal])
+    hari = (tanggal.iloc[-1] - tanggal.iloc[0]).days + 1
+    for periode, kode, panjang in PERIODE[1:]:
+        if hari / panjang <= maks or kode == PERIODE[-1][1]:
+            # Titik diberi tanggal awal periode (Senin / tanggal 1)
+            hasil = df.drop(columns=kolom_tanggal).groupby(tanggal.dt.to_period(kode).dt.start_time).sum()
+            hasil.index.name = kolom_tanggal
+            return hasil.reset_index(), periode
+
+
+@lru_cache(maxsize=64)
+def _pendapatan(versi, path, mulai, akhir, maks):
+    harian = pd.DataFrame(ReportService(path).daily(mulai, akhir),
+                          columns=["tanggal", "jumlah_transaksi", "pendapatan", "modal"])
+    if harian.empty:
+        return None, None
+    harian, periode = resample(harian[["tanggal", "pendapatan"]], maks=maks)
+    fig = px.line(
+        harian,
+        x='tanggal',
+        y='pendapatan',
+        title=f"Pendapatan {periode}",
+        labels={'tanggal': 'Tanggal', 'pendapatan': 'Pendapatan (Rp)'}
+    )
+    return fig, periode
+
+
+def income_chart(mulai, akhir, path=None, maks=MAKS_TITIK):
+    # (figure, periode) atau (None, None) jika tidak ada data
+    return _pendapatan(_versi(path), path, str(mulai), str(akhir), maks)
+
+
+@lru_cache(maxsize=64)
+def _terlaris(versi, path, mulai, akhir, metrik, n):
+    terlaris = ReportService(path).top(mulai, akhir, n=n, by=metrik.lower())
+    if terlaris.empty:
+        return None
+    item_counts = terlaris[['nama', METRIK[metrik.lower()]]]
+    item_counts.columns = ['Barang', metrik]
+    return px.bar(
+        item_counts,
+        x='Barang',
+        y=metrik,
+        title=f"{n} Barang Terlaris ({metrik})"
+    )
+
+
+def best_sellers_chart(mulai, akhir, metrik, n=10, path=None):
+    return _terlaris(_versi(path), path, str(mulai), str(akhir), metrik, n)
+
+
+@lru_cache(maxsize=128)
+def _bulanan_kasir(versi, path, kasir):
+    rekap = ReportService(path).monthly_kasir(kasir)
+    if not rekap:
+        return None, None
+    bulanan = pd.DataFrame(rekap).set_index('bulan')
+    bulanan = bulanan.rename(columns={'pendapatan': 'Pendapatan', 'jumlah_transaksi': 'Jumlah Transaksi'})
+    fig = px.bar(
+        bulanan,
+        x=bulanan.index,
+        y='Pendapatan',
+        title='Pendapatan Bulanan',
+        labels={'bulan': 'Bulan', 'Pendapatan': 'Total Pendapatan (Rp)'},
+        text_auto='.2s',
+        color='Jumlah Transaksi',
+        color_continuous_scale='blues'
+    )
+    return bulanan, fig
+
+
+def monthly_kasir_chart(kasir, path=None):
+    # (rekap bulanan sebagai DataFrame, figure) atau (None, None)
+    return _bulanan_kasir(_versi(path), path, kasir)
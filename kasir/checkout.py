@@ -0,0 +1,44 @@
+# Checkout: dari keranjang menjadi transaksi tersimpan
+#
+# Dipakai halaman Transaksi, API terminal (kasir.ingest), benchmark dan
+# replay tanpa Streamlit.
+from datetime import datetime
+
+from kasir import storage
+
+
+class PembayaranKurang(Exception):
+    pass
+
+
+class CheckoutService:
+    def __init__(self, path=None):
+        self.path = path
+
+    def prepare(self, cart, kasir, metode, bayar=None, waktu=None):
+        # Periksa keranjang dan pembayaran, lalu susun dict transaksi (belum disimpan)
+        if not len(cart):
+            raise ValueError("Keranjang kosong.")
+        total = cart.total()
+        if metode == "Cash":
+            if bayar is None or bayar < total:
+                raise PembayaranKurang("Uang diterima kurang dari total belanja.")
+        else:
+            bayar = total
+        return {
+            "waktu": waktu or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "kasir": kasir,
+            "items": cart.to_items(),
+            "total": total,
+            "bayar": bayar,
+            "kembalian": bayar - total,
+            "metode": metode
+        }
+
+    def checkout(self, cart, kasir, metode, bayar=None, waktu=None):
+        # Simpan transaksi, kurangi stok dan kosongkan keranjang; kembalikan
+        # dict transaksi (dengan id). StokTidakCukup jika stok sudah diambil kasir lain.
+        transaksi = self.prepare(cart, kasir, metode, bayar, waktu)
+        transaksi["id"] = storage.record_sale(transaksi, storage.connect(self.path))
+        cart.clear()
+        return transaksi
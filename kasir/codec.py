@@ -0,0 +1,106 @@
+# Codec serialisasi data kasir
+#
+# Dipakai untuk kolom items transaksi di database dan untuk file data
+# (load_data/save_data di luar database, migrasi JSON). Pilihan codec:
+#   json     stdlib, tanpa spasi
+#   orjson   JSON yang sama, parse/dump jauh lebih cepat (opsional)
+#   msgpack  biner, lebih kecil; kolom items jadi BLOB (opsional)
+# KASIR_CODEC memilih codec untuk tulisan baru; default orjson bila
+# terpasang, selain itu json. Pembacaan mengenali format dari isinya, jadi
+# data lama (termasuk JSON ber-indent) tetap terbaca setelah codec diganti.
+#
+#   python -m kasir.codec convert msgpack     # ubah kolom items kasir.db
+#   python -m kasir.codec convert json data/barang.json
+import argparse
+import json
+import os
+from functools import lru_cache
+
+CODEC = ["json", "orjson", "msgpack"]
+
+
+class Codec:
+    def __init__(self, nama, dumps, loads, biner):
+        self.nama = nama
+        self.dumps = dumps
+        self.loads = loads
+        self.biner = biner  # True: dumps menghasilkan bytes
+
+
+@lru_cache(maxsize=None)
+def get_codec(nama=None):
+    nama = nama or os.environ.get("KASIR_CODEC") or ("orjson" if _ada("orjson") else "json")
+    if nama == "json":
+        return Codec("json", lambda data: json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+                     json.loads, False)
+    if nama == "orjson":
+        import orjson
+
+        return Codec("orjson", lambda data: orjson.dumps(data).decode(), orjson.loads, False)
+    if nama == "msgpack":
+        import msgpack
+
+        return Codec("msgpack", msgpack.packb, msgpack.unpackb, True)
+    raise ValueError(f"Codec tidak dikenal: {nama} (pilihan: {', '.join(CODEC)})")
+
+
+@lru_cache(maxsize=None)
+def _ada(modul):
+    try:
+        __import__(modul)
+    except ImportError:
+        return False
+    return True
+
+
+def encode(data):
+    return get_codec().dumps(data)
+
+
+def decode(data):
+    # str dan bytes yang diawali [ / { adalah JSON (di msgpack kedua byte
+    # itu bilangan bulat, bukan list/dict); selain itu msgpack
+    if isinstance(data, str) or data.lstrip()[:1] in (b"[", b"{"):
+        return get_codec("orjson" if _ada("orjson") else "json").loads(data)
+    return get_codec("msgpack").loads(data)
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def dump_file(f, data, nama=None):
+    # f: file biner yang sudah terbuka
+    isi = get_codec(nama).dumps(data)
+    f.write(isi if isinstance(isi, bytes) else isi.encode())
+
+
+def convert_file(path, nama):
+    from kasir.storage import file_lock, write_json_atomic
+
+    with file_lock(path):
+        write_json_atomic(path, load_file(path), nama)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ubah format data kasir ke codec lain")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    ubah = sub.add_parser("convert", help="tulis ulang kolom items di database atau file data")
+    ubah.add_argument("codec", choices=CODEC)
+    ubah.add_argument("file", nargs="*", help="file data (default: kolom items di KASIR_DB)")
+    args = parser.parse_args()
+
+    if args.file:
+        for path in args.file:
+            convert_file(path, args.codec)
+            print(f"{path}: {os.path.getsize(path):,} byte")
+        return
+    from kasir import storage
+
+    jumlah = storage.convert_items(args.codec)
+    print(f"{jumlah:,} transaksi ditulis ulang dengan {args.codec}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Ekspor laporan penjualan ke CSV, Excel atau Parquet
+#
+# Transaksi dibaca per segmen dan langsung ditulis ke file sementara di
+# memori (pindah ke disk jika besar), jadi ekspor rentang panjang tidak
+# pernah membangun satu DataFrame besar. Halaman Laporan memanggilnya
+# lewat data tertunda st.download_button, jadi file baru dibuat saat diunduh.
+import csv
+import io
+import tempfile
+
+from kasir import report, storage
+
+BATAS_MEMORI = 8 * 1024 * 1024  # lebih dari ini, file sementara pindah ke disk
+
+KOLOM = ["waktu", "kasir", "items", "total", "bayar", "kembalian", "metode"]
+KOLOM_KASIR = ["Kasir", "Total Pendapatan", "Jumlah Transaksi"]
+
+FORMAT = {
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet opsional
+    pa = pq = None
+
+
+def available_formats():
+    return [f for f in FORMAT if f != "Parquet" or pq is not None]
+
+
+def _segmen(mulai, akhir):
+    # Baris transaksi per segmen, kolom items diringkas jadi teks
+    for segmen in storage.iter_table("transaksi", mulai=mulai, akhir=akhir):
+        yield [[t["waktu"], t["kasir"], ", ".join(f"{item['nama']}({item['qty']}x)" for item in t["items"]),
+                t["total"], t["bayar"], t["kembalian"], t["metode"]] for t in segmen]
+
+
+def _baris_kasir(mulai, akhir):
+    return [[k["kasir"], k["pendapatan"], k["jumlah_transaksi"]] for k in report.per_kasir(mulai, akhir)]
+
+
+def _csv(f, mulai, akhir):
+    teks = io.TextIOWrapper(f, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(teks)
+    writer.writerow(KOLOM)
+    for rows in _segmen(mulai, akhir):
+        writer.writerows(rows)
+    teks.detach()
+
+
+def _xlsx(f, mulai, akhir):
+    from openpyxl import Workbook
+
+    # write_only: baris langsung di-stream ke file, memori tetap kecil
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Transaksi")
+    ws.append(KOLOM)
+    for rows in _segmen(mulai, akhir):
+        for row in rows:
+            ws.append(row)
+    ws = wb.create_sheet("Kasir")
+    ws.append(KOLOM_KASIR)
+    for row in _baris_kasir(mulai, akhir):
+        ws.append(row)
+    wb.save(f)
+
+
+def _parquet(f, mulai, akhir):
+    skema = pa.schema([("waktu", pa.string()), ("kasir", pa.string()), ("items", pa.string()),
+                       ("total", pa.float64()), ("bayar", pa.float64()), ("kembalian", pa.float64()),
+                       ("metode", pa.string())])
+    with pq.ParquetWriter(f, skema) as writer:
+        for rows in _segmen(mulai, akhir):
+            kolom = list(zip(*rows))
+            writer.write_batch(pa.record_batch(
+                [pa.array(nilai, type=skema.field(i).type) for i, nilai in enumerate(kolom)], schema=skema))
+
+
+def export_name(format, mulai=None, akhir=None):
+    # (nama_file, mime) tanpa membuat filenya
+    ekstensi, mime = FORMAT[format]
+    return f"laporan_penjualan_{mulai or 'awal'}_{akhir or 'akhir'}.{ekstensi}", mime
+
+
+def export_transaksi(format, mulai=None, akhir=None):
+    # Kembalikan (file, nama_file, mime); file berada di posisi 0
+    ekstensi, _ = FORMAT[format]
+    f = tempfile.SpooledTemporaryFile(max_size=BATAS_MEMORI)
+    {"xlsx": _xlsx, "csv": _csv, "parquet": _parquet}[ekstensi](f, mulai, akhir)
+    f.seek(0)
+    return (f, *export_name(format, mulai, akhir))
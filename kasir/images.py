@@ -0,0 +1,131 @@
+# Penyimpanan foto profil berbasis isi (content-addressed)
+#
+# Foto disimpan dalam ukuran penuh sebagai file di FOTO_DIR dengan nama hash
+# SHA-256 dari isinya (WebP, atau JPEG jika Pillow tidak mendukung WebP),
+# ditambah thumbnail yang sudah dibuat saat upload untuk tampilan. Tabel akun hanya menyimpan nama file, jadi memuat
+# akun tidak lagi ikut membaca gambar. File tidak pernah diubah setelah
+# ditulis, sehingga gambar yang sudah didekode aman di-cache di memori.
+# Pillow baru diimpor saat foto benar-benar diproses.
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+from functools import lru_cache
+
+from kasir import storage
+
+FOTO_DIR = os.environ.get("KASIR_FOTO", "foto")
+LEBAR_THUMB = 150  # lebar thumbnail (ukuran tampilan di halaman profil)
+
+_REF = re.compile(r"^[0-9a-f]{64}\.(webp|jpg)$")
+
+
+def is_ref(nilai):
+    return bool(nilai) and _REF.match(nilai) is not None
+
+
+def _path(ref, thumb=False):
+    nama = ref.replace(".", "_thumb.") if thumb else ref
+    return os.path.join(FOTO_DIR, ref[:2], nama)
+
+
+@lru_cache(maxsize=None)
+def _webp():
+    from PIL import features
+
+    return features.check("webp")
+
+
+def _encode(image, lebar=None):
+    # lebar None: ukuran asli
+    if lebar and image.width > lebar:
+        image = image.resize((lebar, max(1, int(image.height * lebar / image.width))))
+    buf = io.BytesIO()
+    if _webp():
+        image.save(buf, format="WEBP", quality=85, method=4)
+    else:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buf, format="JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
+
+def _tulis(path, data):
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sementara = f"{path}.{os.getpid()}.tmp"
+    with open(sementara, "wb") as f:
+        f.write(data)
+    os.replace(sementara, path)
+
+
+def save_photo(sumber):
+    # sumber: file upload, path, bytes atau PIL.Image; kembalikan referensi
+    from PIL import Image
+
+    if isinstance(sumber, bytes):
+        sumber = io.BytesIO(sumber)
+    image = sumber if isinstance(sumber, Image.Image) else Image.open(sumber)
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    data = _encode(image)
+    ref = f"{hashlib.sha256(data).hexdigest()}.{'webp' if _webp() else 'jpg'}"
+    _tulis(_path(ref, thumb=True), _encode(image, LEBAR_THUMB))
+    _tulis(_path(ref), data)
+    return ref
+
+
+@lru_cache(maxsize=128)
+def _buka(path):
+    from PIL import Image
+
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def open_photo(ref, thumb=True):
+    # Gambar yang sudah didekode, atau None jika referensi/file tidak ada
+    if not is_ref(ref):
+        return None
+    try:
+        return _buka(_path(ref, thumb))
+    except FileNotFoundError:
+        return None
+
+
+_migrasi_lock = threading.Lock()
+_sudah_migrasi = set()  # path database yang fotonya sudah diperiksa di proses ini
+
+
+def migrate_photos(conn=None):
+    # Pindahkan foto base64 lama dari tabel akun ke penyimpanan file;
+    # dipanggil di setiap rerun, tapi akun hanya dipindai sekali per proses
+    conn = conn or storage.connect()
+    with _migrasi_lock:
+        if conn.path in _sudah_migrasi:
+            return 0
+        jumlah = _pindahkan(conn)
+        _sudah_migrasi.add(conn.path)
+        return jumlah
+
+
+def _pindahkan(conn):
+    lama = conn.execute("SELECT username, foto_profil FROM akun WHERE length(foto_profil) > 70").fetchall()
+    if not lama:
+        return 0
+    baru = []
+    for row in lama:
+        if is_ref(row["foto_profil"]):
+            continue
+        try:
+            ref = save_photo(base64.b64decode(row["foto_profil"]))
+        except Exception:
+            ref = None  # foto rusak tidak bisa dipakai lagi
+        baru.append((ref, row["username"], row["foto_profil"]))
+    with storage.transaction(conn):
+        conn.executemany("UPDATE akun SET foto_profil = ? WHERE username = ? AND foto_profil = ?", baru)
+    return len(baru)
@@ -0,0 +1,200 @@
+# Impor katalog barang massal dari CSV atau Excel
+#
+# File dibaca per potongan (UKURAN_POTONGAN baris): CSV lewat
+# pandas.read_csv(chunksize), Excel lewat openpyxl read_only. Setiap
+# potongan diperiksa sekaligus per kolom (wajib isi, harga > 0, stok bulat
+# >= 0, angka berhingga dan di bawah MAKS_HARGA/MAKS_STOK, duplikat nama &
+# kategori atau SKU di dalam file, SKU milik barang lain), lalu semua baris
+# yang lolos ditulis dalam satu transaksi lewat storage.upsert_barang. Baris
+# yang ditolak dilaporkan dengan nomor barisnya di file (baris 1 = judul kolom).
+#
+# CSV bertitik koma (Excel berbahasa Indonesia) memakai format angka
+# Indonesia: 1.500.000,50. File lain memakai titik desimal, dan angka yang
+# tampak berpemisah ribuan (15.000, 1,500) ditolak karena ambigu.
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from kasir import storage
+from kasir.catalogue import get_catalogue
+
+UKURAN_POTONGAN = 20000
+KOLOM = ["sku", "nama", "kategori", "stok", "harga", "harga_modal"]
+WAJIB = ["nama", "kategori", "harga"]
+MAKS_HARGA = 10 ** 12  # batas atas harga dan harga modal (Rp)
+MAKS_STOK = 10 ** 9    # batas atas stok; jauh di bawah batas int64 SQLite
+ANGKA_KOMA = r"[+-]?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?"  # 1.500.000,50 / 12,5 / 15000
+AMBIGU = r"[+-]?\d{1,3}(?:[.,]\d{3})+"                  # 15.000 / 1,500 di file bertitik desimal
+
+# Judul kolom lain yang dikenali (huruf kecil, spasi jadi _)
+ALIAS = {
+    "nama_barang": "nama",
+    "barcode": "sku",
+    "sku_/_barcode": "sku",
+    "harga_satuan": "harga",
+    "harga_jual": "harga",
+    "harga_beli": "harga_modal",
+    "jumlah": "stok",
+}
+
+
+def _kolom(judul):
+    nama = str(judul or "").strip().lower().replace(" ", "_")
+    return ALIAS.get(nama, nama)
+
+
+def _teks(v):
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))  # angka bulat dari Excel (barcode, stok)
+    return str(v)
+
+
+def _potongan_csv(f, ukuran):
+    awal = f.read(4096)
+    f.seek(0)
+    if isinstance(awal, bytes):
+        awal = awal.decode("utf-8", "ignore")
+    # Excel berbahasa Indonesia menyimpan CSV dengan pemisah titik koma
+    # dan koma desimal
+    sep = ";" if awal.count(";") > awal.count(",") else ","
+    for df in pd.read_csv(f, sep=sep, dtype=object, keep_default_na=False, chunksize=ukuran,
+                          skipinitialspace=True, encoding="utf-8-sig"):
+        df.attrs["desimal"] = "," if sep == ";" else "."
+        yield df
+
+
+def _potongan_excel(f, ukuran):
+    from openpyxl import load_workbook
+
+    # read_only: baris dibaca bertahap dari arsip, tidak dimuat semua
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        judul = [_teks(k) for k in next(rows, ())]
+        while True:
+            isi = [[_teks(v) for v in row[:len(judul)]] for row in itertools.islice(rows, ukuran)]
+            if not isi:
+                break
+            yield pd.DataFrame(isi, columns=judul, dtype=object).fillna("")
+    finally:
+        wb.close()
+
+
+def read_chunks(f, nama_file, ukuran=UKURAN_POTONGAN):
+    # DataFrame teks per potongan dengan kolom baku dan nomor baris file sebagai
+    # index; attrs["desimal"] berisi pemisah desimal angka di file
+    baca = _potongan_excel if nama_file.lower().endswith((".xlsx", ".xlsm")) else _potongan_csv
+    nomor = 2
+    for df in baca(f, ukuran):
+        desimal = df.attrs.get("desimal", ".")
+        df = df.rename(columns=_kolom)
+        df = df.loc[:, ~df.columns.duplicated()]
+        kurang = [k for k in WAJIB if k not in df.columns]
+        if kurang:
+            raise ValueError(f"Kolom wajib tidak ada: {', '.join(kurang)} (kolom: {', '.join(KOLOM)})")
+        df = df.reindex(columns=KOLOM, fill_value="")
+        df.index = pd.RangeIndex(nomor, nomor + len(df))
+        nomor += len(df)
+        df = df[(df != "").any(axis=1)]  # baris kosong dilewati
+        df.attrs["desimal"] = desimal
+        yield df
+
+
+def _angka(kolom, maks, desimal="."):
+    # "" -> NaN (tidak diisi); teks bukan angka, inf/nan dan nilai di atas maks
+    # ditandai salah. Desimal ",": titik ribuan dibuang dan koma jadi titik;
+    # desimal ".": angka berpola ribuan ditandai ambigu (tidak dibaca)
+    kolom = kolom.str.strip()
+    kosong = kolom == ""
+    if desimal == ",":
+        indonesia = kolom.str.fullmatch(ANGKA_KOMA)
+        kolom = kolom.mask(indonesia, kolom.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        ambigu = pd.Series(False, index=kolom.index)
+    else:
+        ambigu = kolom.str.fullmatch(AMBIGU)
+    nilai = pd.to_numeric(kolom.where(~kosong & ~ambigu), errors="coerce").astype("float64")
+    salah = ~kosong & ~ambigu & ~(np.isfinite(nilai) & (nilai.abs() <= maks))
+    return nilai.where(~salah), kosong, salah, ambigu
+
+
+class Importer:
+    # Pemeriksaan per potongan; duplikat dicari lintas potongan lewat
+    # kunci (nama & kategori) dan SKU yang sudah terlihat di file
+    def __init__(self, katalog):
+        self._kunci = pd.Series(index=pd.Index([], dtype=object), dtype="int64")  # nilai -> baris pertama di file
+        self._sku = pd.Series(index=pd.Index([], dtype=object), dtype="int64")
+        self._pemilik_sku = pd.Series({sku: f"{b['nama']}\x1f{b['kategori']}"
+                                       for b in katalog.records() if (sku := b.get("sku"))}, dtype=object)
+        self.valid = []
+        self.galat = []
+
+    def check(self, df):
+        nama = df["nama"].str.strip()
+        kategori = df["kategori"].str.strip()
+        sku = df["sku"].str.strip()
+        desimal = df.attrs.get("desimal", ".")
+        harga, _, harga_salah, harga_ambigu = _angka(df["harga"], MAKS_HARGA, desimal)
+        stok, _, stok_salah, stok_ambigu = _angka(df["stok"], MAKS_STOK, desimal)
+        modal, _, modal_salah, modal_ambigu = _angka(df["harga_modal"], MAKS_HARGA, desimal)
+        kunci = nama + "\x1f" + kategori
+        kunci_dup, self._kunci = self._duplikat(kunci, self._kunci)
+        sku_dup, self._sku = self._duplikat(sku.where(sku != ""), self._sku)
+        pemilik = sku.map(self._pemilik_sku)
+
+        aturan = [
+            (nama == "", "nama kosong"),
+            (kategori == "", "kategori kosong"),
+            (harga_ambigu | stok_ambigu | modal_ambigu,
+             "angka seperti 15.000 atau 1,500 ambigu: tulis tanpa pemisah ribuan"),
+            ((harga_salah | ~(harga > 0)) & ~harga_ambigu, f"harga harus angka > 0 dan <= {MAKS_HARGA:,}"),
+            (stok_salah | (stok < 0) | (stok % 1 > 0), f"stok harus bilangan bulat 0 - {MAKS_STOK:,}"),
+            (modal_salah | (modal < 0), f"harga modal harus angka 0 - {MAKS_HARGA:,}"),
+            (kunci_dup.notna(), "duplikat nama & kategori dengan baris " + kunci_dup.astype("Int64").astype(str)),
+            (sku_dup.notna(), "duplikat SKU dengan baris " + sku_dup.astype("Int64").astype(str)),
+            (pemilik.notna() & (pemilik != kunci), "SKU sudah dipakai barang lain"),
+        ]
+        pesan = pd.Series("", index=df.index)
+        for salah, teks in aturan:
+            pesan = pesan.mask(salah, pesan + (teks if isinstance(teks, str) else teks.fillna("")) + "; ")
+        salah = pesan != ""
+        if salah.any():
+            self.galat.append(pd.DataFrame({"baris": df.index[salah], "nama": nama[salah],
+                                            "kategori": kategori[salah], "galat": pesan[salah].str[:-2]}))
+        ok = ~salah
+        self.valid.extend(
+            {"sku": s or None, "nama": n, "kategori": k, "stok": None if pd.isna(q) else q, "harga": h,
+             "harga_modal": None if pd.isna(m) else m}
+            for s, n, k, q, h, m in zip(sku[ok].tolist(), nama[ok].tolist(), kategori[ok].tolist(),
+                                        stok[ok].astype("Int64").tolist(), harga[ok].tolist(), modal[ok].tolist()))
+
+    @staticmethod
+    def _duplikat(kunci, dilihat):
+        # Nomor baris pertama untuk nilai yang sudah muncul sebelumnya (NaN jika
+        # belum), dan dilihat ditambah nilai yang baru muncul di potongan ini
+        ada = kunci.notna()
+        # Index object (bukan string arrow) agar isin/map memakai tabel hash
+        pertama = pd.Series(kunci.index[ada], index=pd.Index(kunci[ada].to_numpy(), dtype=object))
+        pertama = pertama[~pertama.index.duplicated()]
+        sebelumnya = kunci.map(dilihat).fillna(kunci.map(pertama))
+        dilihat = pd.concat([dilihat, pertama[~pertama.index.isin(dilihat.index)]])
+        return sebelumnya.where(sebelumnya != kunci.index), dilihat
+
+    def errors(self):
+        if not self.galat:
+            return pd.DataFrame(columns=["baris", "nama", "kategori", "galat"])
+        return pd.concat(self.galat, ignore_index=True)
+
+
+def import_barang(f, nama_file, tambah_stok=False, oleh=None, path=None, ukuran=UKURAN_POTONGAN):
+    # Kembalikan dict baru, diperbarui, galat (DataFrame baris yang ditolak)
+    importer = Importer(get_catalogue(path))
+    for df in read_chunks(f, nama_file, ukuran):
+        importer.check(df)
+    baru = diperbarui = 0
+    if importer.valid:
+        baru, diperbarui = storage.upsert_barang(importer.valid, tambah_stok, oleh, f"impor {nama_file}",
+                                                 storage.connect(path) if path else None)
+    return {"baru": baru, "diperbarui": diperbarui, "galat": importer.errors()}
@@ -0,0 +1,237 @@
+# API checkout untuk terminal genggam dan pemindai (HTTP/JSON, asyncio)
+#
+# Dijalankan sebagai proses sendiri di samping aplikasi Streamlit, memakai
+# database yang sama (KASIR_DB):
+#
+#   python -m kasir.ingest --port 8502
+#
+# POST /checkout  {"kasir": "kasir1", "metode": "Cash", "bayar": 20000,
+#                  "items": [{"barang_id": 3, "qty": 2}, {"sku": "899...", "qty": 1}],
+#                  "waktu": "2025-01-31 14:05:00"}   (waktu opsional, default sekarang)
+#   -> 201 dengan dict transaksi (skema sama dengan "Simpan Transaksi", plus id)
+#   -> 409 stok tidak cukup, 400 permintaan tidak valid
+# GET /status     jumlah checkout, batch dan rata-rata ukuran batch
+#
+# Keranjang disusun dan diperiksa dengan Cart dan CheckoutService.prepare
+# seperti halaman Transaksi. Penyimpanan memakai group commit: checkout yang
+# datang bersamaan dikumpulkan (maks. MAKS_BATCH) dan disimpan dengan satu
+# storage.record_sales, jadi satu fsync untuk banyak checkout. Selama satu
+# batch ditulis, permintaan berikutnya menumpuk menjadi batch selanjutnya.
+# KASIR_API_TOKEN (opsional) mewajibkan header "Authorization: Bearer <token>".
+import argparse
+import asyncio
+import hmac
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from kasir import storage
+from kasir.cart import Cart
+from kasir.catalogue import get_catalogue
+from kasir.checkout import CheckoutService, PembayaranKurang
+
+MAKS_BATCH = 256
+MAKS_BODY = 1024 * 1024
+METODE = ["Cash", "QRIS/Transfer"]
+FORMAT_WAKTU = "%Y-%m-%d %H:%M:%S"  # format kolom waktu transaksi (laporan dan rekap bergantung padanya)
+STATUS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+          405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class PermintaanSalah(Exception):
+    pass
+
+
+class GroupCommit:
+    # Antrean checkout -> satu transaksi database per batch. Penulisan di
+    # satu thread sendiri agar event loop tetap melayani permintaan.
+    def __init__(self, path=None, maks_batch=MAKS_BATCH):
+        self.path = path
+        self.maks_batch = maks_batch
+        self.checkout = 0
+        self.batch = 0
+        self._antrean = asyncio.Queue()
+        self._penulis = ThreadPoolExecutor(1, thread_name_prefix="kasir-ingest")
+        self._tugas = None
+
+    def start(self):
+        self._tugas = asyncio.get_running_loop().create_task(self._jalan())
+
+    async def submit(self, transaksi):
+        # Kembalikan id transaksi setelah batch-nya tersimpan
+        hasil = asyncio.get_running_loop().create_future()
+        await self._antrean.put((transaksi, hasil))
+        return await hasil
+
+    async def _jalan(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._antrean.get()]
+            while len(batch) < self.maks_batch and not self._antrean.empty():
+                batch.append(self._antrean.get_nowait())
+            transaksi_list = [t for t, _ in batch]
+            try:
+                hasil = await loop.run_in_executor(self._penulis, self._simpan, transaksi_list)
+            except Exception:
+                # Gagal di tingkat batch (mis. saat rekap): simpan satu per satu
+                # agar hanya checkout penyebabnya yang gagal
+                hasil = await loop.run_in_executor(self._penulis, self._simpan_terpisah, transaksi_list)
+            self.batch += 1
+            self.checkout += len(batch)
+            for (_, future), h in zip(batch, hasil):
+                if future.done():
+                    continue  # klien sudah memutus koneksi
+                if isinstance(h, Exception):
+                    future.set_exception(h)
+                else:
+                    future.set_result(h)
+
+    def _simpan(self, transaksi_list):
+        return storage.record_sales(transaksi_list, storage.connect(self.path))
+
+    def _simpan_terpisah(self, transaksi_list):
+        hasil = []
+        for transaksi in transaksi_list:
+            try:
+                hasil += self._simpan([transaksi])
+            except Exception as e:
+                hasil.append(e)
+        return hasil
+
+    def status(self):
+        return {"checkout": self.checkout, "batch": self.batch,
+                "rata_rata_batch": round(self.checkout / self.batch, 2) if self.batch else 0,
+                "antrean": self._antrean.qsize()}
+
+
+def build_cart(items, path=None):
+    # Keranjang dari [{"barang_id" | "sku", "qty"}]; stok dicek seperti di halaman Transaksi
+    if not isinstance(items, list) or not items:
+        raise PermintaanSalah("items wajib berisi minimal satu barang")
+    katalog = get_catalogue(path)
+    keranjang = Cart()
+    for item in items:
+        if not isinstance(item, dict):
+            raise PermintaanSalah("setiap item harus objek JSON")
+        qty = item.get("qty", 1)
+        if not isinstance(qty, int) or isinstance(qty, bool) or qty <= 0:
+            raise PermintaanSalah("qty harus bilangan bulat > 0")
+        b = katalog.get(item["barang_id"]) if "barang_id" in item else katalog.find_sku(str(item.get("sku", "")))
+        if b is None:
+            raise PermintaanSalah(f"barang tidak ditemukan: {item.get('barang_id', item.get('sku'))}")
+        keranjang.add(b, qty)
+    return keranjang
+
+
+class Server:
+    def __init__(self, path=None, maks_batch=MAKS_BATCH, token=None):
+        self.path = path
+        self.token = token if token is not None else os.environ.get("KASIR_API_TOKEN")
+        self.layanan = CheckoutService(path)
+        self.commit = GroupCommit(path, maks_batch)
+
+    async def serve(self, host="127.0.0.1", port=8502):
+        self.commit.start()
+        server = await asyncio.start_server(self._koneksi, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _koneksi(self, reader, writer):
+        # HTTP/1.1 sederhana dengan keep-alive: satu koneksi per terminal
+        try:
+            while True:
+                baris = await reader.readline()
+                if not baris:
+                    break
+                metode, jalur, _ = baris.decode("latin-1").split(" ", 2)
+                header = {}
+                while (baris := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    kunci, _, nilai = baris.decode("latin-1").partition(":")
+                    header[kunci.strip().lower()] = nilai.strip()
+                panjang = int(header.get("content-length", 0))
+                if panjang > MAKS_BODY:
+                    await self._kirim(writer, 413, {"error": "permintaan terlalu besar"}, tutup=True)
+                    break
+                body = await reader.readexactly(panjang) if panjang else b""
+                kode, isi = await self._tangani(metode, jalur, header, body)
+                tutup = header.get("connection", "").lower() == "close"
+                await self._kirim(writer, kode, isi, tutup)
+                if tutup:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _tangani(self, metode, jalur, header, body):
+        if self.token and not hmac.compare_digest(header.get("authorization", "").encode(),
+                                                  f"Bearer {self.token}".encode()):
+            return 401, {"error": "token tidak valid"}
+        if jalur == "/status":
+            return 200, self.commit.status()
+        if jalur != "/checkout":
+            return 404, {"error": "tidak ditemukan"}
+        if metode != "POST":
+            return 405, {"error": "gunakan POST"}
+        try:
+            transaksi = self._siapkan(json.loads(body))
+            transaksi["id"] = await self.commit.submit(transaksi)
+        except storage.StokTidakCukup as e:
+            return 409, {"error": str(e)}
+        except (PermintaanSalah, PembayaranKurang, ValueError, KeyError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except sqlite3.Error as e:
+            return 500, {"error": f"gagal menyimpan: {e}"}
+        return 201, transaksi
+
+    def _siapkan(self, data):
+        if not isinstance(data, dict):
+            raise PermintaanSalah("body harus objek JSON")
+        kasir = data.get("kasir")
+        if kasir not in {a["username"] for a in storage.cached_table("akun", self.path)}:
+            raise PermintaanSalah(f"kasir tidak dikenal: {kasir}")
+        metode = data.get("metode", "Cash")
+        if metode not in METODE:
+            raise PermintaanSalah(f"metode harus salah satu dari: {', '.join(METODE)}")
+        bayar = data.get("bayar")
+        if bayar is not None and (not isinstance(bayar, (int, float)) or isinstance(bayar, bool)
+                                  or not math.isfinite(bayar)):
+            raise PermintaanSalah("bayar harus angka")
+        waktu = data.get("waktu")
+        if waktu is not None:
+            # Waktu dari terminal (mis. penjualan offline) harus persis formatnya
+            try:
+                waktu = datetime.strptime(waktu, FORMAT_WAKTU).strftime(FORMAT_WAKTU)
+            except (TypeError, ValueError):
+                raise PermintaanSalah("waktu harus berformat YYYY-MM-DD HH:MM:SS")
+        return self.layanan.prepare(build_cart(data.get("items"), self.path), kasir, metode, bayar, waktu)
+
+    @staticmethod
+    async def _kirim(writer, kode, isi, tutup=False):
+        body = json.dumps(isi, ensure_ascii=False).encode()
+        writer.write(f"HTTP/1.1 {kode} {STATUS[kode]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'close' if tutup else 'keep-alive'}\r\n"
+                     f"Date: {time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API checkout HTTP/JSON untuk terminal kasir")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--batch", type=int, default=MAKS_BATCH, help="maks. checkout per commit (1 = tanpa group commit)")
+    args = parser.parse_args()
+
+    print(f"API checkout di http://{args.host}:{args.port} (database {storage.DB_FILE})", flush=True)
+    try:
+        asyncio.run(Server(maks_batch=args.batch).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
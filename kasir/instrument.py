@@ -0,0 +1,134 @@
+# Instrumentasi waktu render (opsional)
+#
+# Mati secara default. Jika aktif (KASIR_INSTRUMEN=1 atau dinyalakan dari
+# halaman Performa Sistem), setiap rerun halaman dicatat: total waktu,
+# byte yang dibaca thread sesi (rchar di /proc/thread-self/io, termasuk
+# halaman SQLite dan file JSON) dan rincian per bagian yang dibungkus
+# span()/timed(). Catatan terakhir disimpan di memori dan bisa diekspor
+# sebagai JSON lines; KASIR_INSTRUMEN_FILE menambahkannya langsung ke file.
+# Saat mati, biaya per panggilan hanya satu pengecekan atribut.
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+BATAS_CATATAN = 1000  # rerun terakhir yang disimpan di memori
+
+_aktif = os.environ.get("KASIR_INSTRUMEN") == "1"
+_file = os.environ.get("KASIR_INSTRUMEN_FILE")
+_catatan = deque(maxlen=BATAS_CATATAN)
+_lock = threading.Lock()
+_lokal = threading.local()
+
+
+def enabled():
+    return _aktif
+
+
+def enable(aktif=True):
+    global _aktif
+    _aktif = aktif
+
+
+def _baca_io():
+    # Byte yang sudah dibaca thread ini; None di luar Linux
+    try:
+        with open("/proc/thread-self/io", "rb") as f:
+            for baris in f:
+                if baris.startswith(b"rchar:"):
+                    return int(baris.split()[1])
+    except OSError:
+        return None
+
+
+def _selisih(awal, akhir):
+    return akhir - awal if awal is not None and akhir is not None else None
+
+
+@contextmanager
+def rerun(halaman, pengguna=None):
+    # Bungkus satu rerun halaman; span di dalamnya masuk ke catatan ini
+    if not _aktif:
+        yield
+        return
+    catatan = {"waktu": time.strftime("%Y-%m-%d %H:%M:%S"), "halaman": halaman, "pengguna": pengguna,
+               "span": []}
+    _lokal.catatan = catatan
+    io = _baca_io()
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        catatan["ms"] = (time.perf_counter() - mulai) * 1000
+        catatan["bytes"] = _selisih(io, _baca_io())
+        _lokal.catatan = None
+        with _lock:
+            _catatan.append(catatan)
+            if _file:
+                with open(_file, "a") as f:
+                    f.write(json.dumps(catatan) + "\n")
+
+
+@contextmanager
+def span(nama):
+    catatan = getattr(_lokal, "catatan", None)
+    if catatan is None:
+        yield
+        return
+    io = _baca_io()
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        catatan["span"].append({"nama": nama, "ms": (time.perf_counter() - mulai) * 1000,
+                                "bytes": _selisih(io, _baca_io())})
+
+
+def timed(nama):
+    # Dekorator: catat durasi fungsi sebagai span jika sedang dalam rerun terinstrumentasi
+    def bungkus(fungsi):
+        @wraps(fungsi)
+        def terbungkus(*args, **kwargs):
+            if getattr(_lokal, "catatan", None) is None:
+                return fungsi(*args, **kwargs)
+            with span(nama):
+                return fungsi(*args, **kwargs)
+        return terbungkus
+    return bungkus
+
+
+def history():
+    with _lock:
+        return list(_catatan)
+
+
+def clear():
+    with _lock:
+        _catatan.clear()
+
+
+def summary():
+    # Agregat per nama span: jumlah, total, rata-rata, p95 (ms) dan total byte
+    per_nama = {}
+    for catatan in history():
+        for s in catatan["span"]:
+            per_nama.setdefault(s["nama"], []).append(s)
+    hasil = []
+    for nama, daftar in per_nama.items():
+        ms = sorted(s["ms"] for s in daftar)
+        hasil.append({
+            "span": nama,
+            "jumlah": len(ms),
+            "total_ms": sum(ms),
+            "rata_ms": sum(ms) / len(ms),
+            "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+            "bytes": sum(s["bytes"] or 0 for s in daftar),
+        })
+    return sorted(hasil, key=lambda h: -h["total_ms"])
+
+
+def export_jsonl():
+    return "".join(json.dumps(c) + "\n" for c in history())
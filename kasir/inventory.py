@@ -0,0 +1,128 @@
+# Persediaan: daftar stok menipis dan perkiraan pemesanan ulang
+#
+# Daftar stok menipis (stok <= BATAS_STOK) dipakai bersama semua sesi dan
+# diperbarui per mutasi lewat pemberitahuan kasir.storage, seperti katalog;
+# perubahan dari proses lain memicu bangun ulang lewat indeks stok.
+#
+# Perkiraan memakai kecepatan jual HARI_PENJUALAN hari terakhir dari
+# rekap_barang dan dihitung sekaligus dengan numpy untuk semua barang yang
+# terjual di jendela itu (barang lain sisa harinya tak terhingga), dengan
+# stok dari katalog bersama:
+#   sisa_hari = stok / terjual_per_hari
+#   saran_pesan = terjual_per_hari * (WAKTU_TUNGGU + CADANGAN) - stok
+# Hasilnya di-cache sampai tabel barang atau transaksi berubah.
+import os
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from kasir import storage
+from kasir.catalogue import get_catalogue
+
+BATAS_STOK = int(os.environ.get("KASIR_BATAS_STOK", 5))
+HARI_PENJUALAN = 28  # jendela kecepatan jual
+WAKTU_TUNGGU = 7     # hari sampai pesanan datang
+CADANGAN = 7         # hari stok yang ingin tersisa saat pesanan datang
+
+
+class Watchlist:
+    def __init__(self, barang=(), batas=BATAS_STOK):
+        self.batas = batas
+        self._barang = {}
+        for b in barang:
+            self.put(b)
+
+    def put(self, b):
+        if b["stok"] <= self.batas:
+            self._barang[b["id"]] = dict(b)
+        else:
+            self._barang.pop(b["id"], None)
+
+    def remove(self, barang_id):
+        self._barang.pop(barang_id, None)
+
+    def records(self):
+        # Stok paling sedikit dulu
+        return sorted(self._barang.values(), key=lambda b: (b["stok"], b["nama"]))
+
+    def __len__(self):
+        return len(self._barang)
+
+    def __contains__(self, barang_id):
+        return barang_id in self._barang
+
+
+_daftar = {}   # path -> (versi barang, Watchlist)
+_lock = threading.Lock()
+
+
+def get_watchlist(path=None):
+    path = path or storage.DB_FILE
+    conn = storage.connect(path)
+    nomor = storage.version("barang", conn)
+    entri = _daftar.get(path)
+    if entri is not None and entri[0] == nomor:
+        return entri[1]
+    with _lock:
+        entri = _daftar.get(path)
+        if entri is None or entri[0] != nomor:
+            rows = conn.execute(f"SELECT {', '.join(storage.KOLOM['barang'])} FROM barang WHERE stok <= ?",
+                                (BATAS_STOK,))
+            entri = _daftar[path] = (nomor, Watchlist(dict(r) for r in rows))
+        return entri[1]
+
+
+def _terapkan(path, tabel, sebelum, sesudah, perubahan):
+    if tabel != "barang":
+        return
+    with _lock:
+        entri = _daftar.get(path)
+        if entri is None or entri[0] != sebelum:
+            return
+        daftar = entri[1]
+        for b in perubahan["ubah"]:
+            daftar.put(b)
+        for barang_id in perubahan["hapus"]:
+            daftar.remove(barang_id)
+        _daftar[path] = (sesudah, daftar)
+
+
+storage.subscribe(_terapkan)
+
+
+def _hitung_ramalan(path, hari, sampai):
+    mulai = sampai - timedelta(days=hari - 1)
+    katalog = get_catalogue(path)
+    barang = []
+    for nama, kategori, terjual in storage.connect(path).execute(
+            "SELECT nama, kategori, SUM(qty) FROM rekap_barang WHERE tanggal >= ? AND tanggal <= ? "
+            "GROUP BY nama, kategori", (str(mulai), str(sampai))):
+        b = katalog.find(nama, kategori)  # barang yang sudah dihapus dilewati
+        if b is not None and terjual:
+            barang.append((b["id"], nama, kategori, b["stok"], terjual))
+    hasil = pd.DataFrame(barang, columns=["id", "nama", "kategori", "stok", "terjual"])
+    stok = hasil["stok"].to_numpy(dtype=np.float64)
+    per_hari = hasil["terjual"].to_numpy(dtype=np.float64) / hari
+    hasil["terjual_per_hari"] = per_hari
+    hasil["sisa_hari"] = stok / per_hari
+    hasil["saran_pesan"] = np.maximum(0, np.ceil(per_hari * (WAKTU_TUNGGU + CADANGAN) - stok)).astype(np.int64)
+    return hasil.drop(columns="terjual")
+
+
+def reorder_forecast(hari=HARI_PENJUALAN, sampai=None, path=None):
+    # DataFrame barang yang terjual di jendela: stok, terjual_per_hari, sisa_hari, saran_pesan
+    # sampai None = hari ini; tanggalnya ikut kunci cache agar jendela bergeser
+    # lewat tengah malam walau belum ada penjualan baru
+    path = path or storage.DB_FILE
+    sampai = sampai or date.today()
+    return storage.cached(("ramalan_stok", hari, str(sampai)), ("barang", "transaksi"),
+                          lambda: _hitung_ramalan(path, hari, sampai), path)
+
+
+def reorder_list(hari=HARI_PENJUALAN, sampai=None, path=None):
+    # Barang yang akan habis sebelum pesanan baru datang (+ cadangan), paling mendesak dulu
+    ramalan = reorder_forecast(hari, sampai, path)
+    perlu = ramalan[ramalan["sisa_hari"] < WAKTU_TUNGGU + CADANGAN]
+    return perlu.sort_values(["sisa_hari", "terjual_per_hari"], ascending=[True, False])
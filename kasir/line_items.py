@@ -0,0 +1,343 @@
+# Item transaksi dalam bentuk kolom untuk analitik
+#
+# Setiap baris keranjang dari semua transaksi diratakan menjadi array numpy
+# (waktu, produk, kasir, qty, subtotal, harga_modal). Waktu disimpan sebagai
+# detik epoch (int64), produk dikodekan sebagai indeks ke daftar (nama,
+# kategori), kasir dan kategori juga dikodekan ke daftar nama.
+#
+# Kolom terdiri dari dua bagian yang masing-masing urut waktu:
+#   dasar  snapshot di disk (<db>.kolom/, file .npy) yang dibuka dengan
+#          mmap, jadi semua sesi dan semua proses server berbagi halaman
+#          memori yang sama
+#   ekor   transaksi setelah snapshot, di memori; jika lebih dari BATAS_EKOR
+#          item, snapshot ditulis ulang dan ekor dikosongkan
+# Filter tanggal adalah pencarian biner (searchsorted) di kolom waktu tiap
+# bagian, dan hasil agregasi kedua bagian dijumlahkan tanpa menyalin kolom.
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kasir import codec, storage
+
+METRIK = {
+    "qty": "qty",
+    "pendapatan": "subtotal",
+    "margin": "margin",
+}
+
+DIMENSI = ["hari", "produk", "kategori", "kasir"]
+
+KOLOM = {
+    "waktu": np.int64,
+    "kode_produk": np.int32,
+    "kode_kasir": np.int32,
+    "qty": np.int64,
+    "subtotal": np.float64,
+    "harga_modal": np.float64,
+}
+
+BATAS_EKOR = 100_000  # item di luar snapshot sebelum snapshot ditulis ulang
+HARI = 86400
+
+
+def _kodekan(daftar, kode, nilai):
+    k = kode.get(nilai)
+    if k is None:
+        k = kode[nilai] = len(daftar)
+        daftar.append(nilai)
+    return k
+
+
+def _kosong():
+    return {nama: np.empty(0, dtype=tipe) for nama, tipe in KOLOM.items()}
+
+
+def _urutkan(bagian):
+    # Urut waktu (stabil); transaksi biasanya sudah urut sehingga cukup dicek
+    waktu = bagian["waktu"]
+    if len(waktu) < 2 or (waktu[1:] >= waktu[:-1]).all():
+        return bagian
+    urutan = np.argsort(waktu, kind="stable")
+    return {nama: kolom[urutan] for nama, kolom in bagian.items()}
+
+
+def _gabung(*bagian):
+    return _urutkan({nama: np.concatenate([b[nama] for b in bagian]) for nama in KOLOM})
+
+
+def _epoch(tanggal, hari=0):
+    return (np.datetime64(str(tanggal)[:10], "D") + hari).astype("datetime64[s]").astype(np.int64)
+
+
+class LineItems:
+    def __init__(self):
+        self.produk = []          # kode -> (nama, kategori)
+        self._kode = {}
+        self.kategori = []        # kode -> nama kategori
+        self._kode_kategori = {}
+        self.kategori_produk = []  # kode produk -> kode kategori
+        self.kasir = []           # kode -> username
+        self._kode_kasir = {}
+        self.dasar = _kosong()
+        self.ekor = _kosong()
+        self.terakhir_id = 0
+        self.jumlah_transaksi = 0
+        self.waktu_terakhir = None  # waktu transaksi terakhir_id, untuk cek database yang sama
+        self.snapshot = None        # (path meta, mtime) jika dasar berasal dari snapshot
+
+    def __len__(self):
+        return len(self.dasar["qty"]) + len(self.ekor["qty"])
+
+    def copy(self):
+        # Salinan dangkal: array diganti (bukan diubah) saat append, jadi
+        # pembaca yang memegang instance lama tetap melihat data yang utuh
+        baru = LineItems.__new__(LineItems)
+        baru.__dict__.update(self.__dict__)
+        for nama in ("produk", "_kode", "kategori", "_kode_kategori", "kategori_produk", "kasir", "_kode_kasir"):
+            setattr(baru, nama, getattr(self, nama).copy())
+        return baru
+
+    def append(self, rows):
+        # rows: (id, waktu, kasir, items) dari tabel transaksi, urut id
+        waktu, kode, kasir, qty, subtotal, modal = [], [], [], [], [], []
+        for row in rows:
+            k_kasir = _kodekan(self.kasir, self._kode_kasir, row["kasir"])
+            for item in codec.decode(row["items"]):
+                kunci = (item["nama"], item["kategori"])
+                k = self._kode.get(kunci)
+                if k is None:
+                    k = _kodekan(self.produk, self._kode, kunci)
+                    self.kategori_produk.append(_kodekan(self.kategori, self._kode_kategori, item["kategori"]))
+                waktu.append(row["waktu"])
+                kode.append(k)
+                kasir.append(k_kasir)
+                qty.append(item["qty"])
+                subtotal.append(item["subtotal"])
+                modal.append(item.get("harga_modal") or 0)
+            self.terakhir_id = row["id"]
+            self.waktu_terakhir = row["waktu"]
+        self.jumlah_transaksi += len(rows)
+        if not waktu:
+            return
+        self.ekor = _gabung(self.ekor, {
+            "waktu": np.array(waktu, dtype="datetime64[s]").astype(np.int64),
+            "kode_produk": np.asarray(kode, dtype=np.int32),
+            "kode_kasir": np.asarray(kasir, dtype=np.int32),
+            "qty": np.asarray(qty, dtype=np.int64),
+            "subtotal": np.asarray(subtotal, dtype=np.float64),
+            "harga_modal": np.asarray(modal, dtype=np.float64),
+        })
+
+    def potong(self, mulai=None, akhir=None):
+        # Irisan (view, tanpa salinan) tiap bagian dalam rentang tanggal
+        bawah = _epoch(mulai) if mulai is not None else None
+        atas = _epoch(akhir, 1) if akhir is not None else None
+        hasil = []
+        for bagian in (self.dasar, self.ekor):
+            waktu = bagian["waktu"]
+            i = np.searchsorted(waktu, bawah) if bawah is not None else 0
+            j = np.searchsorted(waktu, atas) if atas is not None else len(waktu)
+            if j > i:
+                hasil.append({nama: kolom[i:j] for nama, kolom in bagian.items()})
+        return hasil
+
+    def per_product(self, mulai=None, akhir=None):
+        # Total qty, pendapatan, modal dan margin per produk dalam rentang tanggal
+        n = len(self.produk)
+        qty, subtotal, modal = np.zeros(n), np.zeros(n), np.zeros(n)
+        for b in self.potong(mulai, akhir):
+            kode = b["kode_produk"]
+            qty += np.bincount(kode, weights=b["qty"], minlength=n)
+            subtotal += np.bincount(kode, weights=b["subtotal"], minlength=n)
+            modal += np.bincount(kode, weights=b["harga_modal"] * b["qty"], minlength=n)
+        hasil = pd.DataFrame({"qty": qty.astype(np.int64), "subtotal": subtotal, "modal": modal})
+        hasil["margin"] = hasil["subtotal"] - hasil["modal"]
+        hasil.insert(0, "kategori", [p[1] for p in self.produk])
+        hasil.insert(0, "nama", [p[0] for p in self.produk])
+        return hasil[hasil["qty"] > 0]
+
+    def top(self, mulai=None, akhir=None, n=10, by="qty"):
+        return self.per_product(mulai, akhir).nlargest(n, METRIK[by]).reset_index(drop=True)
+
+    def profit(self, mulai=None, akhir=None, per="hari"):
+        # Pendapatan, modal, laba kotor dan margin (%) per hari/produk/kategori/kasir
+        bagian = self.potong(mulai, akhir)
+        awal = 0
+        if per == "hari":
+            # Bagian urut waktu: hari pertama/terakhir ada di ujung irisan
+            awal = min((int(b["waktu"][0]) // HARI for b in bagian), default=0)
+            n = max((int(b["waktu"][-1]) // HARI for b in bagian), default=awal) - awal + 1
+        elif per == "produk":
+            n = len(self.produk)
+        elif per == "kategori":
+            n = len(self.kategori)
+            kategori_produk = np.asarray(self.kategori_produk, dtype=np.int32)
+        elif per == "kasir":
+            n = len(self.kasir)
+        else:
+            raise ValueError(f"Dimensi tidak dikenal: {per}")
+
+        jumlah, qty, pendapatan, modal = np.zeros(n, dtype=np.int64), np.zeros(n), np.zeros(n), np.zeros(n)
+        for b in bagian:
+            if per == "hari":
+                k = b["waktu"] // HARI - awal
+            elif per == "kategori":
+                k = kategori_produk[b["kode_produk"]]
+            else:
+                k = b["kode_produk" if per == "produk" else "kode_kasir"]
+            jumlah += np.bincount(k, minlength=n)
+            qty += np.bincount(k, weights=b["qty"], minlength=n)
+            pendapatan += np.bincount(k, weights=b["subtotal"], minlength=n)
+            modal += np.bincount(k, weights=b["harga_modal"] * b["qty"], minlength=n)
+        ada = np.flatnonzero(jumlah)
+        hasil = pd.DataFrame({
+            "qty": qty[ada].astype(np.int64),
+            "pendapatan": pendapatan[ada],
+            "modal": modal[ada],
+        })
+        hasil["laba_kotor"] = hasil["pendapatan"] - hasil["modal"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hasil["margin"] = np.where(hasil["pendapatan"] != 0, hasil["laba_kotor"] / hasil["pendapatan"] * 100, 0.0)
+
+        if per == "hari":
+            label = {"tanggal": (ada + awal).astype("datetime64[D]").astype(object)}
+        elif per == "produk":
+            label = {"nama": [self.produk[k][0] for k in ada], "kategori": [self.produk[k][1] for k in ada]}
+        elif per == "kategori":
+            label = {"kategori": [self.kategori[k] for k in ada]}
+        else:
+            label = {"kasir": [self.kasir[k] for k in ada]}
+        for i, (kolom, nilai) in enumerate(label.items()):
+            hasil.insert(i, kolom, nilai)
+        return hasil
+
+
+# Snapshot di disk: satu file .npy per kolom per generasi + snapshot.json
+# berisi kamus kode dan posisi terakhir. File generasi lama dihapus setelah
+# snapshot baru aktif; proses yang masih memetakannya tetap bisa membaca.
+def _meta(path):
+    return os.path.join(path + ".kolom", "snapshot.json")
+
+
+def read_snapshot(path):
+    meta_path = _meta(path)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with storage.file_lock(meta_path):
+            meta = codec.load_file(meta_path)
+            dasar = {nama: np.load(os.path.join(os.path.dirname(meta_path), f"{nama}.{meta['generasi']}.npy"),
+                                   mmap_mode="r")
+                     for nama in KOLOM}
+            mtime = os.stat(meta_path).st_mtime_ns
+    except (OSError, ValueError, KeyError):
+        return None
+    items = LineItems()
+    items.produk = [tuple(p) for p in meta["produk"]]
+    items._kode = {p: k for k, p in enumerate(items.produk)}
+    items.kategori = meta["kategori"]
+    items._kode_kategori = {nama: k for k, nama in enumerate(items.kategori)}
+    items.kategori_produk = meta["kategori_produk"]
+    items.kasir = meta["kasir"]
+    items._kode_kasir = {nama: k for k, nama in enumerate(items.kasir)}
+    items.dasar = dasar
+    items.terakhir_id = meta["terakhir_id"]
+    items.jumlah_transaksi = meta["jumlah_transaksi"]
+    items.waktu_terakhir = meta["waktu_terakhir"]
+    items.snapshot = (meta_path, mtime)
+    return items
+
+
+def write_snapshot(items, path):
+    # Gabungkan dasar + ekor ke generasi baru lalu buka lagi dengan mmap
+    meta_path = _meta(path)
+    folder = os.path.dirname(meta_path)
+    os.makedirs(folder, exist_ok=True)
+    generasi = f"{items.terakhir_id}-{os.getpid()}-{threading.get_ident()}"
+    # Dua proses yang menulis bersamaan diurutkan oleh kunci; keduanya
+    # snapshot yang sah dan pembaca menambah sisanya dari database
+    with storage.file_lock(meta_path):
+        gabungan = _gabung(items.dasar, items.ekor)
+        for nama, kolom in gabungan.items():
+            sementara = os.path.join(folder, f".tmp-{nama}.{generasi}.npy")
+            np.save(sementara, kolom)
+            os.replace(sementara, os.path.join(folder, f"{nama}.{generasi}.npy"))
+        storage.write_json_atomic(meta_path, {
+            "generasi": generasi,
+            "terakhir_id": items.terakhir_id,
+            "jumlah_transaksi": items.jumlah_transaksi,
+            "waktu_terakhir": items.waktu_terakhir,
+            "produk": items.produk,
+            "kategori": items.kategori,
+            "kategori_produk": items.kategori_produk,
+            "kasir": items.kasir,
+        })
+        for nama_file in os.listdir(folder):
+            if nama_file.endswith(".npy") and f".{generasi}." not in nama_file:
+                try:
+                    os.unlink(os.path.join(folder, nama_file))
+                except OSError:
+                    pass
+    return read_snapshot(path)
+
+
+_state = {}
+_lock = threading.Lock()
+
+
+def _segar(items, conn):
+    cur = conn.execute("SELECT id, waktu, kasir, items FROM transaksi WHERE id > ? ORDER BY id", (items.terakhir_id,))
+    while True:
+        rows = cur.fetchmany(storage.SEGMEN)
+        if not rows:
+            break
+        items.append(rows)
+
+
+def _cocok(items, conn):
+    # Masih database yang sama dan tidak ada transaksi lama yang dihapus/diganti?
+    if not items.terakhir_id:
+        return True
+    row = conn.execute("SELECT COUNT(*), (SELECT waktu FROM transaksi WHERE id = ?) FROM transaksi WHERE id <= ?",
+                       (items.terakhir_id, items.terakhir_id)).fetchone()
+    return row[0] == items.jumlah_transaksi and row[1] == items.waktu_terakhir
+
+
+def _snapshot_berubah(items, path):
+    # Snapshot ditulis ulang (mungkin oleh proses lain) sejak dibuka?
+    try:
+        mtime = os.stat(_meta(path)).st_mtime_ns
+    except OSError:
+        return False
+    return items.snapshot is None or items.snapshot[1] != mtime
+
+
+def get_line_items(path=None):
+    path = path or storage.DB_FILE
+    conn = storage.connect(path)
+    nomor = storage.version("transaksi", conn)
+    entri = _state.get(path)
+    if entri is not None and entri[0] == nomor:
+        return entri[1]
+    with _lock:
+        entri = _state.get(path)
+        if entri is not None and entri[0] == nomor:
+            return entri[1]
+        lama = entri[1] if entri is not None else None
+        if lama is None or _snapshot_berubah(lama, path):
+            lama = read_snapshot(path) or lama
+        # Tambahkan transaksi baru saja; jika ada yang dihapus/diganti, bangun ulang
+        items = lama.copy() if lama is not None and _cocok(lama, conn) else LineItems()
+        _segar(items, conn)
+        if len(items.ekor["qty"]) > BATAS_EKOR or (items.snapshot is None and len(items)):
+            try:
+                baru = write_snapshot(items, path)
+            except OSError:
+                baru = None  # folder tidak bisa ditulis: tetap di memori
+            if baru is not None and _cocok(baru, conn):
+                items = baru
+                _segar(items, conn)
+        _state[path] = (nomor, items)
+        return items
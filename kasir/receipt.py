@@ -0,0 +1,245 @@
+# Struk transaksi: PDF dan ESC/POS (printer thermal)
+#
+# Isi struk disusun sekali sebagai baris teks lebar tetap (sesuai jumlah
+# kolom kertas thermal), lalu dipakai bersama oleh PDF dan ESC/POS. Tata
+# letak per lebar kertas dan matriks QR per payload di-cache, jadi membuat
+# struk saat checkout hanya menulis teks. Cetak ulang banyak struk
+# dijalankan di pool proses.
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from kasir import storage
+
+NAMA_TOKO = os.environ.get("KASIR_TOKO", "Kasir App")
+QRIS_STATIS = os.environ.get("KASIR_QRIS", "")  # payload QRIS statis toko (opsional)
+KERTAS = int(os.environ.get("KASIR_KERTAS", "58"))  # lebar kertas thermal (mm): 58 atau 80
+SEGMEN_CETAK = 200  # struk per tugas di pool saat cetak ulang
+
+# Lebar kertas (mm) -> (kolom karakter, lebar area cetak mm)
+UKURAN_KERTAS = {58: (32, 48), 80: (48, 72)}
+
+FORMAT = {
+    "PDF": ("zip", "application/zip"),
+    "ESC/POS": ("bin", "application/octet-stream"),
+}
+
+
+class _TataLetak:
+    # Ukuran halaman & font PDF untuk satu lebar kertas
+    def __init__(self, kertas):
+        self.kolom, self.lebar = UKURAN_KERTAS[kertas]
+        self.kertas = kertas
+        self.margin = (kertas - self.lebar) / 2
+        # Courier: lebar karakter 0.6 em, jadi ukuran font mengikuti jumlah kolom
+        self.font = self.lebar / self.kolom / 0.6 * 72 / 25.4
+        self.tinggi_baris = self.font * 25.4 / 72 * 1.25
+        self.garis = "-" * self.kolom
+
+
+@lru_cache(maxsize=None)
+def _tata_letak(kertas):
+    return _TataLetak(kertas)
+
+
+def _crc16(data):
+    # CRC-16/CCITT-FALSE sesuai spesifikasi QRIS (EMVCo)
+    crc = 0xFFFF
+    for b in data.encode():
+        crc ^= b << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+            crc &= 0xFFFF
+    return f"{crc:04X}"
+
+
+def qris_dinamis(statis, nominal):
+    # Ubah QRIS statis menjadi dinamis dengan nominal tetap (tag 54)
+    tag, i = {}, 0
+    while i < len(statis):
+        kunci, panjang = statis[i:i + 2], int(statis[i + 2:i + 4])
+        tag[kunci] = statis[i + 4:i + 4 + panjang]
+        i += 4 + panjang
+    tag.pop("63", None)
+    tag["01"] = "12"
+    tag["54"] = f"{nominal:.0f}"
+    isi = "".join(f"{k}{len(v):02d}{v}" for k, v in sorted(tag.items())) + "6304"
+    return isi + _crc16(isi)
+
+
+def qr_payload(transaksi):
+    if transaksi.get("metode") == "QRIS/Transfer" and QRIS_STATIS:
+        return qris_dinamis(QRIS_STATIS, transaksi["total"])
+    return None
+
+
+@lru_cache(maxsize=256)
+def _matriks_qr(payload):
+    # Kotak hitam QR sebagai (baris, kolom_awal, panjang): deretan modul
+    # bersebelahan digabung agar PDF cukup menggambar sedikit persegi
+    import qrcode
+
+    # Mask tetap: memilih mask terbaik (8 percobaan) memakan ~4x waktu
+    # pembuatan QR, sedangkan pemindai tetap membaca mask apa pun
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=0, mask_pattern=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matriks = qr.get_matrix()
+    kotak = []
+    for y, baris in enumerate(matriks):
+        x = 0
+        while x < len(baris):
+            if baris[x]:
+                awal = x
+                while x < len(baris) and baris[x]:
+                    x += 1
+                kotak.append((y, awal, x - awal))
+            else:
+                x += 1
+    return len(matriks), tuple(kotak)
+
+
+def _rupiah(nilai):
+    return f"Rp {nilai:,.0f}"
+
+
+def _kiri_kanan(kiri, kanan, kolom):
+    kiri = kiri[:max(0, kolom - len(kanan) - 1)]
+    return kiri + " " * (kolom - len(kiri) - len(kanan)) + kanan
+
+
+def susun(transaksi, kertas=KERTAS):
+    # Baris struk: list (teks, tebal, tengah)
+    t = _tata_letak(kertas)
+    baris = [(NAMA_TOKO[:t.kolom], True, True), (t.garis, False, False)]
+    if transaksi.get("id"):
+        baris.append((_kiri_kanan("No", f"#{transaksi['id']}", t.kolom), False, False))
+    baris += [
+        (_kiri_kanan("Waktu", transaksi["waktu"], t.kolom), False, False),
+        (_kiri_kanan("Kasir", transaksi["kasir"], t.kolom), False, False),
+        (t.garis, False, False),
+    ]
+    for item in transaksi["items"]:
+        baris.append((item["nama"][:t.kolom], False, False))
+        baris.append((_kiri_kanan(f"  {item['qty']} x {item['harga']:,.0f}", f"{item['subtotal']:,.0f}", t.kolom),
+                      False, False))
+    baris += [
+        (t.garis, False, False),
+        (_kiri_kanan("TOTAL", _rupiah(transaksi["total"]), t.kolom), True, False),
+        (_kiri_kanan(transaksi["metode"], _rupiah(transaksi["bayar"]), t.kolom), False, False),
+        (_kiri_kanan("Kembalian", _rupiah(transaksi["kembalian"]), t.kolom), False, False),
+        (t.garis, False, False),
+        ("Terima kasih", False, True),
+    ]
+    return baris
+
+
+def render_pdf(transaksi, kertas=KERTAS, qr=None):
+    from fpdf import FPDF
+
+    t = _tata_letak(kertas)
+    baris = susun(transaksi, kertas)
+    tinggi = t.margin * 2 + len(baris) * t.tinggi_baris + (t.lebar * 0.6 + t.tinggi_baris if qr else 0)
+    pdf = FPDF("P", "mm", (kertas, tinggi))
+    pdf.set_margins(t.margin, t.margin, t.margin)
+    pdf.set_auto_page_break(False)
+    pdf.add_page()
+    for teks, tebal, tengah in baris:
+        pdf.set_font("Courier", "B" if tebal else "", t.font)
+        pdf.cell(t.lebar, t.tinggi_baris, teks.encode("latin-1", "replace").decode("latin-1"),
+                 align="C" if tengah else "L", ln=1)
+    if qr:
+        modul, kotak = _matriks_qr(qr)
+        sisi = t.lebar * 0.6 / modul
+        x0 = (kertas - t.lebar * 0.6) / 2
+        y0 = pdf.get_y() + t.tinggi_baris / 2
+        pdf.set_fill_color(0, 0, 0)
+        for y, x, panjang in kotak:
+            pdf.rect(x0 + x * sisi, y0 + y * sisi, panjang * sisi, sisi, "F")
+    data = pdf.output(dest="S")
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
+
+
+# Perintah ESC/POS
+_ESC_INIT = b"\x1b@"
+_ESC_TENGAH = (b"\x1ba\x00", b"\x1ba\x01")
+_ESC_TEBAL = (b"\x1bE\x00", b"\x1bE\x01")
+_ESC_POTONG = b"\x1dVB\x00"
+
+
+@lru_cache(maxsize=256)
+def _qr_escpos(payload):
+    # QR dicetak oleh printer sendiri (GS ( k), tanpa mengirim gambar
+    data = payload.encode()
+    n = len(data) + 3
+
+    def perintah(fungsi, isi):
+        return b"\x1d(k" + bytes([(len(isi) + 2) % 256, (len(isi) + 2) // 256, 49, fungsi]) + isi
+
+    return (perintah(65, b"\x32\x00") + perintah(67, b"\x06") + perintah(69, b"\x31")
+            + b"\x1d(k" + bytes([n % 256, n // 256, 49, 80, 48]) + data + perintah(81, b"\x30"))
+
+
+def render_escpos(transaksi, kertas=KERTAS, qr=None):
+    hasil = [_ESC_INIT]
+    for teks, tebal, tengah in susun(transaksi, kertas):
+        hasil += [_ESC_TENGAH[tengah], _ESC_TEBAL[tebal], teks.encode("cp437", "replace"), b"\n"]
+    if qr:
+        hasil += [_ESC_TENGAH[1], _qr_escpos(qr), b"\n"]
+    hasil += [_ESC_TEBAL[0], _ESC_TENGAH[0], b"\n\n\n", _ESC_POTONG]
+    return b"".join(hasil)
+
+
+def _cetak_segmen(format, transaksi, kertas):
+    # Dijalankan di proses pekerja
+    if format == "PDF":
+        return [(f"struk_{t['id']}.pdf", render_pdf(t, kertas, qr_payload(t))) for t in transaksi]
+    return [(None, render_escpos(t, kertas, qr_payload(t))) for t in transaksi]
+
+
+def reprint_name(format, mulai=None, akhir=None):
+    # (nama_file, mime) tanpa mencetak struk
+    ekstensi, mime = FORMAT[format]
+    return f"struk_{mulai or 'awal'}_{akhir or 'akhir'}.{ekstensi}", mime
+
+
+def reprint(format, mulai=None, akhir=None, kertas=KERTAS, pekerja=None):
+    # Cetak ulang semua struk dalam rentang tanggal; kembalikan (file, nama_file, mime)
+    # seperti kasir.export. PDF dikemas dalam ZIP, ESC/POS disambung jadi satu stream.
+    ekstensi, _ = FORMAT[format]
+    segmen = storage.iter_table("transaksi", ["id", *storage.KOLOM["transaksi"]], SEGMEN_CETAK,
+                                mulai=mulai, akhir=akhir)
+    f = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    arsip = zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) if ekstensi == "zip" else None
+
+    def tulis(hasil):
+        for nama, data in hasil:
+            if arsip is not None:
+                arsip.writestr(nama, data)
+            else:
+                f.write(data)
+
+    pertama = next(segmen, [])
+    if len(pertama) < SEGMEN_CETAK:
+        # Cukup satu segmen: tidak perlu menyalakan pool proses
+        tulis(_cetak_segmen(format, pertama, kertas))
+    else:
+        # spawn: koneksi SQLite induk tidak ikut terbawa ke proses pekerja
+        pekerja = pekerja or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=pekerja, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Antrean dibatasi agar segmen tidak menumpuk di memori; urutan struk tetap
+            antrean = deque([pool.submit(_cetak_segmen, format, pertama, kertas)])
+            for rows in segmen:
+                antrean.append(pool.submit(_cetak_segmen, format, rows, kertas))
+                if len(antrean) > pekerja * 2:
+                    tulis(antrean.popleft().result())
+            while antrean:
+                tulis(antrean.popleft().result())
+    if arsip is not None:
+        arsip.close()
+    f.seek(0)
+    return (f, *reprint_name(format, mulai, akhir))
@@ -0,0 +1,108 @@
+# Laporan penjualan dari tabel rekap
+#
+# Tabel rekap diperbarui bersama setiap transaksi (lihat kasir.storage),
+# sehingga laporan tidak perlu memindai seluruh riwayat transaksi.
+# Tanggal boleh berupa datetime.date atau string "YYYY-MM-DD".
+from kasir import storage
+
+
+def _rows(sql, args=(), conn=None):
+    args = [a if isinstance(a, (int, float)) else str(a) for a in args]
+    return [dict(r) for r in (conn or storage.connect()).execute(sql, args)]
+
+
+def _rentang(kolom, mulai, akhir):
+    syarat, args = [], []
+    if mulai is not None:
+        syarat.append(f"{kolom} >= ?")
+        args.append(mulai)
+    if akhir is not None:
+        syarat.append(f"{kolom} <= ?")
+        args.append(akhir)
+    return (" WHERE " + " AND ".join(syarat) if syarat else ""), args
+
+
+def date_range(conn=None):
+    row = (conn or storage.connect()).execute("SELECT MIN(tanggal), MAX(tanggal) FROM rekap_harian").fetchone()
+    return row[0], row[1]
+
+
+def totals(conn=None):
+    row = (conn or storage.connect()).execute(
+        "SELECT COALESCE(SUM(jumlah_transaksi), 0), COALESCE(SUM(pendapatan), 0) FROM rekap_bulanan").fetchone()
+    return {"jumlah_transaksi": row[0], "pendapatan": row[1]}
+
+
+def daily(mulai=None, akhir=None, conn=None):
+    where, args = _rentang("tanggal", mulai, akhir)
+    return _rows(f"SELECT tanggal, jumlah_transaksi, pendapatan, modal FROM rekap_harian{where} ORDER BY tanggal",
+                 args, conn)
+
+
+def summary(mulai=None, akhir=None, conn=None):
+    # Total pendapatan, rata-rata per hari (yang ada transaksinya) dan jumlah transaksi
+    where, args = _rentang("tanggal", mulai, akhir)
+    row = _rows("SELECT COALESCE(SUM(pendapatan), 0) AS pendapatan, COALESCE(AVG(pendapatan), 0) AS rata_per_hari, "
+                f"COALESCE(SUM(jumlah_transaksi), 0) AS jumlah_transaksi FROM rekap_harian{where}", args, conn)
+    return row[0]
+
+
+def per_kasir(mulai=None, akhir=None, conn=None):
+    where, args = _rentang("tanggal", mulai, akhir)
+    return _rows("SELECT kasir, SUM(pendapatan) AS pendapatan, SUM(jumlah_transaksi) AS jumlah_transaksi, "
+                 f"SUM(modal) AS modal FROM rekap_kasir{where} GROUP BY kasir ORDER BY kasir", args, conn)
+
+
+def monthly_kasir(kasir, conn=None):
+    return _rows("SELECT substr(tanggal, 1, 7) AS bulan, SUM(pendapatan) AS pendapatan, "
+                 "SUM(jumlah_transaksi) AS jumlah_transaksi FROM rekap_kasir WHERE kasir = ? "
+                 "GROUP BY bulan ORDER BY bulan", (kasir,), conn)
+
+
+def best_sellers(mulai=None, akhir=None, n=10, urut="jumlah_transaksi", conn=None):
+    where, args = _rentang("tanggal", mulai, akhir)
+    return _rows("SELECT nama, kategori, SUM(jumlah_transaksi) AS jumlah_transaksi, SUM(qty) AS qty, "
+                 f"SUM(pendapatan) AS pendapatan, SUM(modal) AS modal FROM rekap_barang{where} "
+                 f"GROUP BY nama, kategori ORDER BY {urut} DESC LIMIT ?", (*args, n), conn)
+
+
+class ReportService:
+    # Semua laporan untuk satu database, tanpa ketergantungan ke Streamlit.
+    # Koneksi diambil per panggilan karena koneksi SQLite bersifat per thread.
+    def __init__(self, path=None):
+        self.path = path
+
+    def _conn(self):
+        return storage.connect(self.path)
+
+    def date_range(self):
+        return date_range(self._conn())
+
+    def totals(self):
+        return totals(self._conn())
+
+    def daily(self, mulai=None, akhir=None):
+        return daily(mulai, akhir, self._conn())
+
+    def summary(self, mulai=None, akhir=None):
+        return summary(mulai, akhir, self._conn())
+
+    def per_kasir(self, mulai=None, akhir=None):
+        return per_kasir(mulai, akhir, self._conn())
+
+    def monthly_kasir(self, kasir):
+        return monthly_kasir(kasir, self._conn())
+
+    def best_sellers(self, mulai=None, akhir=None, n=10, urut="jumlah_transaksi"):
+        return best_sellers(mulai, akhir, n, urut, self._conn())
+
+    # Laporan per item memakai kolom numpy (kasir.line_items), diimpor saat dipakai
+    def profit(self, mulai=None, akhir=None, per="hari"):
+        from kasir.line_items import get_line_items
+
+        return get_line_items(self.path).profit(mulai, akhir, per=per)
+
+    def top(self, mulai=None, akhir=None, n=10, by="qty"):
+        from kasir.line_items import get_line_items
+
+        return get_line_items(self.path).top(mulai, akhir, n=n, by=by)
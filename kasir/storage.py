@@ -0,0 +1,900 @@
+# Penyimpanan data kasir di SQLite (mode WAL)
+#
+# Semua data (akun, barang, transaksi, barang_dihapus) disimpan dalam satu
+# file database. load_data/save_data tetap tersedia sebagai lapisan
+# kompatibilitas untuk kode lama yang bekerja dengan list of dict.
+import functools
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from kasir import codec, instrument
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+DB_FILE = os.environ.get("KASIR_DB", "kasir.db")
+SEGMEN = 5000          # jumlah baris per segmen saat membaca riwayat
+SEGMEN_KONVERSI = 1000  # baris per transaksi database saat convert_items
+INTERVAL_KOMPAKSI = 300  # detik antar checkpoint WAL di latar belakang
+PERCOBAAN = 6          # percobaan ulang saat database sedang dikunci proses lain
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT
+);
+CREATE TABLE IF NOT EXISTS akun (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL,
+    nama_lengkap TEXT DEFAULT '',
+    no_telepon TEXT DEFAULT '',
+    foto_profil TEXT
+);
+CREATE TABLE IF NOT EXISTS barang (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sku TEXT UNIQUE,
+    nama TEXT NOT NULL,
+    kategori TEXT NOT NULL,
+    stok INTEGER NOT NULL DEFAULT 0,
+    harga NUMERIC NOT NULL DEFAULT 0,
+    harga_modal NUMERIC NOT NULL DEFAULT 0,
+    UNIQUE (nama, kategori)
+);
+CREATE TABLE IF NOT EXISTS transaksi (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    waktu TEXT NOT NULL,
+    kasir TEXT NOT NULL,
+    items TEXT NOT NULL,
+    total NUMERIC NOT NULL,
+    bayar NUMERIC NOT NULL,
+    kembalian NUMERIC NOT NULL,
+    metode TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transaksi_waktu ON transaksi (waktu);
+CREATE TABLE IF NOT EXISTS barang_dihapus (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    barang_id INTEGER,
+    nama TEXT,
+    kategori TEXT,
+    stok INTEGER,
+    harga NUMERIC,
+    harga_modal NUMERIC,
+    jumlah_dihapus INTEGER NOT NULL,
+    keterangan TEXT,
+    tanggal_dihapus TEXT NOT NULL,
+    dihapus_oleh TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dihapus_tanggal ON barang_dihapus (tanggal_dihapus);
+"""
+
+# Rekap penjualan yang diperbarui bersama setiap transaksi
+SKEMA_REKAP = """
+CREATE TABLE IF NOT EXISTS rekap_harian (
+    tanggal TEXT PRIMARY KEY,
+    jumlah_transaksi INTEGER NOT NULL,
+    pendapatan NUMERIC NOT NULL,
+    modal NUMERIC NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rekap_bulanan (
+    bulan TEXT PRIMARY KEY,
+    jumlah_transaksi INTEGER NOT NULL,
+    pendapatan NUMERIC NOT NULL,
+    modal NUMERIC NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rekap_kasir (
+    tanggal TEXT NOT NULL,
+    kasir TEXT NOT NULL,
+    jumlah_transaksi INTEGER NOT NULL,
+    pendapatan NUMERIC NOT NULL,
+    modal NUMERIC NOT NULL,
+    PRIMARY KEY (tanggal, kasir)
+);
+CREATE INDEX IF NOT EXISTS idx_rekap_kasir_kasir ON rekap_kasir (kasir);
+CREATE TABLE IF NOT EXISTS rekap_barang (
+    tanggal TEXT NOT NULL,
+    nama TEXT NOT NULL,
+    kategori TEXT NOT NULL,
+    jumlah_transaksi INTEGER NOT NULL,
+    qty INTEGER NOT NULL,
+    pendapatan NUMERIC NOT NULL,
+    modal NUMERIC NOT NULL,
+    PRIMARY KEY (tanggal, nama, kategori)
+);
+"""
+
+# Nama file JSON lama -> tabel
+TABEL = {
+    "akun.json": "akun",
+    "barang.json": "barang",
+    "transaksi.json": "transaksi",
+    "barang_dihapus.json": "barang_dihapus",
+}
+
+# Buku mutasi stok: setiap perubahan stok dicatat bersama saldo sesudahnya,
+# dalam transaksi database yang sama dengan perubahannya.
+# jenis: awal (saldo pembuka / barang baru), masuk, jual, hapus, koreksi
+SKEMA_STOK = """
+CREATE TABLE IF NOT EXISTS mutasi_stok (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    waktu TEXT NOT NULL,
+    barang_id INTEGER NOT NULL,
+    jenis TEXT NOT NULL,
+    qty INTEGER NOT NULL,
+    saldo INTEGER NOT NULL,
+    ref INTEGER,
+    oleh TEXT,
+    keterangan TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mutasi_barang ON mutasi_stok (barang_id, id);
+CREATE INDEX IF NOT EXISTS idx_mutasi_waktu ON mutasi_stok (waktu);
+CREATE INDEX IF NOT EXISTS idx_barang_stok ON barang (stok);
+"""
+
+# Nomor versi per tabel, dinaikkan oleh trigger pada setiap perubahan
+# (termasuk dari proses lain) dan dipakai untuk invalidasi cache.
+SKEMA_VERSI = "CREATE TABLE IF NOT EXISTS versi (tabel TEXT PRIMARY KEY, nomor INTEGER NOT NULL DEFAULT 0);\n" + "".join(
+    f"INSERT OR IGNORE INTO versi (tabel, nomor) VALUES ('{tabel}', 0);\n"
+    + "".join(
+        f"CREATE TRIGGER IF NOT EXISTS versi_{tabel}_{aksi.lower()} AFTER {aksi} ON {tabel} "
+        f"BEGIN UPDATE versi SET nomor = nomor + 1 WHERE tabel = '{tabel}'; END;\n"
+        for aksi in ("INSERT", "UPDATE", "DELETE"))
+    for tabel in TABEL.values())
+
+# Kolom yang dibaca/ditulis per tabel (tanpa id internal kecuali barang)
+KOLOM = {
+    "akun": ["username", "password", "role", "nama_lengkap", "no_telepon", "foto_profil"],
+    "barang": ["id", "sku", "nama", "kategori", "stok", "harga", "harga_modal"],
+    "transaksi": ["waktu", "kasir", "items", "total", "bayar", "kembalian", "metode"],
+    "barang_dihapus": ["barang_id", "nama", "kategori", "stok", "harga", "harga_modal",
+                       "jumlah_dihapus", "keterangan", "tanggal_dihapus", "dihapus_oleh"],
+}
+
+class _Koneksi(sqlite3.Connection):
+    path = None
+
+
+KOLOM_WAKTU = {"transaksi": "waktu", "barang_dihapus": "tanggal_dihapus"}
+
+_lokal = threading.local()
+_migrasi_lock = threading.Lock()
+_sudah_migrasi = set()
+
+
+class StokTidakCukup(Exception):
+    pass
+
+
+class BarangSudahAda(Exception):
+    pass
+
+
+def _retry(fungsi):
+    # Ulangi transaksi yang gagal karena database terkunci (SQLITE_BUSY)
+    @functools.wraps(fungsi)
+    def bungkus(*args, **kwargs):
+        for percobaan in range(PERCOBAAN):
+            try:
+                return fungsi(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e) or percobaan == PERCOBAAN - 1:
+                    raise
+                time.sleep(0.01 * 2 ** percobaan * (1 + random.random()))
+    return bungkus
+
+
+@contextmanager
+def file_lock(path):
+    # Kunci lintas proses untuk file JSON di luar database
+    with open(path + ".lock", "a+") as f:
+        if os.name == "nt":
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_json_atomic(path, data, nama_codec=None):
+    # Tulis ke file sementara lalu rename, agar file tidak pernah terpotong.
+    # Format mengikuti codec aktif (lihat kasir.codec), load_data mengenalinya.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            codec.dump_file(f, data, nama_codec)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def connect(path=None):
+    # Satu koneksi per thread. Streamlit menjalankan setiap rerun di thread
+    # baru, jadi koneksi baru dibuat hampir setiap rerun (dan dilepas bersama
+    # thread-nya): pembuatannya harus murah. Skema, upgrade dan migrasi hanya
+    # dijalankan sekali per path di proses ini.
+    path = path or DB_FILE
+    koneksi = getattr(_lokal, "koneksi", None)
+    if koneksi is None:
+        koneksi = _lokal.koneksi = {}
+    conn = koneksi.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False,
+                               factory=_Koneksi)
+        conn.path = path
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Setiap commit di-fsync ke jurnal WAL; biayanya tetap per transaksi
+        conn.execute("PRAGMA synchronous=FULL")
+        koneksi[path] = conn
+        with _migrasi_lock:
+            if path not in _sudah_migrasi:
+                # DDL dan INSERT OR IGNORE ke versi butuh kunci tulis: jangan
+                # diulang di setiap koneksi agar rerun tidak menunggu penulis
+                conn.executescript(SKEMA)
+                _upgrade(conn)
+                conn.executescript(SKEMA_VERSI)
+                conn.executescript(SKEMA_REKAP)
+                conn.executescript(SKEMA_STOK)
+                migrate_json(os.path.dirname(os.path.abspath(path)), conn)
+                if not conn.execute("SELECT 1 FROM meta WHERE kunci = 'rekap'").fetchone():
+                    rebuild_rollups(conn)
+                if not conn.execute("SELECT 1 FROM meta WHERE kunci = 'mutasi_stok'").fetchone():
+                    _buka_mutasi(conn)
+                _sudah_migrasi.add(path)
+    return conn
+
+
+def _upgrade(conn):
+    # Tambah kolom baru ke database yang dibuat versi lama
+    kolom = {row["name"] for row in conn.execute("PRAGMA table_info(barang)")}
+    if "sku" not in kolom:
+        conn.execute("ALTER TABLE barang ADD COLUMN sku TEXT")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_barang_sku ON barang (sku)")
+
+
+@contextmanager
+def transaction(conn=None):
+    conn = conn or connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def _ke_baris(tabel, data):
+    baris = {k: data.get(k) for k in KOLOM[tabel]}
+    if tabel == "transaksi":
+        baris["items"] = codec.encode(data.get("items", []))
+    elif tabel == "akun":
+        baris["nama_lengkap"] = baris["nama_lengkap"] or ""
+        baris["no_telepon"] = baris["no_telepon"] or ""
+    elif tabel == "barang":
+        baris["sku"] = baris["sku"] or None
+    elif tabel == "barang_dihapus" and baris["barang_id"] is None:
+        baris["barang_id"] = data.get("id")
+    return baris
+
+
+def _ke_dict(tabel, row):
+    data = dict(row)
+    if tabel == "transaksi" and "items" in data:
+        data["items"] = codec.decode(data["items"])
+    return data
+
+
+def _insert(conn, tabel, rows):
+    kolom = KOLOM[tabel]
+    sql = f"INSERT INTO {tabel} ({', '.join(kolom)}) VALUES ({', '.join('?' * len(kolom))})"
+    conn.executemany(sql, ([r[k] for k in kolom] for r in rows))
+
+
+def load_table(tabel, conn=None):
+    conn = conn or connect()
+    kolom = ", ".join(KOLOM[tabel])
+    cur = conn.execute(f"SELECT {kolom} FROM {tabel} ORDER BY rowid")
+    return [_ke_dict(tabel, r) for r in cur]
+
+
+# Pemberitahuan perubahan ke indeks di memori (katalog, dsb.) di proses ini
+_pendengar = []
+
+
+def subscribe(fungsi):
+    # fungsi(path, tabel, versi_sebelum, versi_sesudah, perubahan) dipanggil
+    # setelah commit; perubahan = {"ubah": [baris], "hapus": [id]}
+    _pendengar.append(fungsi)
+
+
+def _beritahu(conn, tabel, sebelum, sesudah, perubahan):
+    for fungsi in list(_pendengar):
+        fungsi(conn.path, tabel, sebelum, sesudah, perubahan)
+
+
+def _baris_barang(conn, barang_id):
+    row = conn.execute(f"SELECT {', '.join(KOLOM['barang'])} FROM barang WHERE id = ?", (barang_id,)).fetchone()
+    return dict(row) if row else None
+
+
+# Cache bersama antar sesi dan halaman
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def version(tabel, conn=None):
+    conn = conn or connect()
+    return conn.execute("SELECT nomor FROM versi WHERE tabel = ?", (tabel,)).fetchone()[0]
+
+
+def cached(nama, tabel, bangun, path=None):
+    # Simpan hasil bangun() selama versi tabel belum berubah. Versi dibaca
+    # sebelum membangun, jadi tulisan yang menyusul hanya memicu bangun ulang.
+    path = path or DB_FILE
+    tabel = (tabel,) if isinstance(tabel, str) else tuple(tabel)
+    conn = connect(path)
+    nomor = tuple(version(t, conn) for t in tabel)
+    kunci = (path, nama)
+    entri = _cache.get(kunci)
+    if entri is not None and entri[0] == nomor:
+        return entri[1]
+    with _cache_lock:
+        entri = _cache.get(kunci)
+        if entri is not None and entri[0] == nomor:
+            return entri[1]
+        hasil = bangun()
+        _cache[kunci] = (nomor, hasil)
+        return hasil
+
+
+def cached_table(tabel, path=None):
+    # List bersama; jangan diubah oleh pemanggil (pakai load_data untuk salinan)
+    return cached(("tabel", tabel), tabel, lambda: load_table(tabel, connect(path)), path)
+
+
+def iter_table(tabel, kolom=None, ukuran=SEGMEN, conn=None, mulai=None, akhir=None):
+    # Baca tabel per segmen agar riwayat besar tidak dimuat sekaligus.
+    # mulai/akhir (tanggal, inklusif) memakai indeks kolom waktu.
+    conn = conn or connect()
+    kolom = ", ".join(kolom or KOLOM[tabel])
+    if mulai is None and akhir is None:
+        cur = conn.execute(f"SELECT {kolom} FROM {tabel} ORDER BY rowid")
+    else:
+        kolom_waktu = KOLOM_WAKTU[tabel]
+        cur = conn.execute(f"SELECT {kolom} FROM {tabel} WHERE {kolom_waktu} >= ? AND {kolom_waktu} < ? "
+                           "ORDER BY rowid", _batas(mulai, akhir))
+    while True:
+        rows = cur.fetchmany(ukuran)
+        if not rows:
+            break
+        yield [_ke_dict(tabel, r) for r in rows]
+
+
+def _batas(mulai, akhir):
+    return (str(mulai) if mulai is not None else "",
+            f"{akhir}\uffff" if akhir is not None else "\uffff")
+
+
+def time_bounds(tabel, conn=None):
+    # Waktu pertama & terakhir di tabel; MIN/MAX dijawab langsung oleh indeks
+    conn = conn or connect()
+    kolom = KOLOM_WAKTU[tabel]
+    return tuple(conn.execute(f"SELECT MIN({kolom}), MAX({kolom}) FROM {tabel}").fetchone())
+
+
+def count_range(tabel, mulai=None, akhir=None, conn=None):
+    conn = conn or connect()
+    bawah, atas = _batas(mulai, akhir)
+    if tabel == "transaksi":
+        # Jumlah per hari sudah ada di rekap, tidak perlu menghitung baris
+        return conn.execute("SELECT COALESCE(SUM(jumlah_transaksi), 0) FROM rekap_harian "
+                            "WHERE tanggal >= ? AND tanggal < ?", (bawah[:10], atas)).fetchone()[0]
+    kolom = KOLOM_WAKTU[tabel]
+    return conn.execute(f"SELECT COUNT(*) FROM {tabel} WHERE {kolom} >= ? AND {kolom} < ?",
+                        (bawah, atas)).fetchone()[0]
+
+
+def query_page(tabel, mulai=None, akhir=None, offset=0, limit=50, conn=None):
+    # Satu halaman baris dalam rentang tanggal, urut waktu. Pencarian
+    # rentang memakai indeks waktu (B-tree). Untuk transaksi, jumlah per
+    # hari di rekap_harian dipakai untuk langsung melompat ke hari tempat
+    # offset berada, jadi halaman jauh tidak perlu melewati semua baris.
+    conn = conn or connect()
+    bawah, atas = _batas(mulai, akhir)
+    kolom = KOLOM_WAKTU[tabel]
+    if tabel == "transaksi":
+        for tanggal, jumlah in conn.execute(
+                "SELECT tanggal, jumlah_transaksi FROM rekap_harian WHERE tanggal >= ? AND tanggal < ? "
+                "ORDER BY tanggal", (bawah[:10], atas)):
+            if offset < jumlah:
+                bawah = max(bawah, tanggal)
+                break
+            offset -= jumlah
+        else:
+            return []
+    cur = conn.execute(
+        f"SELECT {', '.join(KOLOM[tabel])} FROM {tabel} WHERE {kolom} >= ? AND {kolom} < ? "
+        f"ORDER BY {kolom}, id LIMIT ? OFFSET ?", (bawah, atas, limit, offset))
+    return [_ke_dict(tabel, r) for r in cur]
+
+
+@_retry
+def save_table(tabel, data, conn=None):
+    # Tulis ulang isi tabel mengikuti list; barang dan akun disinkronkan
+    # berdasarkan kuncinya agar id barang tetap stabil.
+    rows = [_ke_baris(tabel, d) for d in data]
+    with transaction(conn) as c:
+        if tabel == "barang":
+            stok_lama = dict(c.execute("SELECT id, stok FROM barang"))
+            ids = [r["id"] for r in rows if r["id"] is not None]
+            c.execute(f"DELETE FROM barang WHERE id NOT IN ({', '.join('?' * len(ids))})", ids)
+            for r in rows:
+                if r["id"] is None:
+                    cur = c.execute(
+                        "INSERT INTO barang (sku, nama, kategori, stok, harga, harga_modal) VALUES (?, ?, ?, ?, ?, ?)",
+                        (r["sku"], r["nama"], r["kategori"], r["stok"], r["harga"], r["harga_modal"] or 0))
+                    r["id"] = cur.lastrowid
+                else:
+                    c.execute(
+                        "UPDATE barang SET sku = ?, nama = ?, kategori = ?, stok = ?, harga = ?, harga_modal = ? "
+                        "WHERE id = ?",
+                        (r["sku"], r["nama"], r["kategori"], r["stok"], r["harga"], r["harga_modal"] or 0, r["id"]))
+            for d, r in zip(data, rows):
+                d["id"] = r["id"]
+            # Selisih stok dicatat sebagai koreksi (barang yang hilang: saldo 0)
+            sekarang = time.strftime("%Y-%m-%d %H:%M:%S")
+            tetap = set()
+            mutasi = []
+            for r in rows:
+                tetap.add(r["id"])
+                lama = stok_lama.get(r["id"])
+                if lama is None:
+                    mutasi.append((sekarang, r["id"], "awal", r["stok"], r["stok"], None, None, None))
+                elif lama != r["stok"]:
+                    mutasi.append((sekarang, r["id"], "koreksi", r["stok"] - lama, r["stok"], None, None, None))
+            mutasi += [(sekarang, i, "koreksi", -stok, 0, None, None, None)
+                       for i, stok in stok_lama.items() if i not in tetap and stok]
+            _catat_mutasi(c, mutasi)
+        elif tabel == "akun":
+            names = [r["username"] for r in rows]
+            c.execute(f"DELETE FROM akun WHERE username NOT IN ({', '.join('?' * len(names))})", names)
+            c.executemany(
+                "INSERT OR REPLACE INTO akun (username, password, role, nama_lengkap, no_telepon, foto_profil) "
+                "VALUES (:username, :password, :role, :nama_lengkap, :no_telepon, :foto_profil)", rows)
+        else:
+            c.execute(f"DELETE FROM {tabel}")
+            _insert(c, tabel, rows)
+            if tabel == "transaksi":
+                _bangun_rekap(c)
+
+
+def convert_items(nama_codec, conn=None):
+    # Tulis ulang kolom items transaksi dengan codec lain per segmen id.
+    # Tiap segmen di-commit sendiri lalu berhenti selama segmen itu ditulis,
+    # agar checkout yang menunggu kunci tulis bisa masuk di sela-selanya.
+    # Baris lama tetap terbaca karena decode mengenali format, jadi konversi
+    # yang terputus aman diulang.
+    dumps = codec.get_codec(nama_codec).dumps
+    jumlah = terakhir = 0
+    while True:
+        terakhir, n, lama = _konversi_segmen(conn, dumps, terakhir)
+        if not n:
+            return jumlah
+        jumlah += n
+        time.sleep(lama)
+
+
+@_retry
+def _konversi_segmen(conn, dumps, terakhir):
+    # Kembalikan (id terakhir yang ditulis, jumlah baris, lama kunci dipegang)
+    with transaction(conn) as c:
+        mulai = time.perf_counter()
+        rows = c.execute("SELECT id, items FROM transaksi WHERE id > ? ORDER BY id LIMIT ?",
+                         (terakhir, SEGMEN_KONVERSI)).fetchall()
+        c.executemany("UPDATE transaksi SET items = ? WHERE id = ?",
+                      ((dumps(codec.decode(r["items"])), r["id"]) for r in rows))
+    return (rows[-1]["id"] if rows else terakhir), len(rows), time.perf_counter() - mulai
+
+
+def _tabel_untuk(file):
+    return TABEL.get(os.path.basename(file))
+
+
+@instrument.timed("load_data")
+def load_data(file):
+    tabel = _tabel_untuk(file)
+    if tabel is None:
+        with file_lock(file):
+            if not os.path.exists(file):
+                write_json_atomic(file, [])
+            return codec.load_file(file)
+    return [dict(d) for d in cached_table(tabel)]
+
+
+@instrument.timed("save_data")
+def save_data(file, data):
+    tabel = _tabel_untuk(file)
+    if tabel is None:
+        with file_lock(file):
+            write_json_atomic(file, data)
+        return
+    save_table(tabel, data)
+
+
+# Operasi transaksional
+def _jual(c, transaksi):
+    # Kurangi stok, simpan transaksi dan mutasinya di transaksi database c;
+    # kembalikan (id transaksi, [barang_id yang stoknya berubah])
+    # Waktu yang salah format merusak rekap dan laporan: tolak sebelum menulis
+    time.strptime(transaksi["waktu"], "%Y-%m-%d %H:%M:%S")
+    diubah = []
+    for item in transaksi["items"]:
+        barang_id = item.get("barang_id")
+        if barang_id is None:
+            row = c.execute("SELECT id FROM barang WHERE nama = ? AND kategori = ?",
+                            (item["nama"], item["kategori"])).fetchone()
+            barang_id = row["id"] if row else None
+        cur = c.execute("UPDATE barang SET stok = stok - ? WHERE id = ? AND stok >= ?",
+                        (item["qty"], barang_id, item["qty"]))
+        if cur.rowcount != 1:
+            raise StokTidakCukup(f"Stok {item['nama']} ({item['kategori']}) tidak cukup")
+        saldo = c.execute("SELECT stok FROM barang WHERE id = ?", (barang_id,)).fetchone()[0]
+        diubah.append((barang_id, item["qty"], saldo))
+    baris = _ke_baris("transaksi", transaksi)
+    _insert(c, "transaksi", [baris])
+    transaksi_id = c.execute("SELECT last_insert_rowid()").fetchone()[0]
+    _catat_mutasi(c, [(transaksi["waktu"], i, "jual", -qty, saldo, transaksi_id, transaksi["kasir"], None)
+                      for i, qty, saldo in diubah])
+    return transaksi_id, [i for i, _, _ in diubah]
+
+
+@_retry
+def record_sale(transaksi, conn=None):
+    # Kurangi stok dan catat transaksi dalam satu transaksi database.
+    # Pengurangan stok bersyarat (stok >= qty) sehingga dua kasir yang
+    # menjual barang yang sama tidak bisa membuat stok negatif.
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        transaksi_id, diubah = _jual(c, transaksi)
+        _tambah_rekap(c, [transaksi])
+        perubahan = {"ubah": [_baris_barang(c, i) for i in dict.fromkeys(diubah)], "hapus": []}
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, perubahan)
+    return transaksi_id
+
+
+@_retry
+def record_sales(transaksi_list, conn=None):
+    # Group commit: banyak penjualan dalam satu transaksi database, jadi satu
+    # fsync untuk semuanya. Tiap penjualan dibungkus SAVEPOINT sendiri:
+    # yang gagal (stok tidak cukup, data tidak valid) dibatalkan tanpa
+    # menggagalkan yang lain. Kembalikan list berisi id transaksi atau
+    # exception-nya, urut sesuai masukan.
+    hasil = []
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        diubah = []
+        for transaksi in transaksi_list:
+            c.execute("SAVEPOINT jual")
+            try:
+                transaksi_id, barang = _jual(c, transaksi)
+            except sqlite3.OperationalError:
+                raise  # database sibuk/terkunci: seluruh batch diulang oleh _retry
+            except Exception as e:
+                c.execute("ROLLBACK TO jual")
+                hasil.append(e)
+            else:
+                hasil.append(transaksi_id)
+                diubah += barang
+            c.execute("RELEASE jual")
+        _tambah_rekap(c, [t for t, h in zip(transaksi_list, hasil) if not isinstance(h, Exception)])
+        perubahan = {"ubah": [_baris_barang(c, i) for i in dict.fromkeys(diubah)], "hapus": []}
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, perubahan)
+    return hasil
+
+
+@_retry
+def append_transactions(transaksi_list, conn=None):
+    # Tambahkan riwayat transaksi (impor/data sintetis) tanpa mengubah stok;
+    # rekap ikut diperbarui dalam transaksi database yang sama
+    with transaction(conn) as c:
+        _insert(c, "transaksi", [_ke_baris("transaksi", t) for t in transaksi_list])
+        _tambah_rekap(c, transaksi_list)
+    return len(transaksi_list)
+
+
+@_retry
+def add_barang(data, conn=None):
+    # Tambah satu barang tanpa menulis ulang seluruh katalog
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        try:
+            cur = c.execute(
+                "INSERT INTO barang (sku, nama, kategori, stok, harga, harga_modal) VALUES (?, ?, ?, ?, ?, ?)",
+                (data.get("sku") or None, data["nama"], data["kategori"], data["stok"], data["harga"],
+                 data.get("harga_modal") or 0))
+        except sqlite3.IntegrityError:
+            raise BarangSudahAda("Barang dengan nama & kategori (atau SKU) sama sudah ada.")
+        barang_id = cur.lastrowid
+        _catat_mutasi(c, [(time.strftime("%Y-%m-%d %H:%M:%S"), barang_id, "awal", data["stok"], data["stok"],
+                           None, data.get("oleh"), None)])
+        perubahan = {"ubah": [_baris_barang(c, barang_id)], "hapus": []}
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, perubahan)
+    return barang_id
+
+
+@_retry
+def record_removal(barang_id, jumlah, keterangan, tanggal, oleh, conn=None):
+    # Kurangi/hapus barang dan catat ke riwayat penghapusan
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        data = _baris_barang(c, barang_id)
+        if data is None or data["stok"] < jumlah:
+            raise StokTidakCukup("Stok barang tidak cukup untuk dihapus")
+        if jumlah == data["stok"]:
+            c.execute("DELETE FROM barang WHERE id = ?", (barang_id,))
+            perubahan = {"ubah": [], "hapus": [barang_id]}
+        else:
+            c.execute("UPDATE barang SET stok = stok - ? WHERE id = ?", (jumlah, barang_id))
+            perubahan = {"ubah": [_baris_barang(c, barang_id)], "hapus": []}
+        data.update({
+            "jumlah_dihapus": jumlah,
+            "keterangan": keterangan,
+            "tanggal_dihapus": tanggal,
+            "dihapus_oleh": oleh
+        })
+        _insert(c, "barang_dihapus", [_ke_baris("barang_dihapus", data)])
+        _catat_mutasi(c, [(tanggal, barang_id, "hapus", -jumlah, data["stok"] - jumlah,
+                           c.execute("SELECT last_insert_rowid()").fetchone()[0], oleh, keterangan)])
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, perubahan)
+
+
+@_retry
+def restock(barang_id, jumlah, oleh=None, keterangan=None, conn=None):
+    # Stok masuk (pembelian/retur ke toko); kembalikan saldo baru
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        cur = c.execute("UPDATE barang SET stok = stok + ? WHERE id = ?", (jumlah, barang_id))
+        if cur.rowcount != 1:
+            raise KeyError(barang_id)
+        data = _baris_barang(c, barang_id)
+        _catat_mutasi(c, [(time.strftime("%Y-%m-%d %H:%M:%S"), barang_id, "masuk", jumlah, data["stok"],
+                           None, oleh, keterangan)])
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, {"ubah": [data], "hapus": []})
+    return data["stok"]
+
+
+@_retry
+def upsert_barang(rows, tambah_stok=False, oleh=None, keterangan=None, conn=None):
+    # Impor massal dalam satu transaksi: barang dengan nama & kategori yang
+    # sudah ada diperbarui harga/SKU/stoknya, sisanya ditambahkan.
+    # rows: dict sku, nama, kategori, stok, harga, harga_modal; stok/sku/harga_modal
+    # None = tidak diubah. tambah_stok: stok di rows ditambahkan (mutasi masuk),
+    # bukan menggantikan stok lama (koreksi). Kembalikan (jumlah baru, jumlah diperbarui).
+    sekarang = time.strftime("%Y-%m-%d %H:%M:%S")
+    with transaction(conn) as c:
+        sebelum = version("barang", c)
+        ada = {(r[1], r[2]): (r[0], r[3]) for r in c.execute("SELECT id, nama, kategori, stok FROM barang")}
+        baru, ubah, mutasi = [], [], []
+        for r in rows:
+            lama = ada.get((r["nama"], r["kategori"]))
+            if lama is None:
+                baru.append((r["sku"], r["nama"], r["kategori"], r["stok"] or 0, r["harga"], r["harga_modal"] or 0))
+                continue
+            barang_id, stok_lama = lama
+            if r["stok"] is None:
+                stok = stok_lama
+            else:
+                stok = stok_lama + r["stok"] if tambah_stok else r["stok"]
+            ubah.append((r["sku"], r["harga"], r["harga_modal"], stok, barang_id))
+            if stok != stok_lama:
+                mutasi.append((sekarang, barang_id, "masuk" if tambah_stok else "koreksi", stok - stok_lama, stok,
+                               None, oleh, keterangan))
+        terakhir = c.execute("SELECT COALESCE(MAX(id), 0) FROM barang").fetchone()[0]
+        try:
+            c.executemany("UPDATE barang SET sku = COALESCE(?, sku), harga = ?, harga_modal = COALESCE(?, harga_modal), "
+                          "stok = ? WHERE id = ?", ubah)
+            c.executemany("INSERT INTO barang (sku, nama, kategori, stok, harga, harga_modal) VALUES (?, ?, ?, ?, ?, ?)",
+                          baru)
+        except sqlite3.IntegrityError:
+            raise BarangSudahAda("Ada SKU atau nama & kategori yang sama dengan barang lain; tidak ada yang disimpan.")
+        # Seluruh tulisan memegang kunci tulis, jadi id di atas MAX(id) lama adalah barang baru
+        mutasi += [(sekarang, row[0], "awal", row[1], row[1], None, oleh, keterangan)
+                   for row in c.execute("SELECT id, stok FROM barang WHERE id > ?", (terakhir,))]
+        _catat_mutasi(c, mutasi)
+        cur = c.execute(f"SELECT {', '.join(KOLOM['barang'])} FROM barang "
+                        "WHERE id > ? OR id IN (SELECT value FROM json_each(?))",
+                        (terakhir, json.dumps([u[-1] for u in ubah])))
+        perubahan = {"ubah": [dict(row) for row in cur], "hapus": []}
+        sesudah = version("barang", c)
+    _beritahu(c, "barang", sebelum, sesudah, perubahan)
+    return len(baru), len(ubah)
+
+
+def _catat_mutasi(conn, mutasi):
+    # mutasi: (waktu, barang_id, jenis, qty, saldo, ref, oleh, keterangan)
+    conn.executemany("INSERT INTO mutasi_stok (waktu, barang_id, jenis, qty, saldo, ref, oleh, keterangan) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", mutasi)
+
+
+def _buka_mutasi(conn):
+    # Database lama: saldo pembuka dari stok saat ini
+    with transaction(conn) as c:
+        if c.execute("SELECT 1 FROM meta WHERE kunci = 'mutasi_stok'").fetchone():
+            return
+        sekarang = time.strftime("%Y-%m-%d %H:%M:%S")
+        _catat_mutasi(c, [(sekarang, row["id"], "awal", row["stok"], row["stok"], None, None, "saldo pembuka")
+                          for row in c.execute("SELECT id, stok FROM barang")])
+        c.execute("INSERT OR REPLACE INTO meta (kunci, nilai) VALUES ('mutasi_stok', '1')")
+
+
+def stock_ledger(barang_id=None, limit=100, conn=None):
+    # Mutasi terbaru (semua barang atau satu barang), terbaru dulu
+    conn = conn or connect()
+    if barang_id is None:
+        cur = conn.execute("SELECT * FROM mutasi_stok ORDER BY id DESC LIMIT ?", (limit,))
+    else:
+        cur = conn.execute("SELECT * FROM mutasi_stok WHERE barang_id = ? ORDER BY id DESC LIMIT ?",
+                           (barang_id, limit))
+    return [dict(row) for row in cur]
+
+
+# Rekap penjualan
+def _hitung_rekap(transaksi_list):
+    harian, bulanan, kasir, barang = {}, {}, {}, {}
+
+    def tambah(tujuan, kunci, jumlah, pendapatan, modal, qty=None):
+        nilai = tujuan.get(kunci)
+        if nilai is None:
+            nilai = tujuan[kunci] = [0, 0, 0, 0]
+        nilai[0] += jumlah
+        nilai[1] += pendapatan
+        nilai[2] += modal
+        if qty is not None:
+            nilai[3] += qty
+
+    for t in transaksi_list:
+        tanggal = t["waktu"][:10]
+        modal_total = 0
+        for item in t["items"]:
+            modal = (item.get("harga_modal") or 0) * item["qty"]
+            modal_total += modal
+            tambah(barang, (tanggal, item["nama"], item["kategori"]), 1, item["subtotal"], modal, item["qty"])
+        tambah(harian, tanggal, 1, t["total"], modal_total)
+        tambah(bulanan, tanggal[:7], 1, t["total"], modal_total)
+        tambah(kasir, (tanggal, t["kasir"]), 1, t["total"], modal_total)
+    return harian, bulanan, kasir, barang
+
+
+def _tambah_rekap(conn, transaksi_list):
+    harian, bulanan, kasir, barang = _hitung_rekap(transaksi_list)
+    tambah = ("jumlah_transaksi = jumlah_transaksi + excluded.jumlah_transaksi, "
+              "pendapatan = pendapatan + excluded.pendapatan, modal = modal + excluded.modal")
+    conn.executemany(
+        "INSERT INTO rekap_harian VALUES (?, ?, ?, ?) ON CONFLICT (tanggal) DO UPDATE SET " + tambah,
+        ((k, *v[:3]) for k, v in harian.items()))
+    conn.executemany(
+        "INSERT INTO rekap_bulanan VALUES (?, ?, ?, ?) ON CONFLICT (bulan) DO UPDATE SET " + tambah,
+        ((k, *v[:3]) for k, v in bulanan.items()))
+    conn.executemany(
+        "INSERT INTO rekap_kasir VALUES (?, ?, ?, ?, ?) ON CONFLICT (tanggal, kasir) DO UPDATE SET " + tambah,
+        ((*k, *v[:3]) for k, v in kasir.items()))
+    conn.executemany(
+        "INSERT INTO rekap_barang VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (tanggal, nama, kategori) DO UPDATE SET "
+        + tambah + ", qty = qty + excluded.qty",
+        ((*k, v[0], v[3], v[1], v[2]) for k, v in barang.items()))
+
+
+def _bangun_rekap(conn):
+    for tabel in ("rekap_harian", "rekap_bulanan", "rekap_kasir", "rekap_barang"):
+        conn.execute(f"DELETE FROM {tabel}")
+    cur = conn.execute("SELECT waktu, kasir, items, total FROM transaksi ORDER BY rowid")
+    while True:
+        rows = cur.fetchmany(SEGMEN)
+        if not rows:
+            break
+        _tambah_rekap(conn, [_ke_dict("transaksi", r) for r in rows])
+    conn.execute("INSERT OR REPLACE INTO meta (kunci, nilai) VALUES ('rekap', '1')")
+
+
+@_retry
+def rebuild_rollups(conn=None):
+    # Hitung ulang semua rekap dari riwayat transaksi
+    with transaction(conn) as c:
+        _bangun_rekap(c)
+
+
+# Kompaksi jurnal
+def compact(conn=None, mode="TRUNCATE"):
+    # Pindahkan isi jurnal WAL ke file database. TRUNCATE (pemanggilan manual)
+    # juga mengosongkan jurnal, tapi menahan penulis baru sampai semua pembaca
+    # selesai; PASSIVE tidak pernah menunggu dan tidak menahan siapa pun.
+    conn = conn or connect()
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+_kompaktor = None
+
+
+def start_compactor(interval=INTERVAL_KOMPAKSI, path=None):
+    # Jalankan kompaksi berkala di thread latar (sekali per proses)
+    global _kompaktor
+    with _migrasi_lock:
+        if _kompaktor is not None:
+            return _kompaktor
+
+        def jalan():
+            while not berhenti.wait(interval):
+                try:
+                    # PASSIVE: pembaca panjang (ekspor, cetak ulang) tidak boleh menahan checkout
+                    compact(connect(path), "PASSIVE")
+                except sqlite3.OperationalError:
+                    pass
+
+        berhenti = threading.Event()
+        _kompaktor = threading.Thread(target=jalan, name="kasir-compactor", daemon=True)
+        _kompaktor.berhenti = berhenti
+        _kompaktor.start()
+        return _kompaktor
+
+
+# Migrasi sekali jalan dari file JSON lama
+def migrate_json(folder=".", conn=None):
+    conn = conn or connect()
+    hasil = {}
+    with transaction(conn) as c:
+        if c.execute("SELECT 1 FROM meta WHERE kunci = 'migrasi_json'").fetchone():
+            return hasil
+        for nama_file, tabel in TABEL.items():
+            path = os.path.join(folder, nama_file)
+            if not os.path.exists(path):
+                continue
+            if c.execute(f"SELECT 1 FROM {tabel} LIMIT 1").fetchone():
+                continue
+            data = codec.load_file(path)
+            rows = [_ke_baris(tabel, d) for d in data]
+            if tabel == "barang":
+                for i, r in enumerate(rows, start=1):
+                    r["id"] = r["id"] or i
+                    r["harga_modal"] = r["harga_modal"] or 0
+            _insert(c, tabel, rows)
+            hasil[tabel] = len(rows)
+        if "transaksi" in hasil:
+            _bangun_rekap(c)
+        c.execute("INSERT OR REPLACE INTO meta (kunci, nilai) VALUES ('migrasi_json', ?)", (json.dumps(hasil),))
+    return hasil
+
+
+if __name__ == "__main__":
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else "."
+    conn = connect(os.path.join(folder, "kasir.db"))
+    for tabel in TABEL.values():
+        jumlah = conn.execute(f"SELECT COUNT(*) FROM {tabel}").fetchone()[0]
+        print(f"{tabel}: {jumlah} baris")
@@ -0,0 +1,245 @@
+# Data sintetis untuk uji beban
+#
+# Membuat akun.json, barang.json, transaksi.json dan barang_dihapus.json
+# dengan skema yang sama persis dengan aplikasi. Isinya ditentukan oleh
+# seed dan tanggal akhir, jadi bisa dibuat ulang persis. Katalog berisi
+# barang per kategori dengan SKU EAN-13, harga dibulatkan ke Rp 500.
+# Riwayat penjualan mengikuti pola toko: tren naik per tahun, ramai di akhir
+# pekan dan Desember, jam sibuk siang dan sore, kasir per shift, barang
+# laris mengikuti distribusi Zipf, pembayaran tunai dengan uang pecahan.
+# transaksi.json ditulis bertahap sehingga riwayat bertahun-tahun tidak
+# perlu dimuat sekaligus di memori.
+#
+#   python -m kasir.synthetic data --barang 2000 --tahun 3 --per-hari 300 --kasir 8
+#
+# Saat aplikasi dijalankan di folder itu, file JSON dimigrasikan ke kasir.db.
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+from datetime import date, datetime, timedelta
+
+KATEGORI = {
+    "Makanan": (["Roti Tawar", "Mi Instan", "Biskuit", "Wafer", "Keripik Kentang", "Kacang Goreng", "Sarden",
+                 "Kornet", "Sereal", "Cokelat Batang", "Permen", "Selai"], (2000, 35000)),
+    "Minuman": (["Air Mineral", "Teh Botol", "Kopi Sachet", "Susu UHT", "Minuman Isotonik", "Jus Buah",
+                 "Soda", "Teh Celup", "Kopi Kaleng", "Yogurt"], (2500, 25000)),
+    "Sembako": (["Beras", "Minyak Goreng", "Gula Pasir", "Tepung Terigu", "Telur", "Garam", "Kecap Manis",
+                 "Saus Sambal", "Santan", "Bawang Goreng"], (3000, 80000)),
+    "Kebersihan": (["Sabun Mandi", "Sampo", "Pasta Gigi", "Sikat Gigi", "Deterjen", "Pewangi Pakaian",
+                    "Sabun Cuci Piring", "Tisu", "Pembersih Lantai"], (3000, 45000)),
+    "Rumah Tangga": (["Baterai", "Lampu LED", "Korek Api", "Kantong Plastik", "Lilin", "Obat Nyamuk",
+                      "Spons", "Aluminium Foil"], (2000, 60000)),
+    "Bayi": (["Popok", "Tisu Basah", "Minyak Telon", "Bedak Bayi", "Susu Formula"], (10000, 150000)),
+    "Rokok": (["Rokok Kretek", "Rokok Filter", "Rokok Mild"], (20000, 40000)),
+}
+MEREK = ["Sinar", "Mawar", "Garuda", "Bintang", "Cahaya", "Nusantara", "Segar", "Mentari", "Pelangi", "Jaya",
+         "Sentosa", "Murni", "Sejahtera", "Bahari", "Lestari"]
+UKURAN = ["Kecil", "Sedang", "Besar", "Jumbo", "Hemat", "Ekonomis", "Premium", "Isi 2", "Isi 5", "Isi 10"]
+NAMA_DEPAN = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gita", "Hadi", "Indah", "Joko", "Kartika",
+              "Lina", "Made", "Nur", "Putri", "Rizki", "Sari", "Tono", "Wati", "Yusuf"]
+NAMA_BELAKANG = ["Saputra", "Lestari", "Wijaya", "Hidayat", "Kusuma", "Santoso", "Pratama", "Permata"]
+PECAHAN = [1000, 2000, 5000, 10000, 20000, 50000, 100000]
+
+# Bobot jam buka toko (07.00-21.59): ramai saat makan siang dan pulang kerja
+BOBOT_JAM = {7: 3, 8: 4, 9: 4, 10: 5, 11: 7, 12: 9, 13: 7, 14: 5, 15: 5, 16: 7, 17: 9, 18: 10, 19: 8, 20: 6, 21: 3}
+FAKTOR_HARI = [0.9, 0.85, 0.9, 0.95, 1.1, 1.35, 1.3]  # Senin..Minggu
+FAKTOR_BULAN = [0.95, 0.9, 1.0, 1.05, 1.0, 1.0, 1.0, 0.95, 0.95, 1.0, 1.05, 1.25]
+PERTUMBUHAN = 0.12  # pertumbuhan penjualan per tahun
+
+
+def _ean13(acak, awalan="899"):
+    angka = awalan + "".join(str(acak.randrange(10)) for _ in range(12 - len(awalan)))
+    cek = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(angka)) % 10) % 10
+    return angka + str(cek)
+
+
+def _bulat(nilai, ke=500):
+    return max(ke, int(round(nilai / ke)) * ke)
+
+
+def generate_barang(jumlah, acak):
+    barang, nama_dipakai, sku_dipakai = [], set(), set()
+    kategori = list(KATEGORI)
+    while len(barang) < jumlah:
+        k = kategori[len(barang) % len(kategori)]
+        dasar, (murah, mahal) = KATEGORI[k]
+        for _ in range(20):
+            nama = f"{acak.choice(dasar)} {acak.choice(MEREK)} {acak.choice(UKURAN)}"
+            if (nama, k) not in nama_dipakai:
+                break
+        else:
+            # Kombinasi nama hampir habis (katalog sangat besar): beri nomor varian
+            nama = f"{nama} {len(barang) + 1}"
+        sku = _ean13(acak)
+        if sku in sku_dipakai:
+            continue
+        nama_dipakai.add((nama, k))
+        sku_dipakai.add(sku)
+        # Harga log-uniform di rentang kategori; margin 10-35%
+        harga = _bulat(math.exp(acak.uniform(math.log(murah), math.log(mahal))))
+        barang.append({
+            "id": len(barang) + 1,
+            "sku": sku,
+            "nama": nama,
+            "kategori": k,
+            "stok": acak.randint(20, 500),
+            "harga": harga,
+            "harga_modal": _bulat(harga / (1 + acak.uniform(0.1, 0.35)), 100),
+        })
+    return barang
+
+
+def generate_akun(jumlah_kasir, password_hash, acak):
+    akun = [{"username": "admin", "password": password_hash, "role": "admin", "nama_lengkap": "Administrator",
+             "no_telepon": "", "foto_profil": None}]
+    for i in range(1, jumlah_kasir + 1):
+        akun.append({
+            "username": f"kasir{i}",
+            "password": password_hash,
+            "role": "kasir",
+            "nama_lengkap": f"{acak.choice(NAMA_DEPAN)} {acak.choice(NAMA_BELAKANG)}",
+            "no_telepon": "08" + "".join(str(acak.randrange(10)) for _ in range(10)),
+            "foto_profil": None,
+        })
+    return akun
+
+
+def _bayar_tunai(total, acak):
+    # Pelanggan membayar pas, atau dengan pecahan terdekat di atas total
+    if acak.random() < 0.25:
+        return total
+    pecahan = acak.choice([p for p in PECAHAN if p >= 5000] + [PECAHAN[-1]])
+    return max(pecahan, math.ceil(total / pecahan) * pecahan)
+
+
+def generate_transaksi(barang, kasir, mulai, hari, per_hari, acak):
+    # Generator transaksi urut waktu, satu dict per transaksi
+    bobot = list(itertools.accumulate(1 / (i + 1) ** 1.1 for i in range(len(barang))))
+    urutan = barang[:]
+    acak.shuffle(urutan)  # barang terlaris acak, bukan urut id
+    jam = list(BOBOT_JAM)
+    bobot_jam = list(itertools.accumulate(BOBOT_JAM.values()))
+    shift = [kasir[:max(1, len(kasir) // 2)], kasir[len(kasir) // 2:] or kasir]
+    for h in range(hari):
+        tanggal = mulai + timedelta(days=h)
+        rata = (per_hari * (1 + PERTUMBUHAN) ** (h / 365) * FAKTOR_HARI[tanggal.weekday()]
+                * FAKTOR_BULAN[tanggal.month - 1])
+        jumlah = max(0, int(acak.gauss(rata, math.sqrt(rata))))
+        detik = sorted(jam[bisect.bisect(bobot_jam, acak.random() * bobot_jam[-1])] * 3600 + acak.randrange(3600)
+                       for _ in range(jumlah))
+        for d in detik:
+            waktu = datetime(tanggal.year, tanggal.month, tanggal.day) + timedelta(seconds=d)
+            items = {}
+            for _ in range(min(15, 1 + int(math.log(1 - acak.random()) / math.log(0.55)))):
+                b = urutan[bisect.bisect(bobot, acak.random() * bobot[-1])]
+                qty = acak.choices((1, 2, 3, 4, 5), (70, 18, 7, 3, 2))[0]
+                item = items.get(b["id"])
+                if item is None:
+                    items[b["id"]] = {"barang_id": b["id"], "nama": b["nama"], "kategori": b["kategori"],
+                                      "qty": qty, "harga": b["harga"], "harga_modal": b["harga_modal"],
+                                      "subtotal": b["harga"] * qty}
+                else:
+                    item["qty"] += qty
+                    item["subtotal"] = item["qty"] * item["harga"]
+            total = sum(item["subtotal"] for item in items.values())
+            metode = "Cash" if acak.random() < 0.65 else "QRIS/Transfer"
+            bayar = _bayar_tunai(total, acak) if metode == "Cash" else total
+            yield {
+                "waktu": waktu.strftime("%Y-%m-%d %H:%M:%S"),
+                "kasir": acak.choice(shift[d >= 14 * 3600]),
+                "items": list(items.values()),
+                "total": total,
+                "bayar": bayar,
+                "kembalian": bayar - total,
+                "metode": metode,
+            }
+
+
+def generate_dihapus(barang, mulai, hari, acak, per_bulan=4):
+    alasan = ["Kedaluwarsa", "Rusak", "Kemasan bocor", "Hilang", "Retur ke pemasok"]
+    hasil = []
+    for _ in range(int(hari / 30 * per_bulan)):
+        b = acak.choice(barang)
+        waktu = datetime.combine(mulai, datetime.min.time()) + timedelta(seconds=acak.randrange(hari * 86400))
+        hasil.append({
+            "barang_id": b["id"], "nama": b["nama"], "kategori": b["kategori"], "stok": b["stok"],
+            "harga": b["harga"], "harga_modal": b["harga_modal"], "jumlah_dihapus": acak.randint(1, 5),
+            "keterangan": acak.choice(alasan), "tanggal_dihapus": waktu.strftime("%Y-%m-%d %H:%M:%S"),
+            "dihapus_oleh": "admin",
+        })
+    hasil.sort(key=lambda d: d["tanggal_dihapus"])
+    return hasil
+
+
+def _tulis_json(path, data):
+    # Tulis list JSON per elemen lalu ganti file secara atomik
+    sementara = path + ".tmp"
+    jumlah = 0
+    with open(sementara, "w") as f:
+        f.write("[")
+        for d in data:
+            f.write(",\n" if jumlah else "\n")
+            f.write(json.dumps(d))
+            jumlah += 1
+        f.write("\n]\n")
+    os.replace(sementara, path)
+    return jumlah
+
+
+def _salt(seed, rounds=12):
+    # Salt bcrypt dari seed (bukan bcrypt.gensalt) agar akun.json juga bisa dibuat
+    # ulang persis; 22 karakter base64 bcrypt, karakter terakhir hanya membawa 4 bit
+    acak = random.Random(f"{seed}-salt")
+    alfabet = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    isi = "".join(acak.choice(alfabet) for _ in range(21)) + acak.choice(".Oeu")
+    return f"$2b${rounds:02d}${isi}".encode()
+
+
+def generate(folder, barang=2000, tahun=3, per_hari=300, kasir=8, password="kasir123", seed=42, akhir=None):
+    # Tulis semua file JSON ke folder; kembalikan jumlah baris per file
+    import bcrypt
+
+    acak = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    akhir = akhir or date.today()
+    hari = int(tahun * 365)
+    mulai = akhir - timedelta(days=hari - 1)
+
+    daftar_barang = generate_barang(barang, acak)
+    akun = generate_akun(kasir, bcrypt.hashpw(password.encode(), _salt(seed)).decode(), acak)
+    nama_kasir = [a["username"] for a in akun if a["role"] == "kasir"] or ["admin"]
+    hasil = {
+        "akun.json": _tulis_json(os.path.join(folder, "akun.json"), akun),
+        "barang.json": _tulis_json(os.path.join(folder, "barang.json"), daftar_barang),
+        "transaksi.json": _tulis_json(os.path.join(folder, "transaksi.json"),
+                                      generate_transaksi(daftar_barang, nama_kasir, mulai, hari, per_hari, acak)),
+        "barang_dihapus.json": _tulis_json(os.path.join(folder, "barang_dihapus.json"),
+                                           generate_dihapus(daftar_barang, mulai, hari, acak)),
+    }
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat data sintetis aplikasi kasir (format JSON aplikasi)")
+    parser.add_argument("folder", help="folder tujuan file JSON")
+    parser.add_argument("--barang", type=int, default=2000, help="jumlah barang di katalog")
+    parser.add_argument("--tahun", type=float, default=3, help="panjang riwayat penjualan (tahun)")
+    parser.add_argument("--per-hari", type=int, default=300, help="rata-rata transaksi per hari di awal riwayat")
+    parser.add_argument("--kasir", type=int, default=8, help="jumlah akun kasir")
+    parser.add_argument("--password", default="kasir123", help="password semua akun")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--akhir", type=date.fromisoformat, help="tanggal terakhir riwayat (default hari ini)")
+    args = parser.parse_args()
+
+    hasil = generate(args.folder, args.barang, args.tahun, args.per_hari, args.kasir, args.password, args.seed,
+                     args.akhir)
+    for nama, jumlah in hasil.items():
+        print(f"{nama}: {jumlah:,} baris")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Format angka pada impor katalog (kasir.importer)
+import io
+
+from kasir.catalogue import get_catalogue
+from kasir.importer import import_barang
+
+
+def impor(tmp_path, isi):
+    db = str(tmp_path / "kasir.db")
+    hasil = import_barang(io.BytesIO(isi.encode()), "barang.csv", path=db)
+    return hasil, get_catalogue(db)
+
+
+def test_csv_titik_koma_memakai_format_angka_indonesia(tmp_path):
+    hasil, katalog = impor(tmp_path, "nama;kategori;harga;stok;harga_modal;sku\n"
+                                     "A;K;15.000;5;;\n"
+                                     "B;K;12,5;1.200;10.000,75;\n"
+                                     "C;K;1.500.000;0;12.5;\n")
+    assert hasil["baru"] == 3 and hasil["galat"].empty
+    assert katalog.find("A", "K")["harga"] == 15000
+    assert katalog.find("B", "K")["harga"] == 12.5
+    assert katalog.find("B", "K")["stok"] == 1200
+    assert katalog.find("B", "K")["harga_modal"] == 10000.75
+    assert katalog.find("C", "K")["harga"] == 1500000
+    assert katalog.find("C", "K")["harga_modal"] == 12.5
+
+
+def test_csv_koma_menolak_pemisah_ribuan_yang_ambigu(tmp_path):
+    hasil, katalog = impor(tmp_path, "nama,kategori,harga,stok,harga_modal\n"
+                                     "A,K,15.000,5,\n"
+                                     'B,K,"1,500",5,\n'
+                                     "C,K,1000,2.000,\n"
+                                     "D,K,12.5,5,1000.5\n")
+    assert hasil["baru"] == 1
+    assert katalog.find("D", "K")["harga"] == 12.5
+    assert katalog.find("A", "K") is None
+    galat = hasil["galat"].set_index("nama")["galat"]
+    assert list(galat.index) == ["A", "B", "C"]
+    assert galat.str.contains("ambigu").all()
+    assert not galat.str.contains("harga harus").any()